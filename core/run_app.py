@@ -4,7 +4,7 @@ import os
 import sys
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
@@ -19,6 +19,8 @@ print(root_dir)
 from core import generic
 from utilities.configurations.database_config import DatabaseConfig
 from initialization.init_app import AppInitialization
+from database_operations.image_store import ImageStore, image_media_type
+from utilities.image_responses import image_response, not_modified_response
 
 # isort: on
 
@@ -170,6 +172,57 @@ async def get_availabilities():
         )
 
 
+# How each image variant is loaded, and the suffix that keeps their ETags distinct
+image_variants = {
+    "image": (ImageStore.load_image, ""),
+    "thumbnail": (ImageStore.load_thumbnail, "-thumb"),
+    "original": (ImageStore.load_original, "-orig"),
+}
+
+
+async def serve_image(request, image_id, variant="image"):
+    """
+    Serve an image, its thumbnail or its original from the image store, with caching and
+    range support.
+    """
+    if not AppInitialization.initialized:
+        logger.error("Backend not initialized.")
+        raise HTTPException(status_code=500, detail="Backend not initialized")
+
+    load, etag_suffix = image_variants[variant]
+    etag = image_id + etag_suffix
+    not_modified = not_modified_response(request.headers, etag)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        image_bytes = await asyncio.to_thread(load, image_id)
+    except Exception as e:
+        logger.error(f"Unable to load image {image_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Unable to load image: {str(e)}")
+    if image_bytes is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return image_response(
+        request.headers, image_bytes, etag, image_media_type(image_bytes)
+    )
+
+
+@app.get("/api/images/{image_id}")
+async def get_image(image_id: str, request: Request):
+    return await serve_image(request, image_id)
+
+
+@app.get("/api/images/{image_id}/thumbnail")
+async def get_image_thumbnail(image_id: str, request: Request):
+    return await serve_image(request, image_id, "thumbnail")
+
+
+@app.get("/api/images/{image_id}/original")
+async def get_image_original(image_id: str, request: Request):
+    return await serve_image(request, image_id, "original")
+
+
 if __name__ == "__main__":
     import uvicorn
 
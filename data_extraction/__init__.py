@@ -1,3 +1,10 @@
+from .document_extractors import (ExtractionResult, extract, extract_excel,
+                                  extract_pdf, extract_pptx, extract_word)
+from .extraction_cache import ExtractionCache
+from .extraction_sandbox import (ExtractionError, ExtractionSandbox,
+                                 sandboxed_extract, shutdown_sandboxes)
+from .image_encoding_pool import (ImageEncodingPool, image_encoding_pool,
+                                  shutdown_image_encoding_pool)
 from .image_extractors import (compress_image, extract_images_from_excel,
                                extract_images_from_pdf,
                                extract_images_from_pptx,
@@ -6,11 +13,25 @@ from .text_extractors import (extract_text_from_excel, extract_text_from_pdf,
                               extract_text_from_pptx, extract_text_from_word)
 
 __all__ = [
+    "ExtractionResult",
+    "extract",
+    "extract_excel",
+    "extract_pdf",
+    "extract_pptx",
+    "extract_word",
+    "ExtractionCache",
+    "ExtractionError",
+    "ExtractionSandbox",
+    "sandboxed_extract",
+    "shutdown_sandboxes",
     "extract_text_from_excel",
     "extract_text_from_pdf",
     "extract_text_from_pptx",
     "extract_text_from_word",
     "compress_image",
+    "ImageEncodingPool",
+    "image_encoding_pool",
+    "shutdown_image_encoding_pool",
     "extract_images_from_excel",
     "extract_images_from_pdf",
     "extract_images_from_pptx",
@@ -0,0 +1,231 @@
+import logging
+from zipfile import ZipFile
+
+from docx import Document
+from pptx import Presentation
+
+from data_extraction.image_extractors import (excel_package_images,
+                                              package_images,
+                                              pdf_document_images,
+                                              presentation_images,
+                                              word_document_images)
+from data_extraction.parallel_pdf import extract_pdf_pages_parallel
+from file_handling.file_io import (iter_excel_text, open_pdf, open_source,
+                                   pdf_document_text, presentation_text,
+                                   read_pdf_file, word_document_text)
+from file_handling.ooxml_readers import (iter_docx_paragraphs,
+                                         pptx_package_text, slide_part_names)
+from utilities.configurations.configs import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionResult:
+    """
+    The text, images and metadata pulled from a document in a single pass.
+
+    Attributes:
+    text (str): The extracted text.
+    images (list): BytesIO objects containing the (possibly compressed) image data.
+    metadata (dict): Details about the document, such as its page or slide count.
+    """
+
+    def __init__(self, text="", images=None, metadata=None):
+        self.text = text
+        self.images = images if images is not None else []
+        self.metadata = metadata if metadata is not None else {}
+
+    def __repr__(self):
+        return (
+            f"ExtractionResult(text={len(self.text)} chars, "
+            f"images={len(self.images)}, metadata={self.metadata})"
+        )
+
+
+def extract_word(source):
+    """
+    Extract text and images from a Word (.docx) file.
+
+    The text is streamed from the package XML and the images are read from its media folder,
+    so no python-docx object model is built unless streaming fails.
+
+    Parameters:
+    source (str or bytes): The path to the file, or its contents.
+
+    Returns:
+    ExtractionResult: The extracted text, images and metadata.
+    """
+    try:
+        with ZipFile(open_source(source), "r") as zip_ref:
+            paragraphs = list(iter_docx_paragraphs(zip_ref))
+            images = package_images(zip_ref, "word/media/")
+        return ExtractionResult(
+            " ".join(paragraphs), images, {"paragraphs": len(paragraphs)}
+        )
+    except Exception as e:
+        logger.warning(f"Streaming .docx extraction failed, using python-docx: {e}")
+
+    doc = Document(open_source(source))
+    return ExtractionResult(
+        word_document_text(doc),
+        word_document_images(doc),
+        {"paragraphs": len(doc.paragraphs)},
+    )
+
+
+def extract_excel(source):
+    """
+    Extract text from every worksheet and the images of an Excel (.xlsx) file.
+
+    Worksheets are streamed in read-only mode and the media is read straight out of the
+    package, without unpacking it to disk.
+
+    Parameters:
+    source (str or bytes): The path to the file, or its contents.
+
+    Returns:
+    ExtractionResult: The extracted text, images and metadata.
+    """
+    with ZipFile(open_source(source), "r") as zip_ref:
+        images = excel_package_images(zip_ref)
+    sheets = list(
+        iter_excel_text(source, max_cells_per_sheet=AppConfig.max_excel_cells_per_sheet)
+    )
+    return ExtractionResult(
+        "\n\n".join(text for _, text in sheets if text),
+        images,
+        {"sheets": [title for title, _ in sheets]},
+    )
+
+
+def extract_pptx(source):
+    """
+    Extract text and images from a PowerPoint (.pptx) file.
+
+    The text, including speaker notes, is streamed from the slide XML and the images are read
+    from the media folder, so no python-pptx object model is built unless streaming fails.
+
+    Parameters:
+    source (str or bytes): The path to the file, or its contents.
+
+    Returns:
+    ExtractionResult: The extracted text, images and metadata.
+    """
+    try:
+        with ZipFile(open_source(source), "r") as zip_ref:
+            text = pptx_package_text(zip_ref)
+            images = package_images(zip_ref, "ppt/media/")
+            slides = len(slide_part_names(zip_ref))
+        return ExtractionResult(text, images, {"slides": slides})
+    except Exception as e:
+        logger.warning(f"Streaming .pptx extraction failed, using python-pptx: {e}")
+
+    prs = Presentation(open_source(source))
+    return ExtractionResult(
+        presentation_text(prs), presentation_images(prs), {"slides": len(prs.slides)}
+    )
+
+
+def extract_pdf(source, engine=None):
+    """
+    Extract text and images from a PDF file.
+
+    With the PyMuPDF text engine the document is parsed once for both; with pdfplumber the
+    text is parsed separately. Documents with at least AppConfig.parallel_pdf_page_threshold
+    pages are split into page ranges and extracted across a pool of processes.
+
+    Parameters:
+    source (str or bytes): The path to the file, or its contents.
+    engine (str): The PDF text engine; defaults to the configured engine.
+
+    Returns:
+    ExtractionResult: The extracted text, images and metadata.
+    """
+    engine = engine or AppConfig.pdf_text_engine
+    threshold = AppConfig.parallel_pdf_page_threshold
+    text = None
+    images = None
+
+    with open_pdf(source) as pdf_file:
+        pages = len(pdf_file)
+        parallel = bool(threshold) and pages >= threshold
+        if not parallel:
+            images = pdf_document_images(pdf_file)
+            if engine == "pymupdf":
+                text = pdf_document_text(pdf_file)
+
+    if parallel:
+        try:
+            text, images = extract_pdf_pages_parallel(
+                source,
+                pages,
+                engine,
+                max_workers=AppConfig.parallel_pdf_workers,
+                settings=extraction_settings(),
+            )
+        except Exception as e:
+            logger.error(
+                f"Parallel PDF extraction failed, extracting sequentially: {e}"
+            )
+            parallel = False
+            with open_pdf(source) as pdf_file:
+                images = pdf_document_images(pdf_file)
+                if engine == "pymupdf":
+                    text = pdf_document_text(pdf_file)
+
+    if text is None:
+        text = read_pdf_file(source, engine=engine)
+    return ExtractionResult(
+        text, images, {"pages": pages, "text_engine": engine, "parallel": parallel}
+    )
+
+
+# AppConfig attributes that change what the extractors return
+EXTRACTION_SETTINGS = (
+    "pdf_text_engine",
+    "parallel_pdf_page_threshold",
+    "parallel_pdf_workers",
+    "max_excel_cells_per_sheet",
+    "image_min_bytes",
+    "image_min_pixels",
+    "image_max_pixels",
+    "image_max_dimension",
+    "image_keep_originals",
+    "image_lossy_quality",
+    "image_encodings",
+)
+
+
+def extraction_settings():
+    """
+    Return the current extraction settings from AppConfig as a dictionary.
+    """
+    return {name: getattr(AppConfig, name) for name in EXTRACTION_SETTINGS}
+
+
+# Unified extractor for each supported file extension
+extractor_mapping = {
+    "docx": extract_word,
+    "xlsx": extract_excel,
+    "pptx": extract_pptx,
+    "pdf": extract_pdf,
+}
+
+
+def extract(file_path, source=None):
+    """
+    Extract text, images and metadata from a document with the extractor for its type.
+
+    Parameters:
+    file_path (str): The path of the file, used to pick the extractor by extension.
+    source (bytes): The contents of the file if already read; otherwise the path is opened.
+
+    Returns:
+    ExtractionResult: The extracted content, or None if the file type is not supported.
+    """
+    file_type = file_path.rsplit(".", 1)[-1].lower()
+    extractor = extractor_mapping.get(file_type)
+    if extractor is None:
+        logger.warning(f"No extractor available for file type: {file_type}")
+        return None
+    return extractor(file_path if source is None else source)
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from io import BytesIO
+
+from data_extraction.document_extractors import ExtractionResult
+from file_handling.image_container import (iter_image_container, read_exact,
+                                           write_image_container)
+
+logger = logging.getLogger(__name__)
+
+# zstd compresses extracted text faster and smaller than zlib, but is optional
+try:
+    import zstandard
+
+    zstandard_available = True
+except ImportError:
+    zstandard = None
+    zstandard_available = False
+
+# Bump when extractor output or the entry layout changes so stale entries are no longer read
+CACHE_VERSION = 3
+
+# Length of the JSON header at the start of each entry
+ENTRY_HEADER = struct.Struct(">I")
+
+
+class _ZlibWriter:
+    """
+    Minimal streaming zlib writer, used when zstandard is not installed.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.compressor = zlib.compressobj(6)
+
+    def write(self, data):
+        self.f.write(self.compressor.compress(data))
+        return len(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.f.write(self.compressor.flush())
+
+
+class _ZlibReader:
+    """
+    Minimal streaming zlib reader, used when zstandard is not installed.
+    """
+
+    def __init__(self, f, chunk_size=64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decompressor = zlib.decompressobj()
+        self.buffer = b""
+
+    def read(self, size):
+        while len(self.buffer) < size and not self.decompressor.eof:
+            chunk = self.f.read(self.chunk_size)
+            if not chunk:
+                break
+            self.buffer += self.decompressor.decompress(chunk)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extraction results keyed by the SHA256 hash of the file contents.
+
+    Entries hold the extracted text, images and metadata, compressed and sharded into
+    subdirectories by the leading characters of the hash. When the cache grows past its size
+    limit, the least recently used entries are evicted. Entries live under a namespace derived
+    from CACHE_VERSION and the extraction settings, so changing either starts a fresh cache.
+    """
+
+    def __init__(self, cache_dir, max_size_mb=2048, settings=None):
+        """
+        Open (or create) the cache directory.
+
+        Parameters:
+        cache_dir (str): The root directory of the cache.
+        max_size_mb (int): Total size of the cache entries before eviction starts.
+        settings (dict): Extraction settings that affect extractor output.
+        """
+        fingerprint = hashlib.sha256(
+            repr(sorted((settings or {}).items())).encode("utf-8")
+        ).hexdigest()[:8]
+        self.cache_dir = os.path.join(cache_dir, f"v{CACHE_VERSION}-{fingerprint}")
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.extension = ".zst" if zstandard_available else ".zz"
+        self.lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_size = sum(size for _, size, _ in self._entries())
+        logger.info(
+            f"Extraction cache opened at {self.cache_dir} ({self.total_size // (1024 * 1024)} MB)"
+        )
+
+    def _entry_path(self, file_hash):
+        return os.path.join(
+            self.cache_dir, file_hash[:2], file_hash[2:4], file_hash + self.extension
+        )
+
+    def _entries(self):
+        """
+        Return (path, size, last used time) for every entry in the cache.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(self.extension):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _compressed_writer(self, f):
+        if zstandard_available:
+            return zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False)
+        return _ZlibWriter(f)
+
+    def _decompressed_reader(self, f):
+        if zstandard_available:
+            return zstandard.ZstdDecompressor().stream_reader(f, closefd=False)
+        return _ZlibReader(f)
+
+    def get(self, file_hash):
+        """
+        Return the cached ExtractionResult for a file hash, or None on a miss.
+        """
+        path = self._entry_path(file_hash)
+        try:
+            with open(path, "rb") as f, self._decompressed_reader(f) as reader:
+                (header_length,) = ENTRY_HEADER.unpack(
+                    read_exact(reader, ENTRY_HEADER.size)
+                )
+                header = json.loads(read_exact(reader, header_length).decode("utf-8"))
+                images = [
+                    BytesIO(record.data) for record in iter_image_container(reader)
+                ]
+                # The originals kept for downscaled images follow in a second container
+                for index, record in zip(
+                    header["originals"], iter_image_container(reader)
+                ):
+                    images[index].original = record.data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.info(f"Extraction cache hit for {file_hash}")
+        return ExtractionResult(header["text"], images, header["metadata"])
+
+    def put(self, file_hash, result):
+        """
+        Store an ExtractionResult for a file hash, evicting old entries if needed.
+
+        The entry is a length-prefixed JSON header holding the text, the metadata and which
+        images have a kept original, followed by an image container of the images and one of
+        the originals, compressed as it is written.
+        """
+        originals = [
+            index
+            for index, image in enumerate(result.images)
+            if getattr(image, "original", None) is not None
+        ]
+        header = json.dumps(
+            {"text": result.text, "metadata": result.metadata, "originals": originals}
+        ).encode("utf-8")
+
+        path = self._entry_path(file_hash)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with self._compressed_writer(f) as writer:
+                    writer.write(ENTRY_HEADER.pack(len(header)))
+                    writer.write(header)
+                    write_image_container(writer, result.images)
+                    write_image_container(
+                        writer, [result.images[index].original for index in originals]
+                    )
+                size = f.tell()
+        except Exception:
+            os.remove(temp_path)
+            raise
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.total_size += size - previous_size
+            over_limit = self.total_size > self.max_size_bytes
+        if over_limit:
+            self.evict()
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self.lock:
+            self.total_size -= size
+
+    def evict(self, target_ratio=0.9):
+        """
+        Remove the least recently used entries until the cache is under target_ratio of its limit.
+        """
+        target = self.max_size_bytes * target_ratio
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        with self.lock:
+            self.total_size = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, _, _ in entries:
+            if self.total_size <= target:
+                break
+            self._remove(path)
+            removed += 1
+        logger.info(f"Evicted {removed} entries from the extraction cache.")
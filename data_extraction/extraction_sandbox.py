@@ -0,0 +1,271 @@
+import logging
+import multiprocessing
+import queue
+import time
+from io import BytesIO
+
+import psutil
+
+from data_extraction.document_extractors import (ExtractionResult, extract,
+                                                 extraction_settings)
+from data_extraction.image_extractors import PendingImage
+from utilities.configurations.configs import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Address-space limits are enforced by the OS where available; RSS is always monitored
+try:
+    import resource
+
+    resource_available = True
+except ImportError:
+    resource = None
+    resource_available = False
+
+# How often the supervisor checks a busy worker's memory use
+POLL_INTERVAL_SECONDS = 0.25
+
+# Share of the memory limit set aside for each page-parallel PDF worker a sandbox starts;
+# their memory counts against the sandbox's limit
+PAGE_WORKER_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+class ExtractionError(Exception):
+    """
+    Raised when a document could not be extracted in the sandbox.
+    """
+
+
+class ExtractionTimeout(ExtractionError):
+    """
+    Raised when a worker exceeds its wall-clock limit and is killed.
+    """
+
+
+class ExtractionMemoryExceeded(ExtractionError):
+    """
+    Raised when a worker exceeds its memory limit and is killed.
+    """
+
+
+def page_worker_limit(memory_limit_bytes, requested=None):
+    """
+    Return how many page-parallel PDF workers fit in a sandbox's memory limit.
+
+    Parameters:
+    memory_limit_bytes (int): The sandbox's memory limit, or 0 for none.
+    requested (int): The configured number of workers; defaults to the number of CPU cores.
+
+    Returns:
+    int: The number of workers, at least one.
+    """
+    requested = requested or multiprocessing.cpu_count()
+    if not memory_limit_bytes:
+        return requested
+    # The sandbox worker itself takes one share
+    return max(1, min(requested, memory_limit_bytes // PAGE_WORKER_MEMORY_BYTES - 1))
+
+
+def _sandbox_worker(conn, memory_limit_bytes):
+    """
+    Worker process loop: extract each document sent over the pipe and send back the result.
+    """
+    if resource_available and memory_limit_bytes:
+        # Hard backstop; the address space of a Python process runs well above its RSS
+        limit = memory_limit_bytes * 2
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            file_path, file_bytes, settings = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return  # The supervisor has gone away
+
+        try:
+            for name, value in settings.items():
+                setattr(AppConfig, name, value)
+            AppConfig.parallel_pdf_workers = page_worker_limit(
+                memory_limit_bytes, AppConfig.parallel_pdf_workers
+            )
+            result = extract(file_path, file_bytes)
+            if result is None:
+                conn.send(("ok", None))
+            else:
+                # Images cross the pipe as bytes; pending images are left for the
+                # caller's image encoding pool
+                conn.send(
+                    (
+                        "ok",
+                        (
+                            result.text,
+                            [
+                                (
+                                    image
+                                    if isinstance(image, PendingImage)
+                                    else image.getvalue()
+                                )
+                                for image in result.images
+                            ],
+                            result.metadata,
+                        ),
+                    )
+                )
+        except MemoryError:
+            conn.send(("error", "MemoryError: extraction exceeded the memory limit"))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class ExtractionSandbox:
+    """
+    A supervised worker process that extracts one document at a time.
+
+    Each extraction is bounded by a wall-clock timeout and a memory limit. A worker that
+    exceeds either, or dies, is killed and replaced before the next document.
+    """
+
+    def __init__(self, timeout_seconds=300, memory_limit_mb=4096):
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_bytes = (
+            memory_limit_mb * 1024 * 1024 if memory_limit_mb else 0
+        )
+        self.process = None
+        self.conn = None
+
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        # Not a daemon, so large PDFs can still use the page-parallel process pool, which is
+        # sized to fit within the memory limit
+        self.process = context.Process(
+            target=_sandbox_worker,
+            args=(child_conn, self.memory_limit_bytes),
+            name="extraction-sandbox",
+        )
+        self.process.start()
+        child_conn.close()
+        logger.info(f"Started extraction sandbox worker (pid {self.process.pid}).")
+
+    def _kill(self):
+        if self.process is not None:
+            # Take down any page-parallel workers along with the sandbox worker
+            try:
+                for child in psutil.Process(self.process.pid).children(recursive=True):
+                    child.kill()
+            except psutil.Error:
+                pass
+            self.process.kill()
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def _rss(self):
+        try:
+            process = psutil.Process(self.process.pid)
+            return process.memory_info().rss + sum(
+                child.memory_info().rss for child in process.children(recursive=True)
+            )
+        except psutil.Error:
+            return 0
+
+    def extract(self, file_path, file_bytes):
+        """
+        Extract a document in the worker process.
+
+        Parameters:
+        file_path (str): The path of the file, used to pick the extractor.
+        file_bytes (bytes): The contents of the file.
+
+        Returns:
+        ExtractionResult: The extracted content, or None if the file type is not supported.
+
+        Raises:
+        ExtractionTimeout: If the extraction ran longer than the timeout.
+        ExtractionMemoryExceeded: If the worker used more memory than the limit.
+        ExtractionError: If the extraction failed or the worker died.
+        """
+        if self.process is None or not self.process.is_alive():
+            self._kill()
+            self._start()
+
+        # The worker does not load the system config, so it gets the settings with each job
+        settings = extraction_settings()
+        started = time.monotonic()
+        try:
+            self.conn.send((file_path, file_bytes, settings))
+            while not self.conn.poll(POLL_INTERVAL_SECONDS):
+                if time.monotonic() - started > self.timeout_seconds:
+                    self._kill()
+                    raise ExtractionTimeout(
+                        f"Extraction of {file_path} exceeded {self.timeout_seconds} seconds"
+                    )
+                if self.memory_limit_bytes and self._rss() > self.memory_limit_bytes:
+                    self._kill()
+                    raise ExtractionMemoryExceeded(
+                        f"Extraction of {file_path} exceeded {self.memory_limit_bytes // (1024 * 1024)} MB"
+                    )
+                if not self.process.is_alive():
+                    break
+            status, payload = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self._kill()
+            raise ExtractionError(f"Extraction worker died on {file_path}: {e}")
+
+        if status == "error":
+            raise ExtractionError(f"Extraction of {file_path} failed: {payload}")
+        if payload is None:
+            return None
+        text, images, metadata = payload
+        return ExtractionResult(
+            text,
+            [
+                image if isinstance(image, PendingImage) else BytesIO(image)
+                for image in images
+            ],
+            metadata,
+        )
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        self._kill()
+
+
+_idle_sandboxes = queue.LifoQueue()
+
+
+def sandboxed_extract(file_path, file_bytes):
+    """
+    Extract a document in a supervised worker process using the configured limits.
+
+    Idle workers are reused across calls, so concurrent callers each get their own worker
+    without paying the start-up cost for every file.
+
+    Returns:
+    ExtractionResult: The extracted content, or None if the file type is not supported.
+    """
+    try:
+        sandbox = _idle_sandboxes.get_nowait()
+    except queue.Empty:
+        sandbox = ExtractionSandbox(
+            timeout_seconds=AppConfig.sandbox_timeout_seconds,
+            memory_limit_mb=AppConfig.sandbox_memory_limit_mb,
+        )
+    try:
+        return sandbox.extract(file_path, file_bytes)
+    finally:
+        _idle_sandboxes.put(sandbox)
+
+
+def shutdown_sandboxes():
+    """
+    Stop every idle sandbox worker.
+    """
+    while True:
+        try:
+            _idle_sandboxes.get_nowait().close()
+        except queue.Empty:
+            break
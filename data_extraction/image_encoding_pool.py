@@ -0,0 +1,172 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from data_extraction.image_extractors import (PendingImage, encode_image,
+                                              resolve_images)
+from utilities.configurations.configs import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_image_bytes(image_bytes, strategy, quality, max_size):
+    """
+    Encode a single image. Runs in a worker process.
+
+    Returns:
+    bytes: The encoded image data.
+    """
+    return encode_image(image_bytes, strategy, quality, max_size).getvalue()
+
+
+class ImageEncodingPool:
+    """
+    A pool of worker processes that encode images off the document processing threads.
+
+    Submitting returns immediately while the images encode, so the caller can carry on with
+    the text of the document. The raw bytes of the images being encoded are capped at
+    max_in_flight_mb; submitting more blocks until earlier images finish.
+    """
+
+    def __init__(self, max_workers=None, max_in_flight_mb=256):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.max_in_flight_bytes = max_in_flight_mb * 1024 * 1024
+        self.in_flight_bytes = 0
+        self.condition = threading.Condition()
+        self.executor = None
+
+    def _get_executor(self):
+        with self.condition:
+            if self.executor is None:
+                # Workers are spawned rather than forked because the update process is multithreaded
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.executor
+
+    def _reserve(self, size):
+        with self.condition:
+            # An image larger than the whole budget is still let through on its own
+            while self.in_flight_bytes and (
+                self.in_flight_bytes + size > self.max_in_flight_bytes
+            ):
+                self.condition.wait()
+            self.in_flight_bytes += size
+
+    def _release(self, size):
+        with self.condition:
+            self.in_flight_bytes -= size
+            self.condition.notify_all()
+
+    def submit(self, images):
+        """
+        Start encoding the pending images in a list.
+
+        Parameters:
+        images (list): BytesIO and PendingImage objects, as returned by the extractors.
+
+        Returns:
+        list: The BytesIO objects as they are and a future for each pending image, to be
+              passed to collect().
+        """
+        submitted = []
+        for image in images:
+            if not isinstance(image, PendingImage):
+                submitted.append(image)
+                continue
+            size = len(image.image_bytes)
+            self._reserve(size)
+            try:
+                future = self._get_executor().submit(
+                    _encode_image_bytes,
+                    image.image_bytes,
+                    image.strategy,
+                    image.quality,
+                    image.max_size,
+                )
+            except Exception as e:
+                self._release(size)
+                logger.error(f"Unable to submit image for encoding: {e}")
+                submitted.append(image)
+                continue
+            future.add_done_callback(lambda _, size=size: self._release(size))
+            future.pending_image = image
+            submitted.append(future)
+        return submitted
+
+    def collect(self, submitted):
+        """
+        Wait for the images started by submit() and return them in their original order.
+
+        If the pool breaks, the affected images are encoded on the calling thread instead.
+        Images that cannot be encoded are skipped.
+
+        Returns:
+        list: A list of BytesIO objects containing the image data.
+        """
+        images = []
+        for item in submitted:
+            if not isinstance(item, Future):
+                images.append(item)
+                continue
+            try:
+                images.append(item.pending_image.encoded_image(item.result()))
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool for the next document
+                logger.error("Image encoding pool broke, encoding here instead.")
+                self._discard_executor()
+                images.append(item.pending_image)
+            except Exception as e:
+                logger.error(f"Unable to encode image, skipping it: {e}")
+        return resolve_images(images)
+
+    def _discard_executor(self):
+        with self.condition:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        with self.condition:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_image_encoding_pool = None
+_pool_lock = threading.Lock()
+
+
+def image_encoding_pool():
+    """
+    Return the shared image encoding pool, or None when images are encoded inline.
+
+    Setting AppConfig.image_encoding_workers to 0 disables the pool; None uses every CPU core.
+    """
+    global _image_encoding_pool
+    if AppConfig.image_encoding_workers == 0:
+        return None
+    with _pool_lock:
+        if _image_encoding_pool is None:
+            _image_encoding_pool = ImageEncodingPool(
+                max_workers=AppConfig.image_encoding_workers,
+                max_in_flight_mb=AppConfig.image_encoding_max_in_flight_mb,
+            )
+        return _image_encoding_pool
+
+
+def shutdown_image_encoding_pool():
+    """
+    Stop the shared image encoding pool, if it was started.
+    """
+    global _image_encoding_pool
+    with _pool_lock:
+        pool, _image_encoding_pool = _image_encoding_pool, None
+    if pool is not None:
+        pool.close()
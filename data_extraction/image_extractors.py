@@ -1,17 +1,29 @@
+import hashlib
 import logging
-import os
-import shutil
+import math
+import posixpath
+import xml.etree.ElementTree as ET
 from io import BytesIO
 from zipfile import ZipFile
 
-import fitz  # PyMuPDF
 from docx import Document
 from PIL import Image
 from pptx import Presentation
 
+from file_handling.file_io import open_pdf, open_source
+from utilities.configurations.configs import AppConfig
+
 logger = logging.getLogger(__name__)
 
 
+# Largest media member read from an OOXML package, guarding against zip bombs
+MAX_MEDIA_MEMBER_BYTES = 64 * 1024 * 1024
+
+# The package part declaring the content type of every other part
+CONTENT_TYPES_PART = "[Content_Types].xml"
+CT_NS = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+
+
 # Function to compress an image using the WebP format, which can be set to lossless compression.
 def compress_image(image_bytes_io, lossless=True):
     """
@@ -39,117 +51,403 @@ def compress_image(image_bytes_io, lossless=True):
     return compressed_image_io  # Return the compressed image BytesIO object
 
 
-# Function to extract and compress images from a Word document, iterating through document relations.
-def extract_images_from_word(file_path):
+# Function to work out the size an image is scaled down to under the pixel budget.
+def downscale_size(width, height, max_pixels=None, max_dimension=None):
     """
-    Extract images from a Word document and return them in a list of BytesIO objects.
+    Return the size an image must be scaled down to so it fits the pixel budget.
 
     Parameters:
-    file_path (str): The file path of the Word document.
+    width (int): The width of the image in pixels.
+    height (int): The height of the image in pixels.
+    max_pixels (int): The largest number of pixels allowed; None or 0 for no limit.
+    max_dimension (int): The largest width or height allowed; None or 0 for no limit.
 
     Returns:
-    list: A list of BytesIO objects containing image data.
+    tuple: The (width, height) to scale down to, or None if the image is within the budget.
+    """
+    scale = 1.0
+    if max_pixels and width * height > max_pixels:
+        scale = min(scale, math.sqrt(max_pixels / (width * height)))
+    if max_dimension and max(width, height) > max_dimension:
+        scale = min(scale, max_dimension / max(width, height))
+    if scale >= 1.0:
+        return None
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+# Function to re-encode an image with the given strategy, keeping the original if that is smaller.
+def encode_image(image_bytes, strategy, quality=80, max_size=None):
+    """
+    Encode an image according to a strategy and return the smaller of the result and the original.
+
+    With max_size, the image is scaled down to fit within it. JPEGs are decoded straight at a
+    reduced scale where possible, so the full-size image is never held in memory, and the
+    downscaled rendition is always returned.
+
+    Parameters:
+    image_bytes (bytes): The raw image data.
+    strategy (str): "passthrough" to keep the original, "lossless" for lossless WebP or
+                    "lossy" for WebP at the given quality.
+    quality (int): The WebP quality used by the lossy strategy.
+    max_size (tuple): The (width, height) the image must fit within, if any.
+
+    Returns:
+    BytesIO: A BytesIO object containing the image data.
+    """
+    if strategy not in ("passthrough", "lossless", "lossy"):
+        raise ValueError(f"Unknown image encoding strategy: {strategy}")
+    if max_size is None and strategy == "passthrough":
+        return BytesIO(image_bytes)
+
+    encoded = BytesIO()
+    image = Image.open(BytesIO(image_bytes))
+    if max_size is not None:
+        # draft() picks the smallest JPEG DCT scale that is still at least max_size
+        image.draft(image.mode, max_size)
+        image.thumbnail(max_size)
+    if strategy == "lossless":
+        image.save(encoded, format="WebP", lossless=True)
+    else:
+        # A passed-through format that must be downscaled is stored as lossy WebP
+        image.save(encoded, format="WebP", quality=quality)
+
+    # Keep the original when re-encoding does not make it smaller
+    if max_size is None and encoded.tell() >= len(image_bytes):
+        return BytesIO(image_bytes)
+    encoded.seek(0)
+    return encoded
+
+
+class PendingImage:
+    """
+    An image kept by triage whose encoding has not run yet.
+
+    Pending images are picklable, so they can be handed to the image encoding pool or sent
+    back from a worker process. getvalue() encodes the image on first use, so they can also be
+    used wherever a BytesIO is read.
+
+    Attributes:
+    max_size (tuple): The (width, height) the image is scaled down to fit, if any.
+    keep_original (bool): Whether the original bytes are kept alongside a downscaled image.
+    """
+
+    def __init__(
+        self, image_bytes, strategy, quality=80, max_size=None, keep_original=False
+    ):
+        self.image_bytes = image_bytes
+        self.strategy = strategy
+        self.quality = quality
+        self.max_size = max_size
+        self.keep_original = keep_original
+        self.encoded = None
+
+    def encoded_image(self, encoded_bytes):
+        """
+        Wrap the encoded data of this image in a BytesIO, attaching the original as its
+        `original` attribute when it is kept.
+        """
+        encoded = BytesIO(encoded_bytes)
+        if self.keep_original:
+            encoded.original = self.image_bytes
+        return encoded
+
+    def encode(self):
+        """
+        Encode the image on the calling thread, once.
+
+        Returns:
+        BytesIO: A BytesIO object containing the encoded image data.
+        """
+        if self.encoded is None:
+            self.encoded = self.encoded_image(
+                encode_image(
+                    self.image_bytes, self.strategy, self.quality, self.max_size
+                ).getvalue()
+            )
+        self.encoded.seek(0)
+        return self.encoded
+
+    def getvalue(self):
+        return self.encode().getvalue()
+
+
+def resolve_images(images):
+    """
+    Encode any pending images in a list on the calling thread, skipping images that cannot
+    be encoded.
+
+    Returns:
+    list: A list of BytesIO objects containing the image data.
+    """
+    resolved = []
+    for image in images:
+        if isinstance(image, PendingImage):
+            try:
+                image = image.encode()
+            except Exception as e:
+                logger.error(f"Unable to encode image, skipping it: {e}")
+                continue
+        resolved.append(image)
+    return resolved
+
+
+class ImageTriage:
+    """
+    Decide, for each image found in a single document, whether it is kept and how it is encoded.
+
+    Images are deduplicated within the document by PDF xref and by content hash, images below
+    the configured byte or pixel thresholds are dropped, and each kept image is assigned the
+    encoding strategy configured for its source format. Only the image header is read to
+    decide, so dropped and passed-through images are never decoded. Images over the pixel
+    budget are scaled down, whatever their strategy. Encoding itself is deferred (see
+    PendingImage) so that it can run in the image encoding pool.
+    """
+
+    def __init__(self):
+        self.min_bytes = AppConfig.image_min_bytes
+        self.min_pixels = AppConfig.image_min_pixels
+        self.max_pixels = AppConfig.image_max_pixels
+        self.max_dimension = AppConfig.image_max_dimension
+        self.keep_originals = AppConfig.image_keep_originals
+        self.encodings = AppConfig.image_encodings
+        self.lossy_quality = AppConfig.image_lossy_quality
+        self.seen_xrefs = set()
+        self.seen_hashes = set()
+        self.stats = {
+            "kept": 0,
+            "downscaled": 0,
+            "duplicates": 0,
+            "too_small": 0,
+            "unreadable": 0,
+        }
+
+    def seen_xref(self, xref):
+        """
+        Return True if the PDF image xref was already handled in this document, recording it if not.
+        """
+        if xref in self.seen_xrefs:
+            self.stats["duplicates"] += 1
+            return True
+        self.seen_xrefs.add(xref)
+        return False
+
+    def process(self, image_bytes):
+        """
+        Triage a single image.
+
+        Parameters:
+        image_bytes (bytes): The raw image data.
+
+        Returns:
+        BytesIO or PendingImage: The original image when passed through, the image awaiting
+                                 encoding otherwise, or None if it was dropped.
+        """
+        image_hash = hashlib.sha256(image_bytes).digest()
+        if image_hash in self.seen_hashes:
+            self.stats["duplicates"] += 1
+            return None
+        self.seen_hashes.add(image_hash)
+
+        if len(image_bytes) < self.min_bytes:
+            self.stats["too_small"] += 1
+            return None
+
+        try:
+            # Opening an image only parses its header
+            with Image.open(BytesIO(image_bytes)) as image:
+                source_format = image.format
+                width, height = image.size
+        except Exception as e:
+            logger.warning(f"Skipping unreadable image: {e}")
+            self.stats["unreadable"] += 1
+            return None
+
+        if width * height < self.min_pixels:
+            self.stats["too_small"] += 1
+            return None
+
+        strategy = self.encodings.get(source_format, "passthrough")
+        if strategy not in ("passthrough", "lossless", "lossy"):
+            raise ValueError(f"Unknown image encoding strategy: {strategy}")
+        self.stats["kept"] += 1
+
+        max_size = downscale_size(width, height, self.max_pixels, self.max_dimension)
+        if max_size is not None:
+            self.stats["downscaled"] += 1
+            return PendingImage(
+                image_bytes,
+                strategy,
+                self.lossy_quality,
+                max_size=max_size,
+                keep_original=self.keep_originals,
+            )
+        if strategy == "passthrough":
+            return BytesIO(image_bytes)
+        return PendingImage(image_bytes, strategy, self.lossy_quality)
+
+    def log_summary(self):
+        logger.info(f"\t\tImage triage: {self.stats}")
+
+
+# Function to extract and compress images from an opened Word document, iterating through document relations.
+def word_document_images(doc):
+    """
+    Extract images from an opened python-docx Document.
+
+    Parameters:
+    doc (Document): The Word document.
+
+    Returns:
+    list: BytesIO objects for passed-through images and PendingImage objects for the rest.
     """
-    doc = Document(file_path)  # Open the Word document
     images = []  # Initialize an empty list to store images
+    triage = ImageTriage()
 
     # Iterate over the relationships in the document
     for rel_id, rel in doc.part.rels.items():
         # Check if the relationship type is an image
         if "image" in rel.reltype:
             image_part = rel.target_part  # Get the part that contains the image
-            image_bytes = image_part._blob  # Extract the image bytes
-            image_bytes_io = BytesIO(
-                image_bytes
-            )  # Create a BytesIO object from the image bytes
-            compressed_image = compress_image(image_bytes_io)  # Compress the image
-
-            # Calculate the sizes of the compressed and original images
-            compressed_size = len(compressed_image.getbuffer())
-            original_size = len(image_bytes_io.getbuffer())
-
-            # Add the smaller of the two images to the list
-            if compressed_size > original_size:
-                images.append(image_bytes_io)
-            else:
-                images.append(compressed_image)
+            image = triage.process(image_part._blob)
+            if image is not None:
+                images.append(image)
 
+    triage.log_summary()
     return images  # Return the list of image BytesIO objects
 
 
-# Function to extract and compress images from an Excel file, handling the unique structure of Excel files.
-def extract_images_from_excel(file_path):
+# Function to extract and compress images from a Word document.
+def extract_images_from_word(file_path):
     """
-    Extract and compress images from an Excel file.
-
-    This function first unzips the Excel file since it's a package of XML files and media.
-    It then searches for image files in the 'xl/media' directory, compresses them using the
-    compress_image function, and returns them as a list of BytesIO objects.
+    Extract images from a Word document and return them in a list of BytesIO objects.
 
     Parameters:
-    file_path (str): The path to the Excel file.
+    file_path (str or bytes): The file path of the Word document, or its contents.
 
     Returns:
-    list: A list of BytesIO objects containing the compressed image data.
+    list: A list of BytesIO objects containing image data.
     """
-    temp_dir = "temp_xlsx"  # Define a temporary directory name
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)  # Create the directory if it doesn't exist
+    return resolve_images(word_document_images(Document(open_source(file_path))))
 
-    images = []  # Initialize an empty list to store images
 
-    # Use the ZipFile module to open and extract the Excel file
-    with ZipFile(file_path, "r") as zip_ref:
-        zip_ref.extractall(
-            temp_dir
-        )  # Extract all contents into the temporary directory
-
-        # The images are usually contained within the 'xl/media' folder inside the unzipped directory
-        media_path = os.path.join(temp_dir, "xl", "media")
-
-        # Check if the media path exists
-        if os.path.exists(media_path):
-            # Iterate over each file in the media directory
-            for filename in os.listdir(media_path):
-                # Check if the file is an image
-                if filename.endswith((".png", ".jpg", ".jpeg", ".gif")):
-                    # Read the image file and create a BytesIO object
-                    with open(os.path.join(media_path, filename), "rb") as f:
-                        image_bytes_io = BytesIO(f.read())
-                        compressed_image = compress_image(image_bytes_io)
-
-                        # Calculate the size of the compressed and original image
-                        compressed_size = len(compressed_image.getbuffer())
-                        original_size = len(image_bytes_io.getbuffer())
-
-                        # Choose the smaller image to append to the list
-                        if compressed_size > original_size:
-                            images.append(image_bytes_io)
-                        else:
-                            images.append(compressed_image)
-
-    # Clean up by removing the temporary directory
-    shutil.rmtree(temp_dir)
+def package_image_members(zip_ref, media_prefix):
+    """
+    Return the members of the media folder of an OOXML package that are declared as images.
+
+    The package's content types decide, so every image format it holds (PNG, JPEG, GIF,
+    BMP, TIFF, EMF, ...) is included while audio and video are not. If the content types
+    cannot be read, every member of the media folder is returned and left to the image
+    triage to reject.
+    """
+    members = [
+        info for info in zip_ref.infolist() if info.filename.startswith(media_prefix)
+    ]
+    try:
+        root = ET.fromstring(zip_ref.read(CONTENT_TYPES_PART))
+    except (KeyError, ET.ParseError) as e:
+        logger.warning(f"Unable to read package content types: {e}")
+        return members
+
+    defaults = {
+        elem.get("Extension", "").lower(): elem.get("ContentType", "")
+        for elem in root.iter(f"{CT_NS}Default")
+    }
+    overrides = {
+        elem.get("PartName", "").lstrip("/"): elem.get("ContentType", "")
+        for elem in root.iter(f"{CT_NS}Override")
+    }
+
+    def content_type(name):
+        if name in overrides:
+            return overrides[name]
+        return defaults.get(posixpath.splitext(name)[1][1:].lower(), "")
+
+    return [
+        info for info in members if content_type(info.filename).startswith("image/")
+    ]
+
+
+# Function to extract and compress the images stored in the media folder of an opened OOXML package.
+def package_images(zip_ref, media_prefix, max_member_bytes=MAX_MEDIA_MEMBER_BYTES):
+    """
+    Extract and compress the images stored in the media folder of an OOXML package.
+
+    Members are read straight into memory, so nothing is written to disk and concurrent
+    callers never share any state.
+
+    Parameters:
+    zip_ref (ZipFile): The opened package.
+    media_prefix (str): The media folder within the package, such as 'xl/media/'.
+    max_member_bytes (int): Images that would decompress to more than this are skipped.
 
+    Returns:
+    list: BytesIO objects for passed-through images and PendingImage objects for the rest.
+    """
+    images = []  # Initialize an empty list to store images
+    triage = ImageTriage()
+
+    for info in package_image_members(zip_ref, media_prefix):
+        name = info.filename
+        # The declared size comes from the zip directory, so oversized members are never inflated
+        if info.file_size > max_member_bytes:
+            logger.warning(
+                f"Skipping {name}: {info.file_size} bytes exceeds the limit."
+            )
+            continue
+        image = triage.process(zip_ref.read(info))
+        if image is not None:
+            images.append(image)
+
+    triage.log_summary()
     return images  # Return the list of image BytesIO objects
 
 
-# Function to extract and compress images from a PowerPoint file by iterating through slides and shapes.
-def extract_images_from_pptx(file_path):
+# Function to extract and compress images from an opened Excel package, reading its media directly.
+def excel_package_images(zip_ref):
     """
-    Extract and compress images from a PowerPoint (.pptx) file.
+    Extract and compress the images stored in the 'xl/media' folder of an Excel package.
 
-    This function iterates through the slides and shapes in a PowerPoint file to find images,
-    compresses them using the compress_image function, and returns them as a list of BytesIO objects.
+    Parameters:
+    zip_ref (ZipFile): The opened Excel package.
+
+    Returns:
+    list: BytesIO objects for passed-through images and PendingImage objects for the rest.
+    """
+    # The images are usually contained within the 'xl/media' folder inside the package
+    return package_images(zip_ref, "xl/media/")
+
+
+# Function to extract and compress images from an Excel file, handling the unique structure of Excel files.
+def extract_images_from_excel(file_path):
+    """
+    Extract and compress images from an Excel file.
+
+    An Excel file is a zip package of XML files and media, so the images are read straight
+    out of the package without unpacking it to disk.
 
     Parameters:
-    file_path (str): The path to the PowerPoint file.
+    file_path (str or bytes): The path to the Excel file, or its contents.
 
     Returns:
     list: A list of BytesIO objects containing the compressed image data.
     """
-    prs = Presentation(file_path)  # Open the PowerPoint file using python-pptx
+    with ZipFile(open_source(file_path), "r") as zip_ref:
+        return resolve_images(excel_package_images(zip_ref))
+
+
+# Function to extract and compress images from an opened presentation by iterating through slides and shapes.
+def presentation_images(prs):
+    """
+    Extract and compress images from an opened python-pptx Presentation.
+
+    Parameters:
+    prs (Presentation): The PowerPoint presentation.
+
+    Returns:
+    list: BytesIO objects for passed-through images and PendingImage objects for the rest.
+    """
     images = []  # Initialize an empty list to store images
+    triage = ImageTriage()
 
     # Iterate over each slide in the presentation
     for slide in prs.slides:
@@ -158,69 +456,74 @@ def extract_images_from_pptx(file_path):
             if (
                 shape.shape_type == 13
             ):  # Check if the shape is an image (13 is the code for image shape)
-                image_bytes = shape.image.blob  # Get the image blob from the shape
-                image_bytes_io = BytesIO(
-                    image_bytes
-                )  # Create a BytesIO object from the blob
-                compressed_image = compress_image(image_bytes_io)  # Compress the image
-
-                # Calculate the size of the compressed and original image
-                compressed_size = len(compressed_image.getbuffer())
-                original_size = len(image_bytes_io.getbuffer())
-
-                # Choose the smaller image to append to the list
-                if compressed_size > original_size:
-                    logger.info("\t\tExtracting as original image.")
-                    images.append(image_bytes_io)
-                else:
-                    logger.info("\t\tExtracting as WebP compressed image.")
-                    images.append(compressed_image)
+                image = triage.process(shape.image.blob)
+                if image is not None:
+                    images.append(image)
 
+    triage.log_summary()
     return images  # Return the list of image BytesIO objects
 
 
-# Function to extract and compress images from a PDF file using the PyMuPDF library for direct image extraction.
-def extract_images_from_pdf(file_path):
+# Function to extract and compress images from a PowerPoint file.
+def extract_images_from_pptx(file_path):
     """
-    Extract and compress images from a PDF file using the PyMuPDF library.
-
-    This function iterates over each page in the PDF, finds images, and compresses them.
-    The compressed images are returned as a list of BytesIO objects.
+    Extract and compress images from a PowerPoint (.pptx) file.
 
     Parameters:
-    file_path (str): The path to the PDF file.
+    file_path (str or bytes): The path to the PowerPoint file, or its contents.
 
     Returns:
     list: A list of BytesIO objects containing the compressed image data.
     """
-    pdf_file = fitz.open(file_path)  # Open the PDF file using PyMuPDF
-    images = []  # Initialize an empty list to store images
+    return resolve_images(presentation_images(Presentation(open_source(file_path))))
+
+
+# Function to extract and compress images from an opened PyMuPDF document.
+def pdf_document_images(pdf_file, page_numbers=None):
+    """
+    Extract and compress images from an opened PyMuPDF document, page by page.
+
+    Parameters:
+    pdf_file (fitz.Document): The PDF document.
+    page_numbers (iterable): The pages to extract from, in order. Defaults to every page.
 
-    #     logging.info(f"\tPDF has > {len(pdf_file)} < pages.") # Moved to READ_PDF FUNCTION above
+    Returns:
+    list: BytesIO objects for passed-through images and PendingImage objects for the rest.
+    """
+    images = []  # Initialize an empty list to store images
+    triage = ImageTriage()
+    if page_numbers is None:
+        page_numbers = range(len(pdf_file))
 
     # Iterate over each page in the PDF
-    for page_number in range(len(pdf_file)):
+    for page_number in page_numbers:
         page = pdf_file[page_number]  # Get the current page
         img_list = page.get_images(full=True)  # Get a list of images on the page
 
         # Iterate over each image in the list
         for img_index in img_list:
             xref = img_index[0]  # Get the xref of the image
+            if triage.seen_xref(xref):
+                continue  # The same image object is reused across pages
             image = pdf_file.extract_image(xref)  # Extract the image using its xref
-            image_bytes = image["image"]  # Get the image bytes
-            image_bytes_io = BytesIO(
-                image_bytes
-            )  # Create a BytesIO object from the image bytes
-            compressed_image = compress_image(image_bytes_io)  # Compress the image
-
-            # Calculate the size of the compressed and original image
-            compressed_size = len(compressed_image.getbuffer())
-            original_size = len(image_bytes_io.getbuffer())
-
-            # Choose the smaller image to append to the list
-            if compressed_size > original_size:
-                images.append(image_bytes_io)
-            else:
-                images.append(compressed_image)
+            image = triage.process(image["image"])
+            if image is not None:
+                images.append(image)
 
+    triage.log_summary()
     return images  # Return the list of image BytesIO objects
+
+
+# Function to extract and compress images from a PDF file using the PyMuPDF library for direct image extraction.
+def extract_images_from_pdf(file_path):
+    """
+    Extract and compress images from a PDF file using the PyMuPDF library.
+
+    Parameters:
+    file_path (str or bytes): The path to the PDF file, or its contents.
+
+    Returns:
+    list: A list of BytesIO objects containing the compressed image data.
+    """
+    with open_pdf(file_path) as pdf_file:  # Open the PDF file using PyMuPDF
+        return resolve_images(pdf_document_images(pdf_file))
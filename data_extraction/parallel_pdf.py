@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pdfplumber
+
+from data_extraction.image_extractors import (pdf_document_images,
+                                              resolve_images)
+from file_handling.file_io import open_pdf, unique_page_text
+from utilities.configurations.configs import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Smallest page range handed to a single worker process
+MIN_PAGES_PER_TASK = 10
+
+# In a worker process, the document its last page range came from, kept open so the next
+# range of the same document is not parsed again. The worker exits with it once the
+# document's last range is done.
+_worker_document = None
+
+
+class _WorkerDocument:
+    """
+    A PDF opened in a worker process, with PyMuPDF and, when its text engine needs it,
+    pdfplumber.
+
+    The file is read into memory and closed straight away, so the worker holds no handle
+    that would stop it being moved or deleted.
+    """
+
+    def __init__(self, path, key):
+        self.key = key
+        with open(path, "rb") as f:
+            self.contents = f.read()
+        self.pdf_file = open_pdf(self.contents)
+        self.plumber = None
+
+    def plumber_pdf(self):
+        if self.plumber is None:
+            self.plumber = pdfplumber.open(BytesIO(self.contents))
+        return self.plumber
+
+    def close(self):
+        self.pdf_file.close()
+        if self.plumber is not None:
+            self.plumber.close()
+
+
+def _open_worker_document(path):
+    """
+    Return the worker's open copy of a PDF, replacing the one it had open for another file.
+    """
+    global _worker_document
+    stat = os.stat(path)
+    # A path can be reused by a different file, so the key includes its size and mtime
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if _worker_document is not None and _worker_document.key == key:
+        return _worker_document
+    if _worker_document is not None:
+        _worker_document.close()
+        _worker_document = None
+    _worker_document = _WorkerDocument(path, key)
+    return _worker_document
+
+
+def _extract_page_range(path, start, stop, engine, settings=None):
+    """
+    Extract the text and images of pages [start, stop) of a PDF. Runs in a worker process.
+
+    The worker does not load the system config, so the extraction settings are passed in.
+    Only the path crosses the process boundary; the document is opened once per worker and
+    reused for each of its ranges.
+
+    Returns:
+    tuple: The text of each page, in order, and for each image its encoded bytes and its
+           original bytes if they are kept (otherwise None).
+    """
+    for name, value in (settings or {}).items():
+        setattr(AppConfig, name, value)
+
+    document = _open_worker_document(path)
+    page_numbers = range(start, stop)
+    images = [
+        (image.getvalue(), getattr(image, "original", None))
+        for image in resolve_images(
+            pdf_document_images(document.pdf_file, page_numbers)
+        )
+    ]
+    if engine == "pymupdf":
+        page_texts = [document.pdf_file[i].get_text() for i in page_numbers]
+    else:
+        page_texts = []
+        for page in document.plumber_pdf().pages[start:stop]:
+            page_texts.append(page.extract_text())
+            # Drop the parsed layout of the page, which the open document would keep
+            page.close()
+
+    return page_texts, images
+
+
+def page_ranges(page_count, max_workers):
+    """
+    Split a document into contiguous page ranges, a few per worker so that slow ranges
+    do not leave the other workers idle.
+
+    Returns:
+    list: (start, stop) tuples covering every page in order.
+    """
+    pages_per_task = max(MIN_PAGES_PER_TASK, math.ceil(page_count / (max_workers * 4)))
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+def extract_pdf_pages_parallel(
+    source, page_count, engine, max_workers=None, settings=None
+):
+    """
+    Extract the text and images of a large PDF across a pool of worker processes.
+
+    Each worker handles a range of pages. Results are reassembled in page order before the
+    per-page text dedup, so the output matches a sequential extraction. Contents already in
+    memory are written to a temporary file once, so only its path is sent with each range.
+
+    The pool lives for this document only. Its workers keep the parsed document between
+    ranges and release it when they exit after the last one, so no copy outlives the call.
+    Workers are spawned rather than forked because the update process is multithreaded.
+
+    Parameters:
+    source (str or bytes): The path to the PDF file, or its contents.
+    page_count (int): The number of pages in the document.
+    engine (str): The PDF text engine, "pymupdf" or "pdfplumber".
+    max_workers (int): Number of worker processes. Defaults to the number of CPU cores.
+    settings (dict): Extraction settings to apply in the workers (see extraction_settings).
+
+    Returns:
+    tuple: The extracted unique text and a list of BytesIO objects containing image data.
+    """
+    max_workers = max_workers or multiprocessing.cpu_count()
+    ranges = page_ranges(page_count, max_workers)
+    max_workers = min(max_workers, len(ranges))
+    logger.info(
+        f"\t\tExtracting {page_count} PDF pages in {len(ranges)} ranges across {max_workers} processes."
+    )
+
+    temp_path = None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(source)
+        source = temp_path
+
+    page_texts = []
+    images = []
+    seen_images = set()
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        futures = [
+            pool.submit(_extract_page_range, source, start, stop, engine, settings)
+            for start, stop in ranges
+        ]
+        for future in futures:
+            range_texts, range_images = future.result()
+            page_texts.extend(range_texts)
+            for image_bytes, original in range_images:
+                # Each range is triaged separately, so drop images repeated across ranges
+                image_hash = hashlib.sha256(image_bytes).digest()
+                if image_hash not in seen_images:
+                    seen_images.add(image_hash)
+                    image = BytesIO(image_bytes)
+                    if original is not None:
+                        image.original = original
+                    images.append(image)
+    finally:
+        # After a failure, ranges not yet started are cancelled and the running ones are
+        # waited for, so no worker is still reading the file when it is removed
+        pool.shutdown(wait=True, cancel_futures=True)
+        if temp_path is not None:
+            os.remove(temp_path)
+
+    return unique_page_text(page_texts), images
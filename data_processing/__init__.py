@@ -1,3 +1,4 @@
 from .data_processing_manager import DataProcessingManager
+from .ner_batcher import NERBatcher, ner_batcher, shutdown_ner_batcher
 
-__all__ = ["DataProcessingManager"]
+__all__ = ["DataProcessingManager", "NERBatcher", "ner_batcher", "shutdown_ner_batcher"]
@@ -1,7 +1,6 @@
 import hashlib
 import logging
 import os
-import pickle
 import sys
 import threading
 
@@ -10,19 +9,23 @@ import requests
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
-from data_extraction.image_extractors import (extract_images_from_excel,
-                                              extract_images_from_pdf,
-                                              extract_images_from_pptx,
-                                              extract_images_from_word)
-from data_extraction.text_extractors import (extract_text_from_excel,
-                                             extract_text_from_pdf,
-                                             extract_text_from_pptx,
-                                             extract_text_from_word)
+from data_extraction.document_extractors import (extraction_settings,
+                                                 extractor_mapping)
+from data_extraction.extraction_cache import ExtractionCache
+from data_extraction.extraction_sandbox import (ExtractionError,
+                                                sandboxed_extract)
+from data_extraction.image_encoding_pool import image_encoding_pool
+from data_extraction.image_extractors import resolve_images
 from data_processing.info_processing import extract_info
+from data_processing.ner_batcher import ner_batcher
 from database_operations.db_manager import DatabaseManager
 from database_operations.elasticsearch_operations import ElasticsearchDatabase
 from database_operations.hash_checker import HashChecker
+from database_operations.image_store import ImageStore
+from file_handling.file_io import read_file_bytes
+from file_handling.file_manifest import FileManifest
 from utilities import data_preparation
+from utilities.configurations.configs import AppConfig
 from utilities.logging.logging_utilities import error_handler
 
 logger = logging.getLogger(__name__)
@@ -32,15 +35,14 @@ class DataProcessingManager:
     db_manager = DatabaseManager()
     elasticsearch_db = ElasticsearchDatabase()
 
-    file_type_mapping = {
-        "docx": {"text": extract_text_from_word, "image": extract_images_from_word},
-        "xlsx": {"text": extract_text_from_excel, "image": extract_images_from_excel},
-        "pptx": {"text": extract_text_from_pptx, "image": extract_images_from_pptx},
-        "pdf": {"text": extract_text_from_pdf, "image": extract_images_from_pdf},
-    }
+    # Each extractor parses the document once and returns its text and images together
+    file_type_mapping = extractor_mapping
 
     lock = threading.Lock()
 
+    extraction_cache = None  # Created on first use when enabled in the system config
+    cache_lock = threading.Lock()
+
     def __init__(self):
         response = requests.get("http://localhost:5005/api/availabilities")
         response.raise_for_status()
@@ -56,107 +58,190 @@ class DataProcessingManager:
     @classmethod
     @error_handler(reraise=True)
     def process_data(cls, file_path_dict, f_num, lens):
+        """
+        Extract, enrich and save every file in the given dictionary of file paths.
+
+        Returns:
+        dict: A mapping of each file path to its processing status (see FileManifest).
+        """
         logger.info(f"Processing file {f_num} of {lens}")
+        results = {}
         try:
             for ext, files in file_path_dict.items():
                 for file_path in files:
                     logger.info(f"FILE EXT RECEIVED IN PROCESSING MANAGER: {ext}")
-                    file_hash = cls.calculate_file_hash(file_path)
+                    # Read the file once; the same buffer is hashed and parsed
+                    file_bytes, file_hash = read_file_bytes(file_path)
                     filename = os.path.basename(file_path)
+                    results[file_path] = FileManifest.STATUS_FAILED
 
                     # Check if the file hash already exists in the database to prevent re-processing (change at deployment)
                     if HashChecker.check_hash_exists(file_hash):
                         logger.info(
                             f"Skipping {filename}, already processed / exists in database."
                         )
+                        results[file_path] = FileManifest.STATUS_DUPLICATE
                         continue
 
-                    file_type = file_path.split(".")[-1]
-                    logger.info(f"FILE EXT EXTRACTED BY LOGIC: {file_type}")
-                    extractor = cls.file_type_mapping.get(file_type)
-                    logger.info(f"EXTRACTOR RESULTS: {extractor}")
+                    results[file_path] = cls.process_file(
+                        file_path, file_bytes, file_hash
+                    )
 
-                    if extractor:
-                        text_data = (
-                            extractor["text"](file_path)
-                            if "text" in extractor
-                            else None
-                        )
-                        logger.info(f"TEXT_DATA: {text_data}")
+            logger.info("FILE PROCESSED")
 
-                        image_data = (
-                            extractor["image"](file_path)
-                            if "image" in extractor
-                            else None
-                        )
-                        if image_data:
-                            try:
-                                image_data = pickle.dumps(image_data)
-                                logger.info(f"Image data serialized successfully")
-                            except Exception as e:
-                                logger.error(f"Unable to pickle image data: {e}")
-                                image_data = None
-
-                        if text_data:
-                            try:
-                                extracted_data = extract_info(text_data)
-                                logger.info(
-                                    f"Extracted data type: {type(extracted_data)}"
-                                )
-                            except Exception as e:
-                                logger.error(
-                                    f"Unable to extract data from text_data: {e}"
-                                )
-                                extracted_data = None
-
-                        # Preprocess data for saving
+        except Exception as e:
+            logger.error(f"UNABLE TO PROCESS FILE: {e}")
+
+        return results
+
+    @classmethod
+    def process_file(cls, file_path, file_bytes, file_hash):
+        """
+        Extract, enrich and save a single file whose contents have already been read.
+
+        The extractors parse the in-memory contents rather than reopening the file, and the
+        caller is responsible for any duplicate check on the hash.
+
+        Parameters:
+        file_path (str): The path of the file, used for its type and stored with the record.
+        file_bytes (bytes): The contents of the file.
+        file_hash (str): The SHA256 hash of the contents.
+
+        Returns:
+        str: The processing status (see FileManifest).
+        """
+        status = FileManifest.STATUS_FAILED
+        file_type = file_path.split(".")[-1]
+        logger.info(f"FILE EXT EXTRACTED BY LOGIC: {file_type}")
+        extractor = cls.file_type_mapping.get(file_type)
+        logger.info(f"EXTRACTOR RESULTS: {extractor}")
+
+        if extractor:
+            cache = cls.get_extraction_cache()
+            result = cache.get(file_hash) if cache else None
+            cached = result is not None
+            if not cached:
+                try:
+                    if AppConfig.sandbox_enabled:
+                        # A hung or runaway extraction costs at most the sandbox limits
+                        result = sandboxed_extract(file_path, file_bytes)
+                    else:
+                        result = extractor(file_bytes)
+                except ExtractionError as e:
+                    logger.error(f"Unable to extract {file_path}: {e}")
+                    return status
+            logger.info(f"EXTRACTION RESULT: {result}")
+
+            text_data = result.text
+            logger.info(f"TEXT_DATA: {text_data}")
+
+            # Entities are recognised in batches with the texts of the other processing threads
+            batcher = ner_batcher() if text_data else None
+            pending_entities = None
+            if batcher:
+                try:
+                    pending_entities = batcher.submit(text_data)
+                except Exception as e:
+                    # The text is recognised here instead, by extract_info
+                    logger.error(f"Unable to submit text for entity recognition: {e}")
+
+            # Images encode in the pool while the text is enriched below
+            encoding_pool = image_encoding_pool()
+            if encoding_pool:
+                pending_images = encoding_pool.submit(result.images)
+
+            if text_data:
+                try:
+                    entities = None
+                    if pending_entities is not None:
                         try:
-                            processed_data = cls.preprocess_data(
-                                file_path, extracted_data, image_data, file_hash
-                            )
-                            logger.info(f"Processed {file_path}")
+                            entities = pending_entities.result()
                         except Exception as e:
-                            logger.error(f"Unable to preprocess extracted data: {e}")
-                            continue
+                            logger.error(f"Batched entity recognition failed: {e}")
+                    extracted_data = extract_info(text_data, entities)
+                    logger.info(f"Extracted data type: {type(extracted_data)}")
+                except Exception as e:
+                    logger.error(f"Unable to extract data from text_data: {e}")
+                    extracted_data = None
 
-                        # Save data with lock to serialize Elasticsearch access
-                        try:
-                            with cls.lock:
-                                response = cls.elasticsearch_db.save_data(
-                                    processed_data
-                                )
-
-                                # Handle different types of responses
-                                if isinstance(response, dict):
-                                    # If it's a dictionary, log the detailed response
-                                    if response.get("result") == "created":
-                                        logger.info(f"Successfully saved {file_path}")
-                                    else:
-                                        logger.error(
-                                            f"Failed to save {file_path} - Response: {response}"
-                                        )
-                                elif isinstance(response, bool):
-                                    # If response is a boolean, verify if it's True
-                                    if response is True:
-                                        logger.info(f"Successfully saved {file_path}")
-                                    else:
-                                        logger.error(
-                                            f"Failed to save {file_path}, boolean response was False"
-                                        )
-                                else:
-                                    logger.error(
-                                        f"Unexpected response type for {file_path}: {type(response)} - {response}"
-                                    )
+            if encoding_pool:
+                result.images = encoding_pool.collect(pending_images)
+            else:
+                result.images = resolve_images(result.images)
 
-                        except Exception as e:
+            if cache and not cached:
+                try:
+                    cache.put(file_hash, result)
+                except Exception as e:
+                    logger.error(f"Unable to cache extraction of {file_path}: {e}")
+
+            # Images are stored once each in the image store; the report keeps their IDs.
+            # A report is not saved without its images, so a failed store is retried later
+            try:
+                image_data = ImageStore.store_images(result.images)
+            except Exception as e:
+                logger.error(f"Unable to store the images of {file_path}: {e}")
+                return status
+
+            # Preprocess data for saving
+            try:
+                processed_data = cls.preprocess_data(
+                    file_path, extracted_data, image_data, file_hash
+                )
+                logger.info(f"Processed {file_path}")
+            except Exception as e:
+                logger.error(f"Unable to preprocess extracted data: {e}")
+                return status
+
+            # Save data with lock to serialize Elasticsearch access
+            try:
+                with cls.lock:
+                    response = cls.elasticsearch_db.save_data(processed_data)
+
+                    # Handle different types of responses
+                    if isinstance(response, dict):
+                        # If it's a dictionary, log the detailed response
+                        if response.get("result") == "created":
+                            logger.info(f"Successfully saved {file_path}")
+                            status = FileManifest.STATUS_INDEXED
+                        else:
                             logger.error(
-                                f"Unable to save preprocessed data to Elasticsearch: {e}"
+                                f"Failed to save {file_path} - Response: {response}"
                             )
+                    elif isinstance(response, bool):
+                        # If response is a boolean, verify if it's True
+                        if response is True:
+                            logger.info(f"Successfully saved {file_path}")
+                            status = FileManifest.STATUS_INDEXED
+                        else:
+                            logger.error(
+                                f"Failed to save {file_path}, boolean response was False"
+                            )
+                    else:
+                        logger.error(
+                            f"Unexpected response type for {file_path}: {type(response)} - {response}"
+                        )
 
-            logger.info("FILE PROCESSED")
+            except Exception as e:
+                logger.error(f"Unable to save preprocessed data to Elasticsearch: {e}")
 
-        except Exception as e:
-            logger.error(f"UNABLE TO PROCESS FILE: {e}")
+        return status
+
+    @classmethod
+    def get_extraction_cache(cls):
+        """
+        Return the extracted-text cache, or None if it is disabled.
+        """
+        if AppConfig.extraction_cache_dir is None:
+            return None
+        with cls.cache_lock:
+            if cls.extraction_cache is None:
+                cls.extraction_cache = ExtractionCache(
+                    AppConfig.extraction_cache_dir,
+                    max_size_mb=AppConfig.extraction_cache_max_mb,
+                    settings=extraction_settings(),
+                )
+        return cls.extraction_cache
 
     @classmethod
     def calculate_file_hash(cls, file_path):
@@ -1,10 +1,12 @@
 import logging
-import re
 
-from data_processing.text_processing import (
-    extract_classification_and_caveats, extract_keywords, extract_topics,
-    normalize_mgrs, unique_subjects)
+from data_processing.ner_batcher import text_entities
+from data_processing.pattern_scanner import scan_text
+from data_processing.text_processing import (classification_and_caveats,
+                                             extract_keywords, extract_topics,
+                                             normalize_mgrs, unique_subjects)
 from initialization.init_app import AppInitialization
+from utilities.configurations.configs import AppConfig
 
 # from utilities.keyword_loading import Keywords
 
@@ -12,23 +14,29 @@ logger = logging.getLogger(__name__)
 
 
 # Main function to extract various types of information from text using NLP and regex.
-def extract_info(text):
+def extract_info(text, entities=None):
     """
     Extract various types of information from text, such as classifications, topics, locations, and more.
 
     Parameters:
     text (str): The text from which to extract information.
+    entities (list): The (text, label, start, end) entities already recognised in the text,
+                     such as by the NER batcher. If None, the text is run through the NLP
+                     model here.
 
     Returns:
     dict: A dictionary with keys for each information type and their corresponding extracted data.
     """
-    try:
-        # Process the text using the NLP model
-        nlp = AppInitialization.nlp
-
-        doc = nlp(text)
-    except Exception as e:
-        logger.error(f"Unable to load nlp or create doc object: {e}")
+    if entities is None:
+        try:
+            # Process the text using the NLP model, in chunks if it is long
+            nlp = AppInitialization.nlp
+
+            entities = text_entities(nlp, text, AppConfig.nlp_chunk_chars)
+        except Exception as e:
+            logger.error(f"Unable to load nlp or create doc object: {e}")
+            # Carry on with the entity-free extraction rather than losing the document
+            entities = []
     # Initialize dictionary to hold extracted information
     info = {
         "highest_classification": None,
@@ -43,30 +51,13 @@ def extract_info(text):
     }
 
     try:
-        # Define custom regex patterns for extracting specific types of timeframes
-        time_patterns = [
-            r"\b\d{1,4}([-/.])\d{1,2}\1\d{1,4}\b",  # Dates with various separators
-            r"\b\d{1,2}:\d{1,2}(?::\d{1,2})?\s?(?:AM|PM)?\b",  # Times with optional seconds and AM/PM
-            r"\b(next|last)?\s?\d+\s?(days?|months?|years?|hours?|minutes?|hrs?|mins?)\b",  # Relative times
-            r"\b(jan\.?|feb\.?|mar\.?|apr\.?|may|jun\.?|jul\.?|aug\.?|sep\.?|oct\.?|nov\.?|dec\.?)\s?\d{1,4}\b",  # Month abbreviations
-            r"\b(mon|tue|wed|thu|fri|sat|sun)day\b",  # Days of the week
-            (
-                r"\b\d{1,2}(st|nd|rd|th)\s(of\s)?(january|february|march|april|may|june|july|august|september|"
-                r"october|november|december),?\s\d{1,4}\b"  # Complex date expressions
-            ),
-            r"\b\d{1,2}/\d{1,2}\b",  # Numeric month/day
-            r"\b\d{1,2}-\d{1,2}-\d{2,4}\b",  # Numeric date with dashes
-            # Add more patterns as necessary
-        ]
+        # Find the MGRS coordinates, timeframes and classification markings in one pass
+        patterns = scan_text(text)
 
         # Initialize an empty set to keep track of unique MGRS coordinates found in the text
         unique_mgrs = set()
 
-        # Use regex to find all potential MGRS coordinates in the text
-        mgrs_coords = re.findall(
-            r"\b\d{1,2}[a-zA-Z]{1,3}\s?\w{1,5}\s?\d{1,5}\s?\d{1,5}\b", text
-        )
-        for coord in mgrs_coords:
+        for coord in patterns["mgrs"]:
             # Normalize MGRS coordinates by removing spaces
             normalized_coord = normalize_mgrs(coord)
             if normalized_coord not in unique_mgrs:
@@ -81,13 +72,13 @@ def extract_info(text):
                     )  # Otherwise, store the original coordinate format
 
         # Iterate through the entities recognized by spaCy's NLP model
-        for ent in doc.ents:
+        for ent_text, ent_label, *_ in entities:
             # Check the type of entity and add to the corresponding list in the 'info' dictionary
-            if ent.label_ == "GPE":
-                info["locations"].append(ent.text)
-            elif ent.label_ in ["DATE", "TIME"]:
-                info["timeframes"].append(ent.text)
-            elif ent.label_ in [
+            if ent_label == "GPE":
+                info["locations"].append(ent_text)
+            elif ent_label in ["DATE", "TIME"]:
+                info["timeframes"].append(ent_text)
+            elif ent_label in [
                 "ORG",
                 "PERSON",
                 "NORP",
@@ -100,30 +91,24 @@ def extract_info(text):
                 "LANGUAGE",
             ]:
                 # Create a dictionary for each subject with the text and label
-                subject_dict = {"text": ent.text, "label": ent.label_}
+                subject_dict = {"text": ent_text, "label": ent_label}
                 info["subjects"].append(subject_dict)
 
         # Remove duplicate subjects from the list
         info["subjects"] = unique_subjects(info["subjects"])
 
-        # Combine individual time patterns into one large regex pattern using non-capturing groups
-        time_combined_pattern = "|".join(f"(?:{pattern})" for pattern in time_patterns)
-
-        # Find all matches for the combined time pattern in the text
-        time_matches = re.finditer(time_combined_pattern, text, re.IGNORECASE)
-
-        # Add each non-empty match to the final timeframes list
-        for time_match in time_matches:
-            non_empty_group = next(filter(None, time_match.groups("")), "")
-            if non_empty_group:
-                info["timeframes"].append(non_empty_group.strip())
+        # Add each timeframe match to the final timeframes list
+        for timeframe in patterns["timeframes"]:
+            info["timeframes"].append(timeframe.strip())
 
         # Deduplicate timeframes by converting the list to a set and back to a list
         info["timeframes"] = list(set(info["timeframes"]))
         logger.info(f"Extracted timeframes: {info['timeframes']}")
 
-        # Extract the highest classification and any caveats from the text
-        highest_classification, caveats = extract_classification_and_caveats(text)
+        # Find the highest classification and any caveats among the markings in the text
+        highest_classification, caveats = classification_and_caveats(
+            patterns["markings"]
+        )
 
         # Update the 'info' dictionary with the extracted classification and caveats
         info["highest_classification"] = highest_classification
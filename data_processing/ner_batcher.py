@@ -0,0 +1,389 @@
+import logging
+import multiprocessing
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from initialization.init_app import AppInitialization
+from utilities.configurations.configs import (NER_UNUSED_COMPONENTS, AppConfig,
+                                              load_nlp_model)
+
+logger = logging.getLogger(__name__)
+
+_worker_nlp = None
+
+# Chunks end at the last paragraph break in their window, else the last sentence end
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+WORD_BREAK = re.compile(r"\s+")
+
+# A chunk split mid-sentence overlaps the next by this much, so an entity cut at the split
+# is seen whole in the next chunk
+CHUNK_OVERLAP_CHARS = 200
+
+
+def doc_entities(doc, offset=0):
+    """
+    Return the entities of a spaCy document as (text, label, start, end) tuples, with the
+    character offsets shifted by offset.
+    """
+    return [
+        (ent.text, ent.label_, ent.start_char + offset, ent.end_char + offset)
+        for ent in doc.ents
+    ]
+
+
+def _last_break(window):
+    # Only accept breaks in the second half of the window, to avoid very short chunks
+    for pattern in (PARAGRAPH_BREAK, SENTENCE_BREAK):
+        last = None
+        for last in pattern.finditer(window, len(window) // 2):
+            pass
+        if last is not None:
+            return last.end(), True
+    last = None
+    for last in WORD_BREAK.finditer(window, len(window) // 2):
+        pass
+    return (last.end() if last is not None else len(window)), False
+
+
+def chunk_text(text, max_chars):
+    """
+    Split a text into chunks of at most max_chars characters, aligned to paragraph or
+    sentence boundaries where possible.
+
+    Parameters:
+    text (str): The text to split.
+    max_chars (int): The largest chunk to produce.
+
+    Yields:
+    tuple: The offset of each chunk in the text and the chunk itself.
+    """
+    start = 0
+    while len(text) - start > max_chars:
+        end, aligned = _last_break(text[start : start + max_chars])
+        yield start, text[start : start + end]
+        if aligned or end <= CHUNK_OVERLAP_CHARS:
+            start += end
+        else:
+            start += end - CHUNK_OVERLAP_CHARS
+    if start < len(text) or not text:
+        yield start, text[start:]
+
+
+def merge_entities(chunk_entities):
+    """
+    Merge the entities found in the chunks of a text into one list ordered by position.
+
+    Entities repeated where chunks overlap are kept once; where spans overlap, the longest
+    is kept, since a shorter one was cut off at the end of its chunk.
+
+    Parameters:
+    chunk_entities (iterable): Lists of (text, label, start, end) entities with offsets in
+                               the whole text.
+
+    Returns:
+    list: The merged (text, label, start, end) entities.
+    """
+    entities = sorted(
+        (entity for entities in chunk_entities for entity in entities),
+        key=lambda entity: (entity[2], entity[2] - entity[3]),
+    )
+    merged = []
+    for entity in entities:
+        if merged and entity[2] < merged[-1][3]:
+            continue
+        merged.append(entity)
+    return merged
+
+
+def text_entities(nlp, text, max_chars, batch_size=32):
+    """
+    Find the entities of a text with the model on the calling thread, in chunks of at most
+    max_chars characters.
+
+    Returns:
+    list: The (text, label, start, end) entities of the text.
+    """
+    if len(text) <= max_chars:
+        return doc_entities(nlp(text))
+    max_chars = min(max_chars, nlp.max_length)
+    # Chunks are streamed through the model, so only one batch of them is parsed at a time
+    docs = nlp.pipe(
+        ((chunk, offset) for offset, chunk in chunk_text(text, max_chars)),
+        as_tuples=True,
+        batch_size=batch_size,
+        disable=_disabled_components(nlp),
+    )
+    return merge_entities(doc_entities(doc, offset) for doc, offset in docs)
+
+
+def _disabled_components(nlp):
+    # Components that are loaded but do not contribute to entities are skipped
+    return [name for name in nlp.pipe_names if name in NER_UNUSED_COMPONENTS]
+
+
+def _pipe_entities(nlp, texts, batch_size):
+    return [
+        doc_entities(doc)
+        for doc in nlp.pipe(
+            texts, batch_size=batch_size, disable=_disabled_components(nlp)
+        )
+    ]
+
+
+def _load_worker_model(model_name, profile, exclude):
+    """
+    Load the spaCy model once in each worker process.
+    """
+    global _worker_nlp
+    _worker_nlp = load_nlp_model(model_name, profile, exclude)
+
+
+def _worker_pipe_entities(texts, batch_size):
+    """
+    Find the entities of a batch of texts. Runs in a worker process.
+
+    Returns:
+    list: The (text, label, start, end) entities of each text, in order.
+    """
+    return _pipe_entities(_worker_nlp, texts, batch_size)
+
+
+class NERBatcher:
+    """
+    Collects the texts submitted by the document processing threads into batches and runs
+    named entity recognition on each batch with nlp.pipe.
+
+    A batch is sent once batch_size texts are waiting or the oldest has waited max_wait_ms.
+    With more than one process, batches run in a pool of worker processes that each load the
+    model once, so several batches are processed at a time across cores; otherwise they run
+    on the batcher's own thread with the loaded model.
+    """
+
+    def __init__(
+        self,
+        nlp,
+        n_process=1,
+        batch_size=32,
+        max_wait_ms=50,
+        model_name=None,
+        profile="full",
+        exclude=(),
+        chunk_chars=100_000,
+    ):
+        self.nlp = nlp
+        self.n_process = n_process or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.chunk_chars = min(chunk_chars, nlp.max_length)
+        # Worker processes load the model by name with the same profile as the main process
+        self.model_name = model_name
+        self.profile = profile
+        self.exclude = exclude
+        self.pending = []
+        self.condition = threading.Condition()
+        self.closed = False
+        self.executor = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, text):
+        """
+        Queue a text for entity recognition.
+
+        Texts longer than chunk_chars are split into chunks that are recognised separately,
+        possibly in different batches, and their entities merged once all are done.
+
+        Returns:
+        Future: Resolves to the (text, label, start, end) entities found in the text.
+        """
+        future = Future()
+        chunks = [
+            (offset, chunk, Future())
+            for offset, chunk in chunk_text(text, self.chunk_chars)
+        ]
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("NER batcher is closed")
+            self.pending.extend(
+                (chunk, chunk_future) for _, chunk, chunk_future in chunks
+            )
+            self.condition.notify_all()
+
+        remaining = [len(chunks)]
+        lock = threading.Lock()
+
+        def chunk_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                future.set_result(
+                    merge_entities(
+                        [
+                            (ent, label, start + offset, end + offset)
+                            for ent, label, start, end in chunk_future.result()
+                        ]
+                        for offset, _, chunk_future in chunks
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+
+        for _, _, chunk_future in chunks:
+            chunk_future.add_done_callback(chunk_done)
+        return future
+
+    def entities(self, text):
+        """
+        Return the (text, label, start, end) entities found in a text, waiting for its batch.
+        """
+        return self.submit(text).result()
+
+    def _next_batch(self):
+        with self.condition:
+            while not self.pending and not self.closed:
+                self.condition.wait()
+            # Give the other processing threads a moment to fill the batch
+            deadline = time.monotonic() + self.max_wait
+            while len(self.pending) < self.batch_size and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            batch = self.pending[: self.batch_size]
+            del self.pending[: self.batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            texts = [text for text, _ in batch]
+            futures = [future for _, future in batch]
+            if self.n_process > 1 and self.model_name:
+                self._dispatch(texts, futures)
+            else:
+                self._pipe_here(texts, futures)
+
+    def _pipe_here(self, texts, futures):
+        try:
+            results = _pipe_entities(self.nlp, texts, self.batch_size)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, entities in zip(futures, results):
+            future.set_result(entities)
+
+    def _get_executor(self):
+        with self.condition:
+            if self.executor is not None:
+                return self.executor
+            # Workers are spawned rather than forked because the update process is multithreaded
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.n_process,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_worker_model,
+                initargs=(self.model_name, self.profile, self.exclude),
+            )
+        return self.executor
+
+    def _dispatch(self, texts, futures):
+        def batch_done(batch_future):
+            try:
+                results = batch_future.result()
+            except BrokenProcessPool:
+                logger.error("NER worker pool broke, processing batches here instead.")
+                self._fall_back(texts, futures)
+                return
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                return
+            for future, entities in zip(futures, results):
+                future.set_result(entities)
+
+        try:
+            batch_future = self._get_executor().submit(
+                _worker_pipe_entities, texts, self.batch_size
+            )
+        except Exception as e:
+            logger.error(f"Unable to submit batch to NER workers: {e}")
+            self._fall_back(texts, futures)
+            return
+        batch_future.add_done_callback(batch_done)
+
+    def _fall_back(self, texts, futures):
+        """
+        Stop using the worker pool and requeue a batch to be processed on the batcher thread.
+        """
+        with self.condition:
+            self.n_process = 1
+            executor, self.executor = self.executor, None
+            if not self.closed:
+                self.pending[:0] = list(zip(texts, futures))
+                self.condition.notify_all()
+                texts = None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if texts is not None:
+            # The batcher thread may already have stopped
+            self._pipe_here(texts, futures)
+
+    def close(self):
+        """
+        Process any queued texts, then stop the batcher thread and worker processes.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        with self.condition:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_ner_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def ner_batcher():
+    """
+    Return the shared NER batcher, or None when each document is recognised on its own.
+
+    Setting AppConfig.nlp_processes to 0 disables batching; None uses every CPU core.
+    """
+    global _ner_batcher
+    if AppConfig.nlp_processes == 0 or AppInitialization.nlp is None:
+        return None
+    with _batcher_lock:
+        if _ner_batcher is None:
+            _ner_batcher = NERBatcher(
+                AppInitialization.nlp,
+                n_process=AppConfig.nlp_processes,
+                batch_size=AppConfig.nlp_batch_size,
+                max_wait_ms=AppConfig.nlp_batch_wait_ms,
+                model_name=AppConfig.nlp_model,
+                profile=AppConfig.nlp_profile,
+                exclude=AppConfig.nlp_exclude,
+                chunk_chars=AppConfig.nlp_chunk_chars,
+            )
+        return _ner_batcher
+
+
+def shutdown_ner_batcher():
+    """
+    Stop the shared NER batcher, if it was started.
+    """
+    global _ner_batcher
+    with _batcher_lock:
+        batcher, _ner_batcher = _ner_batcher, None
+    if batcher is not None:
+        batcher.close()
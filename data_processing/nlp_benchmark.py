@@ -0,0 +1,156 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import psutil
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from data_processing.ner_batcher import doc_entities
+from utilities.configurations.configs import NLP_PROFILES, load_nlp_model
+
+
+def load_texts(path, limit=None):
+    """
+    Read the documents to benchmark with: every .txt file under a directory, or one document
+    per non-empty line of a single text file.
+
+    Returns:
+    list: The text of each document.
+    """
+    if os.path.isdir(path):
+        texts = []
+        for dirpath, _, filenames in sorted(os.walk(path)):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(".txt"):
+                    with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
+                        texts.append(f.read())
+    else:
+        with open(path, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    return texts[:limit] if limit else texts
+
+
+def _rss_mb():
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def benchmark_profile(model_name, profile, texts, batch_size=32, exclude=()):
+    """
+    Load a model with an NLP profile and time entity recognition over the texts.
+
+    Memory is measured in the calling process, so each profile should be benchmarked in a
+    fresh process (see run_benchmark) for the figures to be comparable.
+
+    Returns:
+    dict: The profile, its loaded components, load time, documents per second, the growth
+          in resident memory from loading the model and from processing the texts, and the
+          (text, label) entities of each document.
+    """
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    nlp = load_nlp_model(model_name, profile, exclude)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+
+    start = time.perf_counter()
+    entities = [doc_entities(doc) for doc in nlp.pipe(texts, batch_size=batch_size)]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "profile": profile,
+        "components": list(nlp.pipe_names),
+        "load_seconds": load_seconds,
+        "docs_per_second": len(texts) / elapsed if elapsed else float("inf"),
+        "model_mb": rss_loaded - rss_start,
+        "processing_mb": _rss_mb() - rss_loaded,
+        "entities": entities,
+    }
+
+
+def entity_parity(reference, candidate):
+    """
+    Return the fraction of documents whose entities are identical in both results.
+    """
+    if not reference:
+        return 1.0
+    matches = sum(1 for ref, cand in zip(reference, candidate) if ref == cand)
+    return matches / len(reference)
+
+
+def run_benchmark(model_name, texts, profiles=("full", "ner"), batch_size=32):
+    """
+    Benchmark each NLP profile in its own spawned process and compare its entities with
+    those of the first profile.
+
+    Returns:
+    list: The result of benchmark_profile for each profile, with a "parity" fraction added.
+    """
+    results = []
+    for profile in profiles:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            result = executor.submit(
+                benchmark_profile, model_name, profile, texts, batch_size
+            ).result()
+        reference = results[0]["entities"] if results else result["entities"]
+        result["parity"] = entity_parity(reference, result["entities"])
+        results.append(result)
+    return results
+
+
+def format_report(results):
+    """
+    Format benchmark results as a plain text table.
+    """
+    lines = [
+        f"{'profile':<10}{'docs/sec':>12}{'load s':>10}{'model MB':>11}"
+        f"{'proc MB':>10}{'parity':>9}  components"
+    ]
+    for result in results:
+        lines.append(
+            f"{result['profile']:<10}{result['docs_per_second']:>12.1f}"
+            f"{result['load_seconds']:>10.2f}{result['model_mb']:>11.1f}"
+            f"{result['processing_mb']:>10.1f}{result['parity']:>9.1%}  "
+            f"{', '.join(result['components'])}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the speed, memory and entity parity of NLP profiles."
+    )
+    parser.add_argument(
+        "texts", help="A directory of .txt files, or a file with one document per line."
+    )
+    parser.add_argument(
+        "--model", default="en_core_web_sm", help="The spaCy model to load."
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["full", "ner"],
+        choices=sorted(NLP_PROFILES),
+        help="The profiles to compare; parity is measured against the first.",
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--limit", type=int, help="Benchmark only the first N documents."
+    )
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.texts, args.limit)
+    print(f"Benchmarking {len(texts)} documents with {args.model}")
+    print(
+        format_report(run_benchmark(args.model, texts, args.profiles, args.batch_size))
+    )
+
+
+if __name__ == "__main__":
+    main()
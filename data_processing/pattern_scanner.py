@@ -0,0 +1,138 @@
+import re
+
+# The pattern families found in document text: MGRS coordinates, timeframes and
+# classification markings. Their patterns are combined into one regular expression so the
+# text is traversed once, rather than once per family.
+
+MGRS_PATTERN = r"\d{1,2}[a-zA-Z]{1,3}\s?\w{1,5}\s?\d{1,5}\s?\d{1,5}\b"
+
+MARKING_PATTERN = r"\((U|C|S|Classification)(?://([\w,]+))?\)"
+
+TIME_UNITS = r"(?:days?|months?|years?|hours?|minutes?|hrs?|mins?)"
+MONTH_ABBREVIATIONS = (
+    r"jan\.?|feb\.?|mar\.?|apr\.?|may|jun\.?|jul\.?|aug\.?|sep\.?|oct\.?|nov\.?|dec\.?"
+)
+MONTH_NAMES = (
+    r"january|february|march|april|may|june|july|august|september|october|november|"
+    r"december"
+)
+
+# Timeframes that start with a digit, in the order they are tried. A match is recorded by
+# the first of its named groups that is set; a match without one is consumed but not kept.
+DIGIT_TIMEFRAMES = [
+    r"\d{1,4}(?P<date_separator>[-/.])\d{1,2}(?P=date_separator)\d{1,4}\b",
+    r"\d{1,2}:\d{1,2}(?::\d{1,2})?\s?(?:AM|PM)?\b",
+    r"\d+\s?(?P<unit>" + TIME_UNITS + r")\b",
+    r"\d{1,2}(?P<ordinal>st|nd|rd|th)\s(?:of\s)?(?:" + MONTH_NAMES + r"),?\s\d{1,4}\b",
+    r"\d{1,2}/\d{1,2}\b",
+    r"\d{1,2}-\d{1,2}-\d{2,4}\b",
+]
+
+# Timeframes that start with a word. The lookahead rejects most words with a single check
+# before the alternatives are tried.
+WORD_TIMEFRAMES = (
+    r"(?=[A-Za-z]{3}(?:[A-Za-z]\s?\d|\.?\s?\d|[dD][aA][yY]\b))(?i:"
+    r"(?P<relative>next|last)\s?\d+\s?" + TIME_UNITS + r"\b"
+    r"|(?P<month>" + MONTH_ABBREVIATIONS + r")\s?\d{1,4}\b"
+    r"|(?P<weekday>mon|tue|wed|thu|fri|sat|sun)day\b)"
+)
+
+TIMEFRAME_GROUPS = ("date_separator", "unit", "ordinal", "relative", "month", "weekday")
+
+MARKING_BODY = r"(?P<classification>U|C|S|Classification)(?://(?P<caveats>[\w,]+))?\)"
+
+
+def _unnamed(pattern):
+    # A pattern used a second time in the scanner cannot repeat its group names
+    return re.sub(r"\(\?P<\w+>", "(?:", pattern)
+
+
+# Each match first skips, in a single loop inside the regex engine, the punctuation,
+# brackets and words that cannot start a match, rather than the engine retrying the pattern
+# at every character. It then captures a marking, or the coordinate and timeframe starting
+# at a word. Coordinates and markings are captured in lookaheads without consuming text, so
+# timeframes overlapping them are still found, as they would be by a scan for each family.
+# Everything after the loop is optional, so a match never fails and the engine never
+# backtracks into the loop: plain greedy quantifiers behave as possessive ones would, which
+# Python only supports from 3.11.
+SCANNER = re.compile(
+    r"(?:[^\w(]+|\((?!" + _unnamed(MARKING_BODY) + r")"
+    r"|(?!\d|" + _unnamed(WORD_TIMEFRAMES) + r")\w+)*"
+    r"(?:\((?=" + MARKING_BODY + r")"
+    r"|(?P<token>(?=\d)(?:(?=(?P<mgrs>" + MGRS_PATTERN + r")))?"
+    r"(?:(?i:" + "|".join(DIGIT_TIMEFRAMES) + r")|\w+)"
+    r"|" + WORD_TIMEFRAMES + r"))?"
+)
+
+# Used to find coordinates that start inside a timeframe
+MGRS = re.compile(r"\b" + MGRS_PATTERN)
+WORD_START = re.compile(r"\b(?=\d)")
+
+MARKING = re.compile(MARKING_PATTERN)
+
+# Patterns used when cleaning extracted values
+MGRS_LIKE_OR_NUMBER = re.compile(
+    r"\b\d{1,2}[A-Za-z]{1,3}(?:\s+[A-Za-z]{1,2})?\s*\d+\s*\d+\b|\b\d+\b|\bMGRS\b"
+)
+NUMBER = re.compile(r"^\d+$")
+TIMEFRAME_FORMAT = re.compile(
+    r"(\d{1,4}[-/]\d{1,2}[-/]\d{1,4})|"  # Matches date formats like YYYY-MM-DD or MM/DD/YYYY
+    r"(\d{1,2}:\d{1,2})|"  # Matches time formats like HH:MM
+    r"(next|last)?\s?\d+\s?(days?|months?|years?|hours?|minutes?)|"  # Matches phrases like "next 5 days"
+    r"(january|february|march|april|may|june|july|august|september|"
+    r"october|november|december)\s?\d{1,4}|"  # Matches month names followed by a day or year
+    r"(monday|tuesday|wednesday|thursday|friday|saturday|sunday)",  # Matches day names
+    re.IGNORECASE,
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+def scan_text(text):
+    """
+    Find the MGRS coordinates, timeframes and classification markings in a text in a single
+    pass.
+
+    The results are the same as scanning the text separately for each family: coordinates
+    and timeframes never overlap others of their own family, but may overlap each other.
+
+    Parameters:
+    text (str): The text to scan.
+
+    Returns:
+    dict: "mgrs" holds the coordinates as written, "timeframes" the timeframe matches and
+          "markings" a (classification, caveats) pair for each marking, with caveats "" when
+          the marking has none. Each list is in order of appearance.
+    """
+    mgrs = []
+    timeframes = []
+    markings = []
+    mgrs_end = 0
+
+    def add_mgrs(start, coordinate):
+        nonlocal mgrs_end
+        if start >= mgrs_end:
+            mgrs.append(coordinate)
+            mgrs_end = start + len(coordinate)
+
+    for match in SCANNER.finditer(text):
+        classification, caveats, coordinate, *values = match.group(
+            "classification", "caveats", "mgrs", *TIMEFRAME_GROUPS
+        )
+        if classification:
+            markings.append((classification, caveats or ""))
+            continue
+        start, end = match.span("token")
+        if start < 0:
+            # Only the end of the text was skipped to
+            continue
+        if coordinate:
+            add_mgrs(start, coordinate)
+        value = next(filter(None, values), "")
+        if value:
+            timeframes.append(value)
+        # The timeframe was consumed, so look inside it for coordinates
+        for word in WORD_START.finditer(text, start + 1, end):
+            coordinate = MGRS.match(text, word.start())
+            if coordinate:
+                add_mgrs(word.start(), coordinate.group())
+    return {"mgrs": mgrs, "timeframes": timeframes, "markings": markings}
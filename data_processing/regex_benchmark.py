@@ -0,0 +1,176 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from data_processing.nlp_benchmark import load_texts
+from data_processing.pattern_scanner import scan_text
+
+# The patterns extract_info scanned the text with before the single-pass scanner, one
+# traversal of the text each
+LEGACY_MGRS_PATTERN = r"\b\d{1,2}[a-zA-Z]{1,3}\s?\w{1,5}\s?\d{1,5}\s?\d{1,5}\b"
+LEGACY_TIME_PATTERNS = [
+    r"\b\d{1,4}([-/.])\d{1,2}\1\d{1,4}\b",
+    r"\b\d{1,2}:\d{1,2}(?::\d{1,2})?\s?(?:AM|PM)?\b",
+    r"\b(next|last)?\s?\d+\s?(days?|months?|years?|hours?|minutes?|hrs?|mins?)\b",
+    r"\b(jan\.?|feb\.?|mar\.?|apr\.?|may|jun\.?|jul\.?|aug\.?|sep\.?|oct\.?|nov\.?|dec\.?)\s?\d{1,4}\b",
+    r"\b(mon|tue|wed|thu|fri|sat|sun)day\b",
+    (
+        r"\b\d{1,2}(st|nd|rd|th)\s(of\s)?(january|february|march|april|may|june|july|august|september|"
+        r"october|november|december),?\s\d{1,4}\b"
+    ),
+    r"\b\d{1,2}/\d{1,2}\b",
+    r"\b\d{1,2}-\d{1,2}-\d{2,4}\b",
+]
+LEGACY_MARKING_PATTERN = r"\((U|C|S|Classification)(?:\/\/([\w,]+))?\)"
+
+# Words and pattern matches the synthetic documents are made of, with the share of each match
+SYNTHETIC_WORDS = (
+    "the report assessed civil engagement near the border with partners and local "
+    "leaders during"
+).split()
+SYNTHETIC_MATCHES = [
+    (0.01, "38SMB 12345 67890"),
+    (0.01, "12/05/2020"),
+    (0.005, "(S//NOFORN)"),
+    (0.005, "next 5 days"),
+    (0.005, "Jan 2021"),
+]
+
+
+def legacy_scan(text):
+    """
+    Scan a text for MGRS coordinates, timeframes and markings the way extract_info did before
+    the single-pass scanner, with a separate traversal for each family.
+
+    Returns:
+    dict: The results in the form returned by scan_text.
+    """
+    mgrs = re.findall(LEGACY_MGRS_PATTERN, text)
+    time_combined_pattern = "|".join(
+        f"(?:{pattern})" for pattern in LEGACY_TIME_PATTERNS
+    )
+    timeframes = []
+    for time_match in re.finditer(time_combined_pattern, text, re.IGNORECASE):
+        non_empty_group = next(filter(None, time_match.groups("")), "")
+        if non_empty_group:
+            timeframes.append(non_empty_group)
+    markings = re.findall(LEGACY_MARKING_PATTERN, text)
+    return {"mgrs": mgrs, "timeframes": timeframes, "markings": markings}
+
+
+def synthetic_text(size, seed=1):
+    """
+    Generate a report-like text of about size characters, with coordinates, dates, relative
+    timeframes and markings scattered through it.
+    """
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        part = None
+        for share, match in SYNTHETIC_MATCHES:
+            if roll < share:
+                part = match
+                break
+            roll -= share
+        if part is None:
+            part = rng.choice(SYNTHETIC_WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+
+def _best_time(scan, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = scan(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_scanners(texts, repeat=3):
+    """
+    Time the legacy and single-pass scans of each text and check that they agree.
+
+    Returns:
+    dict: The number of documents and characters, the mean milliseconds per document of
+          each scan (the best of repeat runs for each document), the speedup and the
+          fraction of documents with identical results.
+    """
+    legacy_seconds = 0.0
+    scanner_seconds = 0.0
+    matching = 0
+    for text in texts:
+        legacy_time, legacy_result = _best_time(legacy_scan, text, repeat)
+        scanner_time, scanner_result = _best_time(scan_text, text, repeat)
+        legacy_seconds += legacy_time
+        scanner_seconds += scanner_time
+        matching += legacy_result == scanner_result
+    documents = len(texts) or 1
+    return {
+        "documents": len(texts),
+        "characters": sum(len(text) for text in texts),
+        "legacy_ms": legacy_seconds * 1000 / documents,
+        "scanner_ms": scanner_seconds * 1000 / documents,
+        "speedup": legacy_seconds / scanner_seconds
+        if scanner_seconds
+        else float("inf"),
+        "parity": matching / documents if texts else 1.0,
+    }
+
+
+def format_report(result):
+    """
+    Format benchmark results as plain text.
+    """
+    return "\n".join(
+        [
+            f"documents:  {result['documents']} ({result['characters']:,} characters)",
+            f"legacy:     {result['legacy_ms']:.2f} ms per document",
+            f"scanner:    {result['scanner_ms']:.2f} ms per document",
+            f"speedup:    {result['speedup']:.1f}x",
+            f"parity:     {result['parity']:.1%}",
+        ]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the single-pass pattern scanner with the legacy regex scans."
+    )
+    parser.add_argument(
+        "texts",
+        nargs="?",
+        help="A directory of .txt files, or a file with one document per line.",
+    )
+    parser.add_argument(
+        "--synthetic-mb",
+        type=float,
+        default=1.0,
+        help="Without texts, the size of the synthetic document to benchmark with.",
+    )
+    parser.add_argument("--synthetic-docs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--limit", type=int, help="Benchmark only the first N documents."
+    )
+    args = parser.parse_args(argv)
+
+    if args.texts:
+        texts = load_texts(args.texts, args.limit)
+    else:
+        size = int(args.synthetic_mb * 1024 * 1024)
+        texts = [synthetic_text(size, seed) for seed in range(args.synthetic_docs)]
+    print(format_report(benchmark_scanners(texts, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
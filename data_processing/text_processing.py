@@ -5,6 +5,9 @@ import re
 from sklearn.decomposition import NMF  # Non-negative Matrix Factorization
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
 
+from data_processing.pattern_scanner import (MARKING, MGRS,
+                                             MGRS_LIKE_OR_NUMBER, NUMBER,
+                                             TIMEFRAME_FORMAT, WHITESPACE)
 from utilities.keyword_loading import Keywords
 
 logger = logging.getLogger(__name__)
@@ -77,10 +80,8 @@ def extract_topics(text, num_topics=5, top_n=5):
         {
             topic
             for topic in topics
-            if not re.match(r"^\d+$", topic)
-            and not re.match(
-                r"\b\d{1,2}[a-zA-Z]{1,3}\s?\w{1,5}\s?\d{1,5}\s?\d{1,5}\b", topic
-            )
+            if not NUMBER.match(topic)
+            and not MGRS.match(topic)
             and len(topic) > 2
             and topic not in ENGLISH_STOP_WORDS
         }
@@ -110,6 +111,20 @@ def extract_classification_and_caveats(text):
     Parameters:
     text (str): The text from which to extract classifications and caveats.
 
+    Returns:
+    tuple: A tuple containing the highest classification and a list of caveats.
+    """
+    return classification_and_caveats(MARKING.findall(text))
+
+
+def classification_and_caveats(matches):
+    """
+    Find the highest classification and the caveats among the markings found in a text.
+
+    Parameters:
+    matches (list): A (classification, caveats) pair for each marking, such as those returned
+                    by scan_text.
+
     Returns:
     tuple: A tuple containing the highest classification and a list of caveats.
     """
@@ -117,10 +132,6 @@ def extract_classification_and_caveats(text):
     highest_classification = "none_found"
     caveats = "none_found"
 
-    # Improved regex pattern to capture classification and caveats
-    classification_pattern = r"\((U|C|S|Classification)(?:\/\/([\w,]+))?\)"
-    matches = re.findall(classification_pattern, text)
-
     logger.info(f"Matches found: {matches}")
 
     if matches:
@@ -149,21 +160,31 @@ def extract_keywords(text):
     """
     Extract keywords from the text that match a predefined list of keywords.
 
+    Keywords are matched case-insensitively on whole words, so "IO" is not found in
+    "violation".
+
     Parameters:
     text (str): The text to search for keywords.
 
     Returns:
     list: A list of found keywords.
     """
-    keywords_list = Keywords.keywords_list
-    logger.info(f"Keywords being used in extraction process:\n{keywords_list}")
+    return list(keyword_matches(text))
 
-    found_keywords = set()
-    text_lower = text.lower()
-    for keyword in keywords_list:
-        if keyword.lower() in text_lower:
-            found_keywords.add(keyword)
-    return list(found_keywords)
+
+def keyword_matches(text):
+    """
+    Find the keywords of the predefined list in the text, matched on whole words.
+
+    Parameters:
+    text (str): The text to search for keywords.
+
+    Returns:
+    dict: The (start, end) offsets of each match of each keyword found.
+    """
+    matcher = Keywords.get_matcher()
+    logger.debug(f"Matching {len(matcher.keywords)} keywords.")
+    return matcher.find(text)
 
 
 # Function to filter out unwanted text patterns, such as MGRS coordinates and numbers.
@@ -177,17 +198,8 @@ def filter_text(text):
     Returns:
     str: The filtered text.
     """
-    # Regex to match MGRS-like patterns
-    text = re.sub(
-        r"\b\d{1,2}[A-Za-z]{1,3}(?:\s+[A-Za-z]{1,2})?\s*\d+\s*\d+\b", "", text
-    )
-    # Remove purely numeric strings
-    text = re.sub(r"\b\d+\b", "", text)
-
-    # Remove the word "MGRS"
-    text = re.sub(r"\bMGRS\b", "", text)
-
-    return text
+    # Remove MGRS-like patterns, purely numeric strings and the word "MGRS" in one pass
+    return MGRS_LIKE_OR_NUMBER.sub("", text)
 
 
 # Function to clean and normalize timeframes from a list, standardizing them for consistency.
@@ -209,18 +221,9 @@ def clean_timeframes(timeframes_list):
     clean_timeframes = {}  # Using a dictionary to map normalized to original timeframes
     for timeframe in timeframes_list:
         # Match various timeframe formats and normalize
-        if re.match(
-            r"(\d{1,4}[-/]\d{1,2}[-/]\d{1,4})|"  # Matches date formats like YYYY-MM-DD or MM/DD/YYYY
-            r"(\d{1,2}:\d{1,2})|"  # Matches time formats like HH:MM
-            r"(next|last)?\s?\d+\s?(days?|months?|years?|hours?|minutes?)|"  # Matches phrases like "next 5 days"
-            r"(january|february|march|april|may|june|july|august|september|"
-            r"october|november|december)\s?\d{1,4}|"  # Matches month names followed by a day or year
-            r"(monday|tuesday|wednesday|thursday|friday|saturday|sunday)",  # Matches day names
-            timeframe,
-            re.IGNORECASE,
-        ):
-            normalized_timeframe = re.sub(
-                r"\s+", "", timeframe
+        if TIMEFRAME_FORMAT.match(timeframe):
+            normalized_timeframe = WHITESPACE.sub(
+                "", timeframe
             ).lower()  # Normalize the timeframe
             clean_timeframes[
                 normalized_timeframe
@@ -9,6 +9,24 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def check_exists_batch(self, hash_values):
+        """
+        Return the subset of hash values that exist in the database.
+
+        Backends override this with a single query per chunk of hashes; the default falls
+        back to one check_exists call per hash.
+        """
+        return {
+            hash_value for hash_value in hash_values if self.check_exists(hash_value)
+        }
+
+    @abstractmethod
+    def iter_hashes(self):
+        """
+        Yield every hash stored in the database.
+        """
+        pass
+
     @abstractmethod
     def save_data(self, info):
         """
@@ -5,6 +5,7 @@ from importlib import import_module
 
 import requests
 
+from database_operations.known_hash_index import known_hashes
 from utilities import DatabaseConfig
 from utilities.configurations.configs import AppConfig
 from utilities.logging.logging_utilities import error_handler
@@ -272,7 +273,8 @@ class DatabaseManager:
                             "analyzer": "edge_ngram_analyzer",
                             "search_analyzer": "standard",
                         },
-                        "images": {"type": "text"},
+                        # Image IDs only; the images themselves are in the image store
+                        "images": {"type": "text", "index": False},
                         "full_text": {"type": "text"},
                         "processed_time": {"type": "date"},
                     }
@@ -373,6 +375,7 @@ class DatabaseManager:
                                 logger.info(
                                     f"Data saved successfully using {service_key}."
                                 )
+                                known_hashes.add(data["file_hash"])
                                 return True
                         except Exception as e:
                             logger.error(
@@ -389,6 +392,7 @@ class DatabaseManager:
                     try:
                         if fallback_module.save_data(data):
                             logger.info("Data saved successfully using fallback CSV.")
+                            known_hashes.add(data["file_hash"])
                             return True
                     except Exception as e:
                         logger.error(f"Fallback save attempt {attempt + 1} failed: {e}")
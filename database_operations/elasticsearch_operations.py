@@ -1,8 +1,11 @@
 import logging
 import os
 
+from elasticsearch.helpers import scan
+
 from database_operations import DatabaseManager
 from database_operations.base_database import BaseDatabase
+from database_operations.known_hash_index import known_hashes
 from utilities import DatabaseConfig
 from utilities.logging.logging_utilities import error_handler
 
@@ -60,6 +63,55 @@ class ElasticsearchDatabase(BaseDatabase):
             logger.error(f"Error checking existence of hash: {e}")
             return False
 
+    @classmethod
+    @error_handler(default_return_value=frozenset())
+    def check_exists_batch(cls, hash_values, chunk_size=1000):
+        """
+        Class method to check which of many hash values exist in Elasticsearch.
+
+        Uses one multi-get request per chunk of document IDs, without fetching _source.
+        """
+        es = cls.get_elasticsearch_client()
+        if not es:
+            logger.error("UNABLE TO PULL ES CLIENT")
+            return set()
+
+        index_name = DatabaseConfig.elastic_index
+        hash_values = list(hash_values)
+        found = set()
+        for start in range(0, len(hash_values), chunk_size):
+            chunk = hash_values[start : start + chunk_size]
+            response = es.mget(index=index_name, ids=chunk, source=False)
+            found.update(doc["_id"] for doc in response["docs"] if doc.get("found"))
+
+        logger.info(f"{len(found)} of {len(hash_values)} hashes exist in Elastic.")
+        return found
+
+    @classmethod
+    def iter_hashes(cls, page_size=5000):
+        """
+        Class method to yield the ID (SHA256 hash) of every document in the index.
+
+        Documents are scrolled without their _source, so only IDs cross the wire.
+
+        Raises:
+        ConnectionError: If there is no client, rather than yielding nothing, which would
+        read as an empty index.
+        """
+        es = cls.get_elasticsearch_client()
+        if not es:
+            logger.error("UNABLE TO PULL ES CLIENT")
+            raise ConnectionError("No Elasticsearch client to read stored hashes from")
+
+        for hit in scan(
+            es,
+            index=DatabaseConfig.elastic_index,
+            query={"query": {"match_all": {}}},
+            _source=False,
+            size=page_size,
+        ):
+            yield hit["_id"]
+
     @classmethod
     @error_handler
     def get_last_processed_date(cls):
@@ -126,6 +178,7 @@ class ElasticsearchDatabase(BaseDatabase):
             logger.info("\n\t>>> Trying to store to Elastic index <<<\n")
             es.index(index=index_name, id=info["file_hash"], document=es_doc)
             logger.info("\n\t\tDATA STORED TO ELASTIC INDEX.")
+            known_hashes.add(info["file_hash"])
 
             return True
 
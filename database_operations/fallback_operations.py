@@ -21,6 +21,19 @@ class CSVFailsafe(BaseDatabase):
         else:
             pass
 
+    @error_handler(default_return_value=frozenset())
+    def check_exists_batch(self, hash_values):
+        df = DatabaseConfig.all_info_df
+        if df is None or "SHA256_hash" not in df.columns:
+            return set()
+        return set(hash_values) & set(df["SHA256_hash"].values)
+
+    def iter_hashes(self):
+        df = DatabaseConfig.all_info_df
+        if df is None or "SHA256_hash" not in df.columns:
+            return iter(())
+        return iter(df["SHA256_hash"].values)
+
     @error_handler
     def save_data(self, info):
         # Prepare and append information to a CSV file as the final fallback
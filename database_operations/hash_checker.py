@@ -6,6 +6,7 @@ from initialization.init_app import AppInitialization
 from utilities.logging.logging_utilities import error_handler
 
 from .db_factory import DatabaseFactory
+from .known_hash_index import known_hashes
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +15,49 @@ class HashChecker:
     """
     A class responsible for checking the existence of a hash across various storage systems,
     stopping on the first success but always including a check against the Pandas DataFrame.
+
+    Once the known-hash index has been warmed, checks are answered from memory instead.
     """
 
+    known_hashes = known_hashes
+
+    @staticmethod
+    @error_handler(default_return_value=False)
+    def warm_known_hashes(force=False):
+        """
+        Load every stored hash from the first available and connected database, plus the Pandas
+        DataFrame, into the in-memory known-hash index. Successful saves keep it current.
+
+        Returns:
+            bool: True if the index is warm and can answer hash checks.
+        """
+        if known_hashes.warmed and not force:
+            return True
+
+        # Priority order of database services
+        priority_order = ["elasticsearch", "postgresql", "sqlite"]
+
+        response = requests.get("http://localhost:5005/api/availabilities")
+        response.raise_for_status()
+        connects = response.json().get("connects")
+        sources = []
+        for service_key in priority_order:
+            if AppInitialization.connection_status.get(service_key) or connects.get(
+                service_key
+            ):
+                sources.append(DatabaseFactory.get_database(service_key))
+                break  # Only the first connected database is consulted, as for hash checks
+        sources.append(DatabaseFactory.get_database("pandas"))
+
+        def stored_hashes():
+            for db in sources:
+                if db:
+                    yield from db.iter_hashes()
+
+        loaded = known_hashes.load(stored_hashes())
+        logger.info(f"Known-hash index warmed with {loaded} hashes.")
+        return True
+
     @staticmethod
     @error_handler
     def check_hash_exists(hash_value):
@@ -23,6 +65,9 @@ class HashChecker:
         Checks if the hash exists in the available and connected databases according to the priority list,
         and always checks the Pandas DataFrame as a final step, stopping at the first successful check.
         """
+        if known_hashes.warmed:
+            return hash_value in known_hashes
+
         # Priority order of database services
         priority_order = ["elasticsearch", "postgresql", "sqlite"]
 
@@ -58,3 +103,49 @@ class HashChecker:
             "Hash not found in any available databases or the Pandas DataFrame."
         )
         return False
+
+    @staticmethod
+    @error_handler(default_return_value=frozenset())
+    def check_hashes_exist(hash_values):
+        """
+        Batch version of check_hash_exists. Queries the first available and connected database
+        once per chunk of hashes, then checks the Pandas DataFrame for whatever was not found.
+
+        Returns:
+            set: The subset of hash_values that already exist.
+        """
+        hash_values = set(hash_values)
+        if known_hashes.warmed:
+            return {
+                hash_value for hash_value in hash_values if hash_value in known_hashes
+            }
+
+        found = set()
+        if not hash_values:
+            return found
+
+        # Priority order of database services
+        priority_order = ["elasticsearch", "postgresql", "sqlite"]
+
+        response = requests.get("http://localhost:5005/api/availabilities")
+        response.raise_for_status()
+        connects = response.json().get("connects")
+        for service_key in priority_order:
+            if AppInitialization.connection_status.get(service_key) or connects.get(
+                service_key
+            ):
+                logger.info(f"Checking {len(hash_values)} hashes in {service_key}...")
+                db = DatabaseFactory.get_database(service_key)
+                if db:
+                    found |= db.check_exists_batch(hash_values) or set()
+                break  # Stop checking other databases once the first connected is queried
+
+        # Always check the Pandas DataFrame last for anything not yet found
+        remaining = hash_values - found
+        if remaining:
+            db = DatabaseFactory.get_database("pandas")
+            if db:
+                found |= db.check_exists_batch(remaining) or set()
+
+        logger.info(f"{len(found)} of {len(hash_values)} hashes already exist.")
+        return found
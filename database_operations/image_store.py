@@ -0,0 +1,348 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+from database_operations.db_manager import DatabaseManager
+from utilities.configurations.configs import AppConfig
+from utilities.logging.logging_utilities import error_handler
+
+logger = logging.getLogger(__name__)
+
+IMAGE_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def image_id(image_bytes):
+    """
+    Return the content address of an image: the SHA256 hash of its bytes.
+    """
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def valid_image_id(value):
+    return isinstance(value, str) and IMAGE_ID_PATTERN.fullmatch(value) is not None
+
+
+def report_image_ids(images):
+    """
+    Return the image store IDs held in the images field of a report, as a list.
+
+    Reports indexed before the image store held base64-encoded image data instead; those
+    entries are not IDs and are left out.
+    """
+    if not images:
+        return []
+    if isinstance(images, str):
+        try:
+            images = json.loads(images)
+        except ValueError:
+            return []
+    if not isinstance(images, list):
+        return []
+    return [image for image in images if valid_image_id(image)]
+
+
+def image_media_type(image_bytes):
+    """
+    Return the MIME type of an image from its header, for serving it over HTTP.
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            return Image.MIME.get(image.format, "application/octet-stream")
+    except Exception:
+        return "application/octet-stream"
+
+
+def make_thumbnail(image_bytes, max_size=256):
+    """
+    Return a WebP thumbnail of an image that fits within max_size pixels on each side.
+
+    Returns:
+    bytes: The thumbnail data, or None if the image could not be read.
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            # Let JPEG decoding skip straight to a reduced scale where possible
+            image.draft("RGB", (max_size, max_size))
+            image.thumbnail((max_size, max_size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            thumbnail = BytesIO()
+            image.save(thumbnail, format="WebP", quality=70)
+        return thumbnail.getvalue()
+    except Exception as e:
+        logger.warning(f"Unable to create thumbnail: {e}")
+        return None
+
+
+class LocalImageStore:
+    """
+    Content-addressed image blobs stored as files in a local directory.
+
+    Each image is written once under its SHA256 hash, sharded into subdirectories by the
+    leading characters of the hash, so identical images across reports share one file.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    suffixes = {"image": "", "thumbnail": ".thumb", "original": ".orig"}
+
+    def _blob_path(self, blob_id, variant="image"):
+        name = blob_id + self.suffixes[variant]
+        return os.path.join(self.store_dir, blob_id[:2], blob_id[2:4], name)
+
+    def _write(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial blob
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def contains(self, blob_id):
+        """
+        Return whether an image is stored under an ID.
+        """
+        return os.path.exists(self._blob_path(blob_id))
+
+    def put(self, blob_id, image_bytes, thumbnail=None, original=None):
+        """
+        Store an image, its thumbnail and its original (for a downscaled image) under its ID
+        unless it is already stored.
+
+        Returns:
+        bool: True if the image was written, False if it was already stored.
+        """
+        path = self._blob_path(blob_id)
+        if os.path.exists(path):
+            return False
+        # The image goes last, so a stored image always has its thumbnail and original
+        if thumbnail is not None:
+            self.put_thumbnail(blob_id, thumbnail)
+        if original is not None:
+            self._write(self._blob_path(blob_id, "original"), original)
+        self._write(path, image_bytes)
+        return True
+
+    def put_thumbnail(self, blob_id, thumbnail):
+        """
+        Store (or replace) the thumbnail of an image.
+        """
+        self._write(self._blob_path(blob_id, "thumbnail"), thumbnail)
+
+    def get(self, blob_id, variant="image"):
+        """
+        Return the bytes of a stored image, its "thumbnail" or its "original", or None if it
+        is not stored.
+        """
+        try:
+            with open(self._blob_path(blob_id, variant), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class PostgresImageStore:
+    """
+    Content-addressed image blobs stored in a PostgreSQL bytea table keyed by SHA256 hash.
+    """
+
+    table_created = False
+
+    def _ensure_table(self, cursor):
+        if not PostgresImageStore.table_created:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS image_blobs ("
+                "image_id CHAR(64) PRIMARY KEY, "
+                "data BYTEA NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "thumbnail BYTEA, "
+                "original BYTEA)"
+            )
+            cursor.execute(
+                "ALTER TABLE image_blobs ADD COLUMN IF NOT EXISTS thumbnail BYTEA"
+            )
+            cursor.execute(
+                "ALTER TABLE image_blobs ADD COLUMN IF NOT EXISTS original BYTEA"
+            )
+            PostgresImageStore.table_created = True
+
+    def contains(self, blob_id):
+        """
+        Return whether an image is stored under an ID.
+        """
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                cursor.execute(
+                    "SELECT 1 FROM image_blobs WHERE image_id = %s", (blob_id,)
+                )
+                return cursor.fetchone() is not None
+
+    def put(self, blob_id, image_bytes, thumbnail=None, original=None):
+        """
+        Store an image, its thumbnail and its original (for a downscaled image) under its ID
+        unless it is already stored.
+
+        Returns:
+        bool: True if the image was written, False if it was already stored.
+        """
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                cursor.execute(
+                    "INSERT INTO image_blobs (image_id, data, size, thumbnail, original) "
+                    "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (image_id) DO NOTHING",
+                    (blob_id, image_bytes, len(image_bytes), thumbnail, original),
+                )
+                written = cursor.rowcount == 1
+            conn.commit()
+        return written
+
+    def put_thumbnail(self, blob_id, thumbnail):
+        """
+        Store (or replace) the thumbnail of an image.
+        """
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                cursor.execute(
+                    "UPDATE image_blobs SET thumbnail = %s WHERE image_id = %s",
+                    (thumbnail, blob_id),
+                )
+            conn.commit()
+
+    columns = {"image": "data", "thumbnail": "thumbnail", "original": "original"}
+
+    def get(self, blob_id, variant="image"):
+        """
+        Return the bytes of a stored image, its "thumbnail" or its "original", or None if it
+        is not stored.
+        """
+        column = self.columns[variant]
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                cursor.execute(
+                    f"SELECT {column} FROM image_blobs WHERE image_id = %s", (blob_id,)
+                )
+                row = cursor.fetchone()
+        return bytes(row[0]) if row and row[0] is not None else None
+
+
+class ImageStore:
+    """
+    Entry point to the configured image blob store.
+
+    Reports hold only the IDs of their images; the image bytes live in the store selected by
+    AppConfig.image_store_backend ("local" or "postgresql").
+    """
+
+    _store = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_store(cls):
+        """
+        Return the configured store, creating it on first use.
+        """
+        with cls._lock:
+            if cls._store is None:
+                backend = AppConfig.image_store_backend
+                if backend == "local":
+                    cls._store = LocalImageStore(AppConfig.image_store_dir)
+                elif backend == "postgresql":
+                    cls._store = PostgresImageStore()
+                else:
+                    raise ValueError(f"Unknown image store backend: {backend}")
+                logger.info(f"Image store backend: {backend}")
+            return cls._store
+
+    @classmethod
+    @error_handler(reraise=True)
+    def store_images(cls, images):
+        """
+        Store the images of a report, with a thumbnail of each, and return their IDs.
+
+        Images already in the store are neither decoded for a thumbnail nor written again.
+
+        Parameters:
+        images (list): BytesIO objects containing the image data.
+
+        Returns:
+        list: The ID of each distinct image, in order of first appearance.
+
+        Raises:
+        Exception: Any error from the store, so the report is not saved without its images.
+        """
+        store = cls.get_store()
+        image_ids = []
+        written = 0
+        for image in images:
+            image_bytes = image.getvalue()
+            blob_id = image_id(image_bytes)
+            if blob_id in image_ids:
+                continue
+            image_ids.append(blob_id)
+            if store.contains(blob_id):
+                continue
+            thumbnail = make_thumbnail(image_bytes, AppConfig.image_thumbnail_size)
+            # Downscaled images carry their original when it is kept
+            original = getattr(image, "original", None)
+            if store.put(blob_id, image_bytes, thumbnail, original):
+                written += 1
+        logger.info(
+            f"\t\tStored {written} new images ({len(image_ids) - written} already stored)."
+        )
+        return image_ids
+
+    @classmethod
+    def load_image(cls, blob_id):
+        """
+        Return the bytes of a stored image, or None if the ID is invalid or not stored.
+        """
+        if not valid_image_id(blob_id):
+            return None
+        return cls.get_store().get(blob_id)
+
+    @classmethod
+    def load_original(cls, blob_id):
+        """
+        Return the original of a downscaled image, or None if the ID is invalid or no
+        original was kept.
+        """
+        if not valid_image_id(blob_id):
+            return None
+        return cls.get_store().get(blob_id, "original")
+
+    @classmethod
+    def load_thumbnail(cls, blob_id):
+        """
+        Return the thumbnail of a stored image, or None if the ID is invalid or not stored.
+
+        Thumbnails missing for images stored before they were generated at ingest are created
+        and stored on first request.
+        """
+        if not valid_image_id(blob_id):
+            return None
+        store = cls.get_store()
+        thumbnail = store.get(blob_id, "thumbnail")
+        if thumbnail is None:
+            image_bytes = store.get(blob_id)
+            if image_bytes is None:
+                return None
+            thumbnail = make_thumbnail(image_bytes, AppConfig.image_thumbnail_size)
+            if thumbnail is None:
+                return image_bytes
+            store.put_thumbnail(blob_id, thumbnail)
+        return thumbnail
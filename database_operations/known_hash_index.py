@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class KnownHashIndex:
+    """
+    In-memory index of every SHA256 hash already stored, used to make skip decisions
+    without querying the databases.
+
+    Hashes are held as raw 32-byte digests in an exact set, fronted by a Bloom filter so
+    that the common "never seen" answer is a handful of bit tests. The index only answers
+    once it has been warmed from storage; until then callers fall back to the databases.
+    """
+
+    # Number of bit positions set per hash
+    num_probes = 7
+    # Bits allocated per expected entry, roughly a 1% false positive rate
+    bits_per_entry = 10
+
+    def __init__(self, expected_entries=100_000):
+        self.lock = threading.Lock()
+        self.digests = set()
+        self.warmed = False
+        # Hashes saved while a load is reading storage, which the load may have missed
+        self.added_during_load = None
+        self._allocate_filter(expected_entries)
+
+    def _allocate_filter(self, expected_entries):
+        self.capacity = max(expected_entries, 1024)
+        self.num_bits = self.capacity * self.bits_per_entry
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        for digest in self.digests:
+            self._set_bits(digest)
+
+    @staticmethod
+    def _digest(hash_value):
+        """
+        Convert a hex SHA256 hash to its 32-byte digest. Any other identifier is hashed so it
+        can still be indexed.
+        """
+        if len(hash_value) == 64:
+            try:
+                return bytes.fromhex(hash_value)
+            except ValueError:
+                pass
+        return hashlib.sha256(hash_value.encode("utf-8")).digest()
+
+    def _positions(self, digest):
+        # The digest is already uniformly distributed, so its 4-byte slices serve as the probes
+        for i in range(self.num_probes):
+            yield int.from_bytes(digest[i * 4 : i * 4 + 4], "big") % self.num_bits
+
+    def _set_bits(self, digest):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def _add_digest(self, digest):
+        if digest in self.digests:
+            return
+        self.digests.add(digest)
+        if len(self.digests) > self.capacity:
+            # Keep the false positive rate bounded as the index grows
+            self._allocate_filter(self.capacity * 2)
+        else:
+            self._set_bits(digest)
+
+    def add(self, hash_value):
+        """
+        Record a newly stored hash.
+        """
+        digest = self._digest(hash_value)
+        with self.lock:
+            self._add_digest(digest)
+            if self.added_during_load is not None:
+                self.added_during_load.add(digest)
+
+    def load(self, hash_values):
+        """
+        Replace the contents of the index with the given hashes and mark it as warmed.
+
+        Hashes no longer in storage, such as those of deleted reports, are dropped. The
+        previous contents keep answering checks until loading has finished, so a load that
+        fails part way leaves the index as it was.
+
+        Returns:
+        int: The number of distinct hashes loaded.
+        """
+        with self.lock:
+            self.added_during_load = set()
+        try:
+            digests = {self._digest(hash_value) for hash_value in hash_values}
+            with self.lock:
+                # Keep hashes recorded by saves that completed while storage was being read
+                self.digests = digests | self.added_during_load
+                self._allocate_filter(len(self.digests) * 2)
+                self.warmed = True
+                return len(self.digests)
+        finally:
+            with self.lock:
+                self.added_during_load = None
+
+    def contains(self, hash_value):
+        """
+        Return True if the hash is known to be stored.
+        """
+        digest = self._digest(hash_value)
+        with self.lock:
+            for position in self._positions(digest):
+                if not self.bits[position >> 3] & (1 << (position & 7)):
+                    return False
+            return digest in self.digests
+
+    def __contains__(self, hash_value):
+        return self.contains(hash_value)
+
+    def __len__(self):
+        return len(self.digests)
+
+
+# Shared by the hash checks and every successful save in this process
+known_hashes = KnownHashIndex()
@@ -27,6 +27,37 @@ class PostgreSQLDatabase(BaseDatabase):
             # self.pool.putconn(conn)
         return exists
 
+    @error_handler(default_return_value=frozenset())
+    def check_exists_batch(self, hash_values, chunk_size=1000):
+        """
+        Returns the subset of hash_values that already exist
+        in the PostgreSQL database, querying one chunk at a time.
+        """
+        hash_values = list(hash_values)
+        found = set()
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor() as cursor:
+                for start in range(0, len(hash_values), chunk_size):
+                    chunk = hash_values[start : start + chunk_size]
+                    cursor.execute(
+                        "SELECT SHA256_hash FROM reports WHERE SHA256_hash = ANY(%s)",
+                        (chunk,),
+                    )
+                    found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def iter_hashes(self, page_size=5000):
+        """
+        Yields every SHA256_hash in the PostgreSQL database,
+        streamed through a server-side cursor.
+        """
+        with DatabaseManager.get_postgres_connection() as conn:
+            with conn.cursor(name="known_hashes") as cursor:
+                cursor.itersize = page_size
+                cursor.execute("SELECT SHA256_hash FROM reports")
+                for row in cursor:
+                    yield row[0]
+
     @error_handler
     def save_data(self, info):
         """
@@ -34,6 +65,9 @@ class PostgreSQLDatabase(BaseDatabase):
         """
         with DatabaseManager.get_postgres_connection() as conn:
             with conn.cursor() as cursor:
+                # info["images"] is the JSON list of the report's ImageStore IDs. The images
+                # themselves are kept in the image store rather than a bytea column, so an image
+                # repeated across reports is stored once and rows stay small
                 sql = (
                     "INSERT INTO reports (SHA256_hash, highest_classification, caveats, file_path, locations, "
                     "timeframes, subjects, topics, keywords, MGRS, images, full_text) "
@@ -27,6 +27,32 @@ class SQLiteDatabase(BaseDatabase):
             )
             return cursor.fetchone()[0]
 
+    @error_handler(default_return_value=frozenset())
+    def check_exists_batch(self, hash_values, chunk_size=500):
+        """
+        Return the subset of hash_values already stored, using one IN query per chunk.
+
+        Chunks stay below SQLite's limit on the number of bound parameters.
+        """
+        hash_values = list(hash_values)
+        found = set()
+        with sqlite3.connect(self.conn_params) as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(hash_values), chunk_size):
+                chunk = hash_values[start : start + chunk_size]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(
+                    f"SELECT SHA256_hash FROM reports WHERE SHA256_hash IN ({placeholders})",
+                    chunk,
+                )
+                found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def iter_hashes(self):
+        with sqlite3.connect(self.conn_params) as conn:
+            for row in conn.execute("SELECT SHA256_hash FROM reports"):
+                yield row[0]
+
     @error_handler
     def save_data(self, info):
         """
@@ -49,7 +75,9 @@ class SQLiteDatabase(BaseDatabase):
         # Connection and cursor setup for SQLite
         conn = sqlite3.connect(db_full_path)
         c = conn.cursor()
-        # Create the reports table if it doesn't already exist
+        # Create the reports table if it doesn't already exist. The images column holds a JSON
+        # list of image store IDs, not image data: image bytes live once in the content-addressed
+        # ImageStore, so the column stays TEXT rather than a BLOB of binary containers
         c.execute(
             """
             CREATE TABLE IF NOT EXISTS reports (
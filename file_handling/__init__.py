@@ -1,4 +1,19 @@
-from .file_io import (read_excel_file, read_pdf_file, read_pptx_file,
-                      read_word_file)
+from .file_io import (hash_file, open_source, read_excel_file, read_file_bytes,
+                      read_pdf_file, read_pptx_file, read_word_file)
+from .file_manifest import FileManifest
+from .image_container import (ImageContainerError, read_image_container,
+                              write_image_container)
 
-__all__ = ["read_excel_file", "read_pdf_file", "read_pptx_file", "read_word_file"]
+__all__ = [
+    "read_excel_file",
+    "read_pdf_file",
+    "read_pptx_file",
+    "read_word_file",
+    "read_file_bytes",
+    "hash_file",
+    "open_source",
+    "FileManifest",
+    "ImageContainerError",
+    "read_image_container",
+    "write_image_container",
+]
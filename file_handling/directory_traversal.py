@@ -1,8 +1,112 @@
 import logging
 import os
+import queue
+import threading
 
 logger = logging.getLogger(__name__)
 
+# File extensions the processing pipeline knows how to extract
+SUPPORTED_EXTENSIONS = ("docx", "xlsx", "pptx", "pdf")
+
+
+def scan_directory(
+    directory_path, extensions=SUPPORTED_EXTENSIONS, max_workers=8, max_pending=1000
+):
+    """
+    Walk a directory tree in parallel and yield matching files as soon as they are found.
+
+    Subdirectories are scanned with os.scandir by a pool of worker threads, so slow network
+    shares are walked concurrently and downstream processing can start immediately. Only
+    a bounded number of discovered files are held in memory at any time.
+
+    Parameters:
+    directory_path (str): The path to the directory to traverse.
+    extensions (tuple): Lowercase file extensions to yield.
+    max_workers (int): Number of threads scanning subdirectories concurrently.
+    max_pending (int): Maximum number of discovered files buffered ahead of the consumer.
+
+    Yields:
+    tuple: (extension, file path, os.stat_result) for each matching file.
+    """
+    if not os.path.exists(directory_path):
+        logger.error(f"Directory does not exist: {directory_path}")
+        return
+
+    records = queue.Queue(maxsize=max_pending)
+    directories = queue.Queue()
+    directories.put(directory_path)
+    stop_event = threading.Event()
+    finished = object()  # Sentinel marking the end of the walk
+    pending_lock = threading.Lock()
+    pending = {"directories": 1}  # Directories queued or being scanned
+
+    def put_record(record):
+        # Block while the consumer catches up, but give up if the consumer has gone away
+        while not stop_event.is_set():
+            try:
+                records.put(record, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def scan_one(current_dir):
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                if stop_event.is_set():
+                    return
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        with pending_lock:
+                            pending["directories"] += 1
+                        directories.put(entry.path)
+                    elif entry.is_file() and "." in entry.name:
+                        ext = entry.name.rsplit(".", 1)[-1].lower()
+                        if ext in extensions:
+                            logger.debug(f"Found file: {entry.path}")
+                            put_record((ext, entry.path, entry.stat()))
+                except OSError as e:
+                    logger.warning(f"Unable to inspect {entry.path}: {e}")
+
+    def walk():
+        while not stop_event.is_set():
+            try:
+                current_dir = directories.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if current_dir is finished:
+                return
+
+            try:
+                scan_one(current_dir)
+            except OSError as e:
+                logger.error(f"Unable to scan directory {current_dir}: {e}")
+            finally:
+                with pending_lock:
+                    pending["directories"] -= 1
+                    walk_complete = pending["directories"] == 0
+                if walk_complete:
+                    # Release the other workers and tell the consumer there is nothing left
+                    for _ in range(max_workers):
+                        directories.put(finished)
+                    put_record(finished)
+
+    workers = [
+        threading.Thread(target=walk, name=f"scan_directory-{i}", daemon=True)
+        for i in range(max_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        while True:
+            record = records.get()
+            if record is finished:
+                break
+            yield record
+    finally:
+        # Also reached when the consumer stops iterating early
+        stop_event.set()
+
 
 def traverse_directory(directory_path):
     """
@@ -14,22 +118,12 @@ def traverse_directory(directory_path):
     Returns:
     dict: A dictionary with file extensions as keys and lists of file paths as values.
     """
-    file_dict = {"docx": [], "xlsx": [], "pptx": [], "pdf": []}
+    file_dict = {ext: [] for ext in SUPPORTED_EXTENSIONS}
 
     logger.info(f"Starting directory traversal for: {directory_path}")
 
-    if not os.path.exists(directory_path):
-        logger.error(f"Directory does not exist: {directory_path}")
-        return file_dict
-
-    for root, dirs, files in os.walk(directory_path):
-        logger.info(f"Inspecting directory: {root}")
-        for file in files:
-            full_path = os.path.join(root, file)
-            ext = file.split(".")[-1].lower()  # Make sure to handle case sensitivity
-            logger.info(f"Found file: {file} with extension: {ext}")
-            if ext in file_dict:
-                file_dict[ext].append(full_path)
+    for ext, full_path, _ in scan_directory(directory_path):
+        file_dict[ext].append(full_path)
 
     for k, v in file_dict.items():
         logger.info(f"Total {k.upper()} found: {len(v)}")
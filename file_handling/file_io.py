@@ -1,66 +1,173 @@
 import hashlib
 import logging
+from io import BytesIO
+from zipfile import ZipFile
 
+import fitz  # PyMuPDF
 import pdfplumber
 from docx import Document
 from openpyxl import load_workbook
 from pptx import Presentation
 
+from .ooxml_readers import docx_package_text, pptx_package_text
+
 logger = logging.getLogger(__name__)
 
 
-# read_word_file
-def read_word_file(file_path):
+# read_file_bytes
+def read_file_bytes(file_path):
     """
-    Read a Word (.docx) file and extract all the text from it.
+    Read a file from disk in a single pass and hash the resulting buffer.
+
+    The returned bytes can be handed to every text and image extractor, so each file is
+    only read from disk once no matter how many times it is parsed.
 
     Parameters:
-    file_path (str): The path to the .docx file to read.
+    file_path (str): The path to the file to read.
 
     Returns:
-    str: The extracted text from the .docx file.
+    tuple: The file contents as bytes and their SHA256 hash as a hex string.
+    """
+    with open(file_path, "rb") as f:
+        file_bytes = f.read()
+    return file_bytes, hashlib.sha256(file_bytes).hexdigest()
+
+
+# hash_file
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    Hash a file by streaming it from disk, without holding its contents in memory.
+
+    Parameters:
+    file_path (str): The path to the file to hash.
+    chunk_size (int): The number of bytes read at a time.
+
+    Returns:
+    str: The SHA256 hash of the contents as a hex string.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+# open_source
+def open_source(source):
+    """
+    Return something the document libraries can open from either a path or file contents.
+
+    Parameters:
+    source (str or bytes): A file path, or the contents of a file already read into memory.
+
+    Returns:
+    str or BytesIO: The path unchanged, or a new stream positioned at the start of the contents.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(source)
+    return source
+
+
+# word_document_text
+def word_document_text(doc):
+    """
+    Extract all the text from an opened python-docx Document.
     """
-    doc = Document(file_path)
     full_text = [
         paragraph.text for paragraph in doc.paragraphs
     ]  # Extract text from each paragraph
     return " ".join(full_text)
 
 
-# read_excel_file
-def read_excel_file(file_path):
+# read_word_file
+def read_word_file(file_path):
     """
-    Read an Excel (.xlsx) file and extract all text from the first worksheet.
+    Read a Word (.docx) file and extract all the text from it.
 
     Parameters:
-    file_path (str): The path to the .xlsx file to read.
+    file_path (str or bytes): The path to the .docx file to read, or its contents.
+
+    Headers, footers and tables are included. The XML parts are streamed straight from the
+    package; python-docx is used as a fallback if that fails.
 
     Returns:
-    str: The extracted text from the .xlsx file.
+    str: The extracted text from the .docx file.
     """
-    wb = load_workbook(file_path)
-    ws = wb.active
-    full_text = [
-        str(cell.value)
-        for row in ws.iter_rows()
-        for cell in row
-        if cell.value is not None
-    ]  # Extract text from each cell
-    return " ".join(full_text)
+    try:
+        with ZipFile(open_source(file_path)) as zip_ref:
+            return docx_package_text(zip_ref)
+    except Exception as e:
+        logger.warning(
+            f"Streaming .docx reader failed, falling back to python-docx: {e}"
+        )
+    return word_document_text(Document(open_source(file_path)))
 
 
-# read_pptx_file
-def read_pptx_file(file_path):
+# Default cap on the number of non-empty cells read from each worksheet
+MAX_CELLS_PER_SHEET = 1_000_000
+
+
+# iter_excel_text
+def iter_excel_text(file_path, max_cells_per_sheet=MAX_CELLS_PER_SHEET):
     """
-    Read a PowerPoint (.pptx) file and extract all text from it.
+    Stream the text of every worksheet in an Excel (.xlsx) file, one sheet at a time.
+
+    The workbook is opened in read-only mode, so rows are parsed as they are read instead of
+    loading the whole workbook into memory.
+
+    Parameters:
+    file_path (str or bytes): The path to the .xlsx file to read, or its contents.
+    max_cells_per_sheet (int): Maximum number of non-empty cells read from each worksheet.
+
+    Yields:
+    tuple: (sheet title, text of the sheet) for each worksheet, in workbook order.
+    """
+    wb = load_workbook(open_source(file_path), read_only=True)
+    try:
+        for ws in wb.worksheets:
+            full_text = []
+            for row in ws.iter_rows(values_only=True):
+                full_text.extend(
+                    str(value) for value in row if value is not None
+                )  # Extract text from each cell
+                if len(full_text) >= max_cells_per_sheet:
+                    logger.warning(
+                        f"Worksheet '{ws.title}' truncated at {max_cells_per_sheet} cells."
+                    )
+                    del full_text[max_cells_per_sheet:]
+                    break
+            yield ws.title, " ".join(full_text)
+    finally:
+        wb.close()
+
+
+# read_excel_file
+def read_excel_file(file_path, max_cells_per_sheet=MAX_CELLS_PER_SHEET):
+    """
+    Read an Excel (.xlsx) file and extract all text from every worksheet.
 
     Parameters:
-    file_path (str): The path to the .pptx file to read.
+    file_path (str or bytes): The path to the .xlsx file to read, or its contents.
+    max_cells_per_sheet (int): Maximum number of non-empty cells read from each worksheet.
 
     Returns:
-    str: The extracted text from the .pptx file.
+    str: The extracted text from the .xlsx file, with worksheets separated by blank lines.
+    """
+    return "\n\n".join(
+        text for _, text in iter_excel_text(file_path, max_cells_per_sheet) if text
+    )
+
+
+# presentation_text
+def presentation_text(prs):
+    """
+    Extract all text from an opened python-pptx Presentation.
     """
-    prs = Presentation(file_path)
     full_text = []
     for slide in prs.slides:
         for shape in slide.shapes:
@@ -72,32 +179,102 @@ def read_pptx_file(file_path):
     return " ".join(full_text)
 
 
-# Updated read_pdf_file
-def read_pdf_file(file_path):
+# read_pptx_file
+def read_pptx_file(file_path):
     """
-    Read a PDF file and extract all unique text from it using the pdfplumber package.
+    Read a PowerPoint (.pptx) file and extract all text from it.
 
     Parameters:
-    file_path (str): The path to the PDF file to read.
+    file_path (str or bytes): The path to the .pptx file to read, or its contents.
+
+    Tables, grouped shapes and speaker notes are included. The slide XML parts are streamed
+    straight from the package; python-pptx is used as a fallback if that fails.
 
     Returns:
-    str: The extracted unique text from the PDF file.
+    str: The extracted text from the .pptx file.
+    """
+    try:
+        with ZipFile(open_source(file_path)) as zip_ref:
+            return pptx_package_text(zip_ref)
+    except Exception as e:
+        logger.warning(
+            f"Streaming .pptx reader failed, falling back to python-pptx: {e}"
+        )
+    return presentation_text(Presentation(open_source(file_path)))
+
+
+# PDF text engines understood by read_pdf_file
+PDF_TEXT_ENGINES = ("pymupdf", "pdfplumber")
+
+
+# open_pdf
+def open_pdf(source):
+    """
+    Open a PDF with PyMuPDF from either a file path or file contents already in memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+# unique_page_text
+def unique_page_text(page_texts):
+    """
+    Join page texts, skipping empty pages and pages whose text repeats an earlier page.
+
+    Parameters:
+    page_texts (iterable): The text of each page, in page order.
+
+    Returns:
+    str: The extracted unique text.
     """
     full_text = []
     unique_pages = set()  # Use a set to track unique page hashes
 
-    with pdfplumber.open(file_path) as pdf:
-        logger.info(f"\t\tPDF has > {len(pdf.pages)} < pages.")
-
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                # Create a hash of the page text
-                page_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
+    for text in page_texts:
+        if text:
+            # Create a hash of the page text
+            page_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
 
-                # Only add the text if it's not already in the unique_pages set
-                if page_hash not in unique_pages:
-                    unique_pages.add(page_hash)
-                    full_text.append(text)
+            # Only add the text if it's not already in the unique_pages set
+            if page_hash not in unique_pages:
+                unique_pages.add(page_hash)
+                full_text.append(text)
 
     return " ".join(full_text)
+
+
+# pdf_document_text
+def pdf_document_text(pdf_file):
+    """
+    Extract all unique text from an opened PyMuPDF document using its native text extraction.
+    """
+    logger.info(f"\t\tPDF has > {len(pdf_file)} < pages.")
+    return unique_page_text(page.get_text() for page in pdf_file)
+
+
+# Updated read_pdf_file
+def read_pdf_file(file_path, engine="pdfplumber"):
+    """
+    Read a PDF file and extract all unique text from it.
+
+    PyMuPDF is much faster; pdfplumber is slower but can give better results for
+    layout-sensitive documents.
+
+    Parameters:
+    file_path (str or bytes): The path to the PDF file to read, or its contents.
+    engine (str): The text engine to use, "pymupdf" or "pdfplumber".
+
+    Returns:
+    str: The extracted unique text from the PDF file.
+    """
+    if engine not in PDF_TEXT_ENGINES:
+        raise ValueError(f"Unknown PDF text engine: {engine}")
+
+    if engine == "pymupdf":
+        with open_pdf(file_path) as pdf_file:
+            return pdf_document_text(pdf_file)
+
+    with pdfplumber.open(open_source(file_path)) as pdf:
+        logger.info(f"\t\tPDF has > {len(pdf.pages)} < pages.")
+        return unique_page_text(page.extract_text() for page in pdf.pages)
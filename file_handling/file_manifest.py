@@ -0,0 +1,166 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class FileManifest:
+    """
+    Persistent record of every file the update process has seen.
+
+    Each entry maps a file path to the size, modification time (ns) and inode observed
+    when the file was last hashed, along with its SHA256 hash and the outcome of the last
+    attempt to process it. A file whose stat signature still matches its entry has not
+    changed and does not need to be read or hashed again.
+    """
+
+    STATUS_INDEXED = "indexed"
+    STATUS_DUPLICATE = "duplicate"
+    STATUS_FAILED = "failed"
+
+    # Statuses that mean no further work is required while the file is unchanged
+    settled_statuses = (STATUS_INDEXED, STATUS_DUPLICATE)
+
+    def __init__(self, manifest_path, commit_interval=500):
+        """
+        Open (or create) the manifest database.
+
+        Parameters:
+        manifest_path (str): The path to the SQLite file backing the manifest.
+        commit_interval (int): Number of recorded entries between automatic commits.
+        """
+        manifest_dir = os.path.dirname(manifest_path)
+        if manifest_dir and not os.path.exists(manifest_dir):
+            os.makedirs(manifest_dir)
+
+        self.manifest_path = manifest_path
+        self.commit_interval = commit_interval
+        self.pending_writes = 0
+        self.lock = threading.Lock()
+
+        # A single connection is shared by the worker threads and serialized with the lock
+        self.conn = sqlite3.connect(manifest_path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_manifest (
+                file_path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER,
+                SHA256_hash TEXT,
+                status TEXT,
+                updated_time TEXT
+            )
+        """
+        )
+        self.conn.commit()
+        logger.info(f"File manifest opened at {manifest_path}")
+
+    def lookup(self, file_path):
+        """
+        Return the manifest entry for a file path as a dictionary, or None if it has never been seen.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, inode, SHA256_hash, status FROM file_manifest WHERE file_path=?",
+                (file_path,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "size": row[0],
+            "mtime_ns": row[1],
+            "inode": row[2],
+            "file_hash": row[3],
+            "status": row[4],
+        }
+
+    @staticmethod
+    def matches(entry, stat_result):
+        """
+        Check whether a manifest entry still describes the file with the given stat result.
+        """
+        return (
+            entry is not None
+            and entry["size"] == stat_result.st_size
+            and entry["mtime_ns"] == stat_result.st_mtime_ns
+            and entry["inode"] == stat_result.st_ino
+        )
+
+    def is_unchanged(self, file_path, stat_result, is_stored=None):
+        """
+        Return True if the file is unchanged since it was last recorded and needs no further work.
+
+        Files whose last attempt failed are always retried.
+
+        Parameters:
+        file_path (str): The path of the file.
+        stat_result (os.stat_result): The current stat of the file.
+        is_stored (callable): Optional check that a recorded hash is still in storage. An
+                              entry whose hash fails it needs processing again, as it does
+                              when the index is recreated or the storage backend changes.
+        """
+        entry = self.lookup(file_path)
+        return (
+            self.matches(entry, stat_result)
+            and entry["status"] in self.settled_statuses
+            and (is_stored is None or is_stored(entry["file_hash"]))
+        )
+
+    def record(self, file_path, stat_result, file_hash, status):
+        """
+        Insert or update the manifest entry for a file.
+
+        Parameters:
+        file_path (str): The path of the file.
+        stat_result (os.stat_result): The stat taken before the file was read.
+        file_hash (str): The SHA256 hash of the file contents.
+        status (str): The outcome of processing the file.
+        """
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO file_manifest (file_path, size, mtime_ns, inode, SHA256_hash, status, updated_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(file_path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    inode = excluded.inode,
+                    SHA256_hash = excluded.SHA256_hash,
+                    status = excluded.status,
+                    updated_time = excluded.updated_time
+            """,
+                (
+                    file_path,
+                    stat_result.st_size,
+                    stat_result.st_mtime_ns,
+                    stat_result.st_ino,
+                    file_hash,
+                    status,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self.pending_writes += 1
+            if self.pending_writes >= self.commit_interval:
+                self.conn.commit()
+                self.pending_writes = 0
+
+    def commit(self):
+        """
+        Flush any pending manifest writes to disk.
+        """
+        with self.lock:
+            self.conn.commit()
+            self.pending_writes = 0
+
+    def close(self):
+        """
+        Commit pending writes and close the manifest database.
+        """
+        self.commit()
+        with self.lock:
+            self.conn.close()
+        logger.info(f"File manifest closed at {self.manifest_path}")
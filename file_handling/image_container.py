@@ -0,0 +1,154 @@
+import hashlib
+import struct
+from io import BytesIO
+
+from PIL import Image
+
+# Container layout, all integers big-endian:
+#   magic (4 bytes) | version (1 byte) | image count (4 bytes)
+# then, for each image, a fixed-size record header followed by the image data:
+#   format (8 bytes, ASCII, NUL-padded) | width (4) | height (4) | SHA256 (32) | length (8)
+CONTAINER_MAGIC = b"CIMG"
+CONTAINER_VERSION = 1
+CONTAINER_HEADER = struct.Struct(">4sBI")
+RECORD_HEADER = struct.Struct(">8sII32sQ")
+
+# Only the start of an image is copied to read its format and dimensions
+HEADER_PROBE_BYTES = 256 * 1024
+
+
+class ImageContainerError(ValueError):
+    """
+    Raised when an image container is truncated, corrupt or of an unknown version.
+    """
+
+
+class ImageRecord:
+    """
+    An image read from a container, with the details from its record header.
+
+    Attributes:
+    format (str): The image format, such as "WEBP", or "" if it could not be read.
+    width (int): The width of the image in pixels, or 0 if unknown.
+    height (int): The height of the image in pixels, or 0 if unknown.
+    sha256 (bytes): The SHA256 digest of the image data.
+    data (bytes): The image data.
+    """
+
+    def __init__(self, image_format, width, height, sha256, data):
+        self.format = image_format
+        self.width = width
+        self.height = height
+        self.sha256 = sha256
+        self.data = data
+
+    def __repr__(self):
+        return (
+            f"ImageRecord(format={self.format!r}, width={self.width}, "
+            f"height={self.height}, bytes={len(self.data)})"
+        )
+
+
+def _image_view(image):
+    # Read BytesIO contents through a view of its buffer rather than a copy
+    return image.getbuffer() if isinstance(image, BytesIO) else memoryview(image)
+
+
+def _describe_image(view):
+    """
+    Return the format, width and height of an image, reading only its header.
+    """
+    try:
+        with Image.open(BytesIO(view[:HEADER_PROBE_BYTES])) as image:
+            return image.format or "", image.width, image.height
+    except Exception:
+        return "", 0, 0
+
+
+def write_image_container(stream, images):
+    """
+    Write images to a binary stream as a length-prefixed container.
+
+    Each image is written straight from its buffer, without an intermediate copy.
+
+    Parameters:
+    stream (file-like): A writable binary stream.
+    images (list): BytesIO objects or bytes containing the image data.
+
+    Returns:
+    int: The number of bytes written.
+    """
+    written = stream.write(
+        CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, len(images))
+    )
+    for image in images:
+        with _image_view(image) as view:
+            image_format, width, height = _describe_image(view)
+            written += stream.write(
+                RECORD_HEADER.pack(
+                    image_format.encode("ascii", "replace")[:8],
+                    width,
+                    height,
+                    hashlib.sha256(view).digest(),
+                    view.nbytes,
+                )
+            )
+            written += stream.write(view)
+    return written
+
+
+def read_exact(stream, size):
+    # Decompressing streams may return fewer bytes than asked for
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise ImageContainerError("Image container is truncated")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def iter_image_container(stream, verify=True):
+    """
+    Read the images of a container one at a time from a binary stream.
+
+    Parameters:
+    stream (file-like): A readable binary stream positioned at the start of a container.
+    verify (bool): Whether to check each image against the SHA256 in its record header.
+
+    Yields:
+    ImageRecord: Each image, in the order it was written.
+
+    Raises:
+    ImageContainerError: If the container is truncated, corrupt or of an unknown version.
+    """
+    magic, version, count = CONTAINER_HEADER.unpack(
+        read_exact(stream, CONTAINER_HEADER.size)
+    )
+    if magic != CONTAINER_MAGIC:
+        raise ImageContainerError("Not an image container")
+    if version != CONTAINER_VERSION:
+        raise ImageContainerError(f"Unsupported image container version: {version}")
+
+    for _ in range(count):
+        image_format, width, height, sha256, length = RECORD_HEADER.unpack(
+            read_exact(stream, RECORD_HEADER.size)
+        )
+        data = read_exact(stream, length)
+        if verify and hashlib.sha256(data).digest() != sha256:
+            raise ImageContainerError("Image data does not match its SHA256")
+        yield ImageRecord(
+            image_format.rstrip(b"\0").decode("ascii"), width, height, sha256, data
+        )
+
+
+def read_image_container(stream, verify=True):
+    """
+    Read every image of a container from a binary stream.
+
+    Returns:
+    list: An ImageRecord for each image.
+    """
+    return list(iter_image_container(stream, verify=verify))
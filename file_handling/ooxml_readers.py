@@ -0,0 +1,192 @@
+import logging
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+# XML namespaces used by WordprocessingML, PresentationML and package relationships
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+REL_TAG = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+NOTES_SLIDE_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+)
+
+
+def _natural_key(name):
+    # Sort header2.xml before header10.xml
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def _iter_paragraph_text(zip_ref, part_name, paragraph_tag, run_tag, text_tag, breaks):
+    """
+    Stream the text of each paragraph in an XML part without building a document tree.
+
+    Text inside markup-compatibility fallbacks is skipped, since it duplicates the preferred
+    content (for example the VML copy of a text box). Paragraphs nested inside another
+    paragraph, such as text box contents, are yielded on their own.
+
+    Parameters:
+    zip_ref (ZipFile): The opened OOXML package.
+    part_name (str): The name of the XML part within the package.
+    paragraph_tag (str): The qualified tag of a paragraph element.
+    run_tag (str): The qualified tag of a run element.
+    text_tag (str): The qualified tag of a text element within a run.
+    breaks (dict): Qualified tags of run-level elements mapped to the text they stand for.
+
+    Yields:
+    str: The text of each paragraph, in document order.
+    """
+    paragraphs = []  # Stack of text fragments for the open paragraphs
+    in_run = 0
+    in_fallback = 0
+
+    with zip_ref.open(part_name) as part:
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == paragraph_tag:
+                    paragraphs.append([])
+                elif tag == run_tag:
+                    in_run += 1
+                elif tag == MC_FALLBACK:
+                    in_fallback += 1
+                continue
+
+            if tag == paragraph_tag:
+                fragments = paragraphs.pop()
+                if not in_fallback:
+                    yield "".join(fragments)
+                elem.clear()
+            elif tag == run_tag:
+                in_run -= 1
+            elif tag == MC_FALLBACK:
+                in_fallback -= 1
+                elem.clear()
+            elif in_run and paragraphs and not in_fallback:
+                if tag == text_tag:
+                    paragraphs[-1].append(elem.text or "")
+                elif tag in breaks:
+                    paragraphs[-1].append(breaks[tag])
+
+
+def _relationships(zip_ref, part_name):
+    """
+    Return the relationships of a package part as a mapping of ID to (type, target part name).
+    """
+    directory, name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    if rels_name not in zip_ref.namelist():
+        return {}
+
+    relationships = {}
+    with zip_ref.open(rels_name) as rels:
+        for rel in ET.parse(rels).getroot().iter(REL_TAG):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = posixpath.normpath(posixpath.join(directory, rel.get("Target")))
+            relationships[rel.get("Id")] = (rel.get("Type"), target.lstrip("/"))
+    return relationships
+
+
+def iter_docx_paragraphs(zip_ref):
+    """
+    Stream the paragraph text of a Word (.docx) package: headers, then the document body
+    including tables, then footers.
+
+    Parameters:
+    zip_ref (ZipFile): The opened .docx package.
+
+    Yields:
+    str: The text of each paragraph.
+    """
+    names = zip_ref.namelist()
+    if "word/document.xml" not in names:
+        raise KeyError("word/document.xml not found in package")
+
+    headers = sorted(
+        (n for n in names if re.fullmatch(r"word/header\d*\.xml", n)), key=_natural_key
+    )
+    footers = sorted(
+        (n for n in names if re.fullmatch(r"word/footer\d*\.xml", n)), key=_natural_key
+    )
+    breaks = {f"{W_NS}tab": "\t", f"{W_NS}br": "\n", f"{W_NS}cr": "\n"}
+
+    for part_name in headers + ["word/document.xml"] + footers:
+        yield from _iter_paragraph_text(
+            zip_ref, part_name, f"{W_NS}p", f"{W_NS}r", f"{W_NS}t", breaks
+        )
+
+
+def docx_package_text(zip_ref):
+    """
+    Extract all the text from a Word (.docx) package, joining paragraphs with spaces.
+    """
+    return " ".join(iter_docx_paragraphs(zip_ref))
+
+
+def slide_part_names(zip_ref):
+    """
+    Return the slide parts of a presentation in presentation order.
+    """
+    relationships = _relationships(zip_ref, "ppt/presentation.xml")
+    with zip_ref.open("ppt/presentation.xml") as presentation:
+        root = ET.parse(presentation).getroot()
+    return [
+        relationships[slide_id.get(f"{R_NS}id")][1]
+        for slide_id in root.iter(f"{P_NS}sldId")
+        if slide_id.get(f"{R_NS}id") in relationships
+    ]
+
+
+def iter_pptx_runs(zip_ref, include_notes=True):
+    """
+    Stream the text runs of a PowerPoint (.pptx) package, slide by slide, including tables
+    and grouped shapes, followed by each slide's speaker notes.
+
+    Parameters:
+    zip_ref (ZipFile): The opened .pptx package.
+    include_notes (bool): Whether to include the speaker notes of each slide.
+
+    Yields:
+    str: The text of each non-empty run.
+    """
+    run_tag = f"{A_NS}r"
+    text_tag = f"{A_NS}t"
+
+    for slide_name in slide_part_names(zip_ref):
+        parts = [slide_name]
+        if include_notes:
+            parts.extend(
+                target
+                for rel_type, target in _relationships(zip_ref, slide_name).values()
+                if rel_type == NOTES_SLIDE_REL
+            )
+
+        for part_name in parts:
+            run_text = None
+            with zip_ref.open(part_name) as part:
+                for event, elem in ET.iterparse(part, events=("start", "end")):
+                    if event == "start":
+                        if elem.tag == run_tag:
+                            run_text = []
+                    elif elem.tag == text_tag and run_text is not None:
+                        run_text.append(elem.text or "")
+                    elif elem.tag == run_tag:
+                        text = "".join(run_text)
+                        run_text = None
+                        if text:
+                            yield text
+                        elem.clear()
+
+
+def pptx_package_text(zip_ref):
+    """
+    Extract all the text from a PowerPoint (.pptx) package, joining runs with spaces.
+    """
+    return " ".join(iter_pptx_runs(zip_ref))
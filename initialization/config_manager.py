@@ -17,7 +17,7 @@ class ConfigManager:
         Returns:
             dict: Configuration data for the specified section, or an empty dictionary if not found.
         """
-        return AppConfig.system_config.get(section, {})
+        return (AppConfig.system_config or {}).get(section, {})
 
     @staticmethod
     def get_user_config(section):
@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 try:
     from database_operations.db_manager import DatabaseManager
+    from database_operations.image_store import report_image_ids
     from initialization.init_app import AppInitialization
     from utilities.configurations.configs import AppConfig
 
@@ -49,6 +50,9 @@ app.add_middleware(
 clin = None
 initialized = False
 
+# Images and thumbnails are served by the core service (see core/run_app.py)
+IMAGE_API_URL = "http://localhost:5005"
+
 # Fetch configuration from run_app.py
 try:
     response = requests.get("http://localhost:5005/api/config")  # Adjust port if needed
@@ -151,7 +155,8 @@ def retrieve_report(SHA256_hash: str):
         index = elastic_conn_info.get("index")
 
         # If you used file_hash as the ES _id, you can just call .get
-        doc = clin.get(index=index, id=SHA256_hash)
+        # Images are listed separately (see retrieve_report_images)
+        doc = clin.get(index=index, id=SHA256_hash, source_excludes=["images"])
 
         # doc["_source"] has all the fields
         source = doc["_source"]
@@ -169,7 +174,6 @@ def retrieve_report(SHA256_hash: str):
             "topics": source.get("topics", ""),
             "keywords": source.get("keywords", ""),
             "MGRS": source.get("MGRS", []),
-            "images": source.get("images", []),  # base64 or however stored
             "full_text": source.get("full_text", ""),
             "processed_time": source.get("processed_time", ""),
         }
@@ -185,6 +189,39 @@ def retrieve_report(SHA256_hash: str):
         return {}
 
 
+def retrieve_report_images(SHA256_hash: str):
+    """
+    Fetch the image list of a single document from Elasticsearch, without the rest of it.
+
+    Args:
+        SHA256_hash (str): The unique identifier for the file in ES.
+
+    Returns:
+        list: A dict per image with its ID and the URLs of the image and its thumbnail,
+              or None if the document was not found.
+    """
+    if not clin:
+        logger.info("Elasticsearch client is not available")
+        return None
+    try:
+        index = elastic_conn_info.get("index")
+        doc = clin.get(index=index, id=SHA256_hash, source_includes=["images"])
+        return [
+            {
+                "id": image_id,
+                "url": f"{IMAGE_API_URL}/api/images/{image_id}",
+                "thumbnail_url": f"{IMAGE_API_URL}/api/images/{image_id}/thumbnail",
+            }
+            for image_id in report_image_ids(doc["_source"].get("images"))
+        ]
+    except NotFoundError:
+        logger.error(f"Document with file_hash={SHA256_hash} not found.")
+        return None
+    except Exception as e:
+        logger.error(f"Error retrieving images of document: {e}")
+        return None
+
+
 # @app.get("/api/search")
 # async def search(query: str):
 #     """
@@ -328,6 +365,18 @@ async def get_full_report(SHA256_hash: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/report/{SHA256_hash}/images")
+async def get_report_images(SHA256_hash: str):
+    """
+    RESTful endpoint to list the images of a report, so the report view can load them on demand.
+
+    """
+    images = retrieve_report_images(SHA256_hash)
+    if images is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return JSONResponse(status_code=200, content={"images": images})
+
+
 @app.get("/api/status")
 async def search_init_status():
     """
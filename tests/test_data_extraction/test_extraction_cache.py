@@ -0,0 +1,85 @@
+import hashlib
+import os
+from io import BytesIO
+
+from data_extraction.document_extractors import ExtractionResult
+from data_extraction.extraction_cache import ExtractionCache
+
+
+def sha(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def test_round_trip_and_sharding(tmp_path):
+    cache = ExtractionCache(str(tmp_path), settings={"pdf_text_engine": "pymupdf"})
+    file_hash = sha("report")
+    cache.put(
+        file_hash,
+        ExtractionResult("Report text", [BytesIO(b"image")], {"pages": 2}),
+    )
+
+    result = cache.get(file_hash)
+
+    assert result.text == "Report text"
+    assert [image.getvalue() for image in result.images] == [b"image"]
+    assert result.metadata == {"pages": 2}
+    assert os.path.dirname(cache._entry_path(file_hash)).endswith(
+        os.path.join(file_hash[:2], file_hash[2:4])
+    )
+    assert cache.get(sha("missing")) is None
+
+
+def test_round_trip_keeps_originals_of_downscaled_images(tmp_path):
+    cache = ExtractionCache(str(tmp_path), settings={"image_keep_originals": True})
+    file_hash = sha("report")
+    downscaled = BytesIO(b"downscaled")
+    downscaled.original = b"original"
+    cache.put(
+        file_hash,
+        ExtractionResult("Report text", [BytesIO(b"logo"), downscaled], {}),
+    )
+
+    logo, image = cache.get(file_hash).images
+
+    assert getattr(logo, "original", None) is None
+    assert image.getvalue() == b"downscaled"
+    assert image.original == b"original"
+
+
+def test_settings_change_starts_fresh_namespace(tmp_path):
+    file_hash = sha("report")
+    ExtractionCache(str(tmp_path), settings={"pdf_text_engine": "pymupdf"}).put(
+        file_hash, ExtractionResult("Report text")
+    )
+
+    cache = ExtractionCache(str(tmp_path), settings={"pdf_text_engine": "pdfplumber"})
+
+    assert cache.get(file_hash) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_size_mb=1)
+    hashes = [sha(f"report {i}") for i in range(3)]
+    for age, file_hash in enumerate(hashes):
+        cache.put(file_hash, ExtractionResult("", [BytesIO(os.urandom(300_000))]))
+        # Give each entry a distinct, increasing last-used time
+        os.utime(cache._entry_path(file_hash), (1000 + age, 1000 + age))
+
+    cache.put(sha("newest"), ExtractionResult("", [BytesIO(os.urandom(300_000))]))
+
+    assert cache.get(hashes[0]) is None
+    assert cache.get(sha("newest")) is not None
+    assert cache.total_size <= cache.max_size_bytes
+
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    file_hash = sha("report")
+    cache.put(file_hash, ExtractionResult("Report text", [BytesIO(b"image")]))
+
+    path = cache._entry_path(file_hash)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) // 2)
+
+    assert cache.get(file_hash) is None
+    assert not os.path.exists(path)
@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+import pytest
+
+from data_extraction.extraction_sandbox import (ExtractionError,
+                                                ExtractionSandbox,
+                                                ExtractionTimeout,
+                                                page_worker_limit)
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = ExtractionSandbox(timeout_seconds=60, memory_limit_mb=2048)
+    yield sandbox
+    sandbox.close()
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    pdf_document = fitz.open()
+    page = pdf_document.new_page()
+    page.insert_text((100, 100), "Sandboxed page")
+    return pdf_document.tobytes()
+
+
+def test_extracts_in_worker_process(sandbox, pdf_bytes):
+    result = sandbox.extract("report.pdf", pdf_bytes)
+
+    assert "Sandboxed page" in result.text
+    assert result.metadata["pages"] == 1
+    assert sandbox.process.is_alive()
+
+
+def test_extraction_errors_keep_worker(sandbox, pdf_bytes):
+    with pytest.raises(ExtractionError):
+        sandbox.extract("corrupted.pdf", b"\x00\x00\x00\x00")
+
+    worker = sandbox.process
+    assert "Sandboxed page" in sandbox.extract("report.pdf", pdf_bytes).text
+    assert sandbox.process is worker
+
+
+def test_timeout_kills_and_restarts_worker(sandbox, pdf_bytes):
+    pdf_document = fitz.open()
+    for _ in range(3000):
+        pdf_document.new_page().insert_text((100, 100), "Slow page")
+    slow_pdf = pdf_document.tobytes()
+
+    sandbox.extract("report.pdf", pdf_bytes)
+    worker = sandbox.process
+    sandbox.timeout_seconds = 0
+
+    with patch(
+        "data_extraction.extraction_sandbox.AppConfig.parallel_pdf_page_threshold", 0
+    ):
+        with pytest.raises(ExtractionTimeout):
+            sandbox.extract("slow.pdf", slow_pdf)
+    assert not worker.is_alive()
+
+    sandbox.timeout_seconds = 60
+    assert "Sandboxed page" in sandbox.extract("report.pdf", pdf_bytes).text
+    assert sandbox.process is not worker
+
+
+def test_page_worker_limit_fits_memory_limit():
+    mb = 1024 * 1024
+
+    assert page_worker_limit(800 * mb, 16) == 1
+    assert page_worker_limit(4096 * mb, 32) == 7
+    assert page_worker_limit(4096 * mb, 2) == 2
+    assert page_worker_limit(0, 32) == 32
+
+
+def test_parallel_pdf_stays_within_memory_limit():
+    pdf_document = fitz.open()
+    for page_number in range(3000):
+        pdf_document.new_page().insert_text((100, 100), f"Page {page_number}")
+    large_pdf = pdf_document.tobytes()
+    sandbox = ExtractionSandbox(timeout_seconds=120, memory_limit_mb=800)
+
+    try:
+        with patch.multiple(
+            "data_extraction.extraction_sandbox.AppConfig",
+            parallel_pdf_page_threshold=500,
+            parallel_pdf_workers=None,
+        ):
+            result = sandbox.extract("large.pdf", large_pdf)
+    finally:
+        sandbox.close()
+
+    assert result.metadata["parallel"] is True
+    assert "Page 2999" in result.text
@@ -0,0 +1,60 @@
+from concurrent.futures import Future
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from data_extraction.image_encoding_pool import ImageEncodingPool
+from data_extraction.image_extractors import PendingImage
+
+
+def image_bytes(color, image_format="BMP"):
+    stream = BytesIO()
+    Image.new("RGB", (64, 64), color=color).save(stream, format=image_format)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def pool():
+    pool = ImageEncodingPool(max_workers=2, max_in_flight_mb=1)
+    yield pool
+    pool.close()
+
+
+def test_pool_encodes_pending_images_in_order(pool):
+    original = BytesIO(image_bytes("green", "JPEG"))
+    pending = [
+        PendingImage(image_bytes(color), "lossless") for color in ("red", "blue")
+    ]
+
+    submitted = pool.submit([pending[0], original, pending[1]])
+    assert isinstance(submitted[0], Future)
+    assert submitted[1] is original
+
+    images = pool.collect(submitted)
+
+    assert images[1] is original
+    assert [image.getvalue() for image in (images[0], images[2])] == [
+        image.encode().getvalue() for image in pending
+    ]
+    assert pool.in_flight_bytes == 0
+
+
+def test_pool_bounds_in_flight_bytes(pool):
+    # Each image is about half the budget, so at most two are queued at a time
+    pool.max_in_flight_bytes = len(image_bytes("red")) * 2
+    pending = [PendingImage(image_bytes("red"), "lossy") for _ in range(6)]
+
+    images = pool.collect(pool.submit(pending))
+
+    assert len(images) == 6
+    assert pool.in_flight_bytes == 0
+
+
+def test_pool_skips_images_that_cannot_be_encoded(pool):
+    broken = PendingImage(b"not an image", "lossless")
+    good = PendingImage(image_bytes("red"), "lossless")
+
+    images = pool.collect(pool.submit([broken, good]))
+
+    assert [image.getvalue() for image in images] == [good.getvalue()]
@@ -1,5 +1,8 @@
 import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from unittest.mock import patch
 
 import fitz  # PyMuPDF
 import pandas as pd
@@ -10,10 +13,15 @@ from openpyxl.drawing.image import Image as xlImage
 from PIL import Image
 from pptx import Presentation
 
-from data_extraction.image_extractors import (extract_images_from_excel,
+from data_extraction.document_extractors import ExtractionResult, extract
+from data_extraction.image_extractors import (ImageTriage, PendingImage,
+                                              downscale_size, encode_image,
+                                              extract_images_from_excel,
                                               extract_images_from_pdf,
                                               extract_images_from_pptx,
-                                              extract_images_from_word)
+                                              extract_images_from_word,
+                                              package_image_members,
+                                              package_images)
 from data_extraction.text_extractors import (extract_text_from_excel,
                                              extract_text_from_pdf,
                                              extract_text_from_pptx,
@@ -189,3 +197,142 @@ def test_extract_text_empty(setup_files, file_key, extract_function):
 def test_extract_text_corrupted(setup_files, file_key, extract_function):
     with pytest.raises(Exception):
         extract_function(setup_files[file_key])
+
+
+@pytest.mark.parametrize(
+    "file_key",
+    ["valid_word_file", "valid_excel_file", "valid_pptx_file", "valid_pdf_file"],
+)
+def test_extract_text_and_images_together(setup_files, file_key):
+    file_path = setup_files[file_key]
+    with open(file_path, "rb") as f:
+        file_bytes = f.read()
+
+    result = extract(file_path, file_bytes)
+
+    assert isinstance(result, ExtractionResult)
+    assert len(result.text) > 0
+    assert len(result.images) > 0
+    assert result.metadata
+
+
+def test_extract_unsupported_type():
+    assert extract("notes.txt", b"text") is None
+
+
+def test_extract_images_from_excel_concurrently_in_memory(
+    setup_files, tmp_path, monkeypatch
+):
+    with open(setup_files["valid_excel_file"], "rb") as f:
+        excel_bytes = f.read()
+    monkeypatch.chdir(tmp_path)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(extract_images_from_excel, [excel_bytes] * 16))
+
+    assert all(len(images) == 1 for images in results)
+    # Nothing is unpacked to disk
+    assert os.listdir(tmp_path) == []
+
+
+def image_bytes(size, image_format, color="red"):
+    stream = BytesIO()
+    Image.new("RGB", size, color=color).save(stream, format=image_format)
+    return stream.getvalue()
+
+
+def test_image_triage_dedupes_and_drops_small_images():
+    triage = ImageTriage()
+    logo = image_bytes((100, 100), "PNG")
+
+    assert triage.process(logo) is not None
+    assert triage.process(logo) is None
+    assert triage.process(image_bytes((8, 8), "PNG", color="blue")) is None
+    assert not triage.seen_xref(7)
+    assert triage.seen_xref(7)
+    assert triage.stats == {
+        "kept": 1,
+        "downscaled": 0,
+        "duplicates": 2,
+        "too_small": 1,
+        "unreadable": 0,
+    }
+
+
+def test_image_triage_encodes_by_source_format():
+    triage = ImageTriage()
+    jpeg = image_bytes((100, 100), "JPEG")
+    bmp = image_bytes((100, 100), "BMP")
+
+    # JPEGs are passed through untouched; BMPs are re-encoded as WebP
+    assert triage.process(jpeg).getvalue() == jpeg
+    pending = triage.process(bmp)
+    assert isinstance(pending, PendingImage)
+    assert Image.open(pending.encode()).format == "WEBP"
+
+
+def test_encode_image_keeps_smaller_original():
+    png = image_bytes((100, 100), "PNG")
+
+    assert len(encode_image(png, "lossy", quality=50).getvalue()) <= len(png)
+    with pytest.raises(ValueError):
+        encode_image(png, "unknown")
+
+
+def test_downscale_size_fits_pixel_and_dimension_budgets():
+    assert downscale_size(1000, 500, max_pixels=1_000_000, max_dimension=2000) is None
+    assert downscale_size(8000, 4000, max_dimension=2000) == (2000, 1000)
+    assert downscale_size(4000, 4000, max_pixels=4_000_000) == (2000, 2000)
+    assert downscale_size(8000, 4000) is None
+
+
+def test_oversized_images_are_downscaled_and_keep_originals():
+    jpeg = image_bytes((1600, 1200), "JPEG")
+
+    with patch.multiple(
+        "data_extraction.image_extractors.AppConfig",
+        image_max_pixels=0,
+        image_max_dimension=400,
+        image_keep_originals=True,
+    ):
+        triage = ImageTriage()
+        pending = triage.process(jpeg)
+
+    # JPEGs are normally passed through, but not when over the pixel budget
+    assert isinstance(pending, PendingImage)
+    assert triage.stats["downscaled"] == 1
+
+    encoded = pending.encode()
+    with Image.open(encoded) as image:
+        assert image.format == "WEBP"
+        assert image.size == (400, 300)
+    assert encoded.original == jpeg
+
+
+def test_package_images_selects_media_by_content_type():
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="bmp" ContentType="image/bmp"/>'
+        '<Default Extension="mp4" ContentType="video/mp4"/>'
+        '<Override PartName="/word/media/image2.bin" ContentType="image/tiff"/>'
+        "</Types>"
+    )
+    stream = BytesIO()
+    with zipfile.ZipFile(stream, "w") as package:
+        package.writestr("[Content_Types].xml", content_types)
+        package.writestr("word/media/image1.bmp", image_bytes((100, 100), "BMP"))
+        package.writestr(
+            "word/media/image2.bin", image_bytes((100, 100), "TIFF", color="blue")
+        )
+        package.writestr("word/media/media1.mp4", b"not an image")
+
+    with zipfile.ZipFile(stream) as package:
+        members = package_image_members(package, "word/media/")
+        images = package_images(package, "word/media/")
+
+    assert [info.filename for info in members] == [
+        "word/media/image1.bmp",
+        "word/media/image2.bin",
+    ]
+    assert len(images) == 2
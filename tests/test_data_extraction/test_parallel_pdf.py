@@ -0,0 +1,98 @@
+import os
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from data_extraction import parallel_pdf
+from data_extraction.document_extractors import extract_pdf
+from data_extraction.parallel_pdf import (extract_pdf_pages_parallel,
+                                          page_ranges)
+
+
+@pytest.fixture(scope="module")
+def large_pdf():
+    image_stream = BytesIO()
+    Image.new("RGB", (50, 50), color="blue").save(image_stream, format="PNG")
+
+    pdf_document = fitz.open()
+    for page_number in range(30):
+        page = pdf_document.new_page()
+        # Every third page repeats the same text to exercise the per-page dedup
+        text = "Repeated page" if page_number % 3 == 0 else f"Page {page_number}"
+        page.insert_text((100, 50), text)
+        if page_number % 10 == 0:
+            page.insert_image(
+                fitz.Rect(100, 100, 150, 150), stream=image_stream.getvalue()
+            )
+    return pdf_document.tobytes()
+
+
+def test_page_ranges_cover_every_page_in_order():
+    ranges = page_ranges(1500, max_workers=4)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 1500
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.parametrize("engine", ["pymupdf", "pdfplumber"])
+def test_parallel_extraction_matches_sequential(large_pdf, engine):
+    with patch("data_extraction.document_extractors.AppConfig") as mock_config:
+        mock_config.parallel_pdf_page_threshold = 0
+        sequential = extract_pdf(large_pdf, engine=engine)
+
+    text, images = extract_pdf_pages_parallel(large_pdf, 30, engine, max_workers=2)
+
+    assert text == sequential.text
+    assert text.count("Repeated page") == 1
+    assert [image.getvalue() for image in images] == [
+        image.getvalue() for image in sequential.images
+    ]
+
+
+def test_extract_pdf_uses_parallel_path_above_threshold(large_pdf):
+    with patch("data_extraction.document_extractors.AppConfig") as mock_config, patch(
+        "data_extraction.document_extractors.extraction_settings", return_value={}
+    ):
+        mock_config.pdf_text_engine = "pymupdf"
+        mock_config.parallel_pdf_page_threshold = 20
+        mock_config.parallel_pdf_workers = 2
+        result = extract_pdf(large_pdf)
+
+    assert result.metadata["parallel"] is True
+    assert "Page 29" in result.text
+
+
+def test_worker_parses_a_document_once_for_all_its_ranges(large_pdf, tmp_path):
+    path = tmp_path / "large.pdf"
+    path.write_bytes(large_pdf)
+
+    first_texts, _ = parallel_pdf._extract_page_range(str(path), 0, 10, "pdfplumber")
+    document = parallel_pdf._worker_document
+    second_texts, _ = parallel_pdf._extract_page_range(str(path), 10, 20, "pdfplumber")
+
+    assert parallel_pdf._worker_document is document
+    assert "Page 1" in first_texts[1] and "Page 11" in second_texts[1]
+
+    # The worker holds no handle on the file, so it can be replaced by another document
+    path.unlink()
+    other = fitz.open()
+    other.new_page().insert_text((100, 50), "Other document")
+    path.write_bytes(other.tobytes())
+    texts, _ = parallel_pdf._extract_page_range(str(path), 0, 1, "pymupdf")
+
+    assert parallel_pdf._worker_document is not document
+    assert "Other document" in texts[0]
+
+
+def test_failed_extraction_removes_the_temporary_copy(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    with pytest.raises(Exception):
+        extract_pdf_pages_parallel(b"not a pdf", 30, "pymupdf", max_workers=2)
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import spacy
+
+from data_processing.info_processing import extract_info
+from data_processing.ner_batcher import (NERBatcher, chunk_text,
+                                         merge_entities, text_entities)
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [
+            {"label": "GPE", "pattern": "Kabul"},
+            {"label": "ORG", "pattern": "USAID"},
+        ]
+    )
+    return nlp
+
+
+def test_batcher_maps_entities_back_to_each_text(nlp):
+    batcher = NERBatcher(nlp, n_process=1, batch_size=4, max_wait_ms=20)
+    texts = [
+        f"Report {i} from Kabul" if i % 2 else f"USAID note {i}" for i in range(10)
+    ]
+    try:
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(batcher.entities, texts))
+    finally:
+        batcher.close()
+
+    for i, (text, entities) in enumerate(zip(texts, results)):
+        if i % 2:
+            assert entities == [("Kabul", "GPE", len(text) - 5, len(text))]
+        else:
+            assert entities == [("USAID", "ORG", 0, 5)]
+
+
+def test_batcher_uses_worker_processes(nlp, tmp_path):
+    model_path = tmp_path / "model"
+    nlp.to_disk(model_path)
+    batcher = NERBatcher(
+        nlp, n_process=2, batch_size=2, max_wait_ms=10, model_name=str(model_path)
+    )
+    try:
+        futures = [batcher.submit(f"Visit {i} to Kabul") for i in range(5)]
+        results = [future.result(timeout=120) for future in futures]
+    finally:
+        batcher.close()
+
+    assert results == [[("Kabul", "GPE", 11, 16)]] * 5
+
+
+def test_batcher_processes_queued_texts_on_close(nlp):
+    batcher = NERBatcher(nlp, n_process=1, batch_size=64, max_wait_ms=10_000)
+    future = batcher.submit("USAID")
+    batcher.close()
+
+    assert future.result(timeout=5) == [("USAID", "ORG", 0, 5)]
+    with pytest.raises(RuntimeError):
+        batcher.submit("Kabul")
+
+
+def test_chunk_text_prefers_paragraph_then_sentence_boundaries():
+    text = "First paragraph here.\n\nSecond one. It has two sentences. And more text"
+
+    chunks = list(chunk_text(text, 40))
+
+    assert chunks[0] == (0, "First paragraph here.\n\n")
+    assert chunks[1] == (23, "Second one. It has two sentences. ")
+    assert "".join(chunk for _, chunk in chunks) == text
+    assert all(len(chunk) <= 40 for _, chunk in chunks)
+    assert list(chunk_text("short", 40)) == [(0, "short")]
+
+
+def test_chunk_text_overlaps_chunks_split_mid_sentence():
+    text = " ".join(["word"] * 200)
+
+    chunks = list(chunk_text(text, 300))
+
+    for (offset, chunk), (next_offset, _) in zip(chunks, chunks[1:]):
+        assert text[offset : offset + len(chunk)] == chunk
+        assert next_offset < offset + len(chunk)
+    assert chunks[-1][0] + len(chunks[-1][1]) == len(text)
+
+
+def test_merge_entities_removes_duplicates_and_cut_entities():
+    merged = merge_entities(
+        [
+            [("USAID", "ORG", 0, 5), ("New", "GPE", 50, 53)],
+            [("New York", "GPE", 50, 58), ("Kabul", "GPE", 70, 75)],
+            [("Kabul", "GPE", 70, 75)],
+        ]
+    )
+
+    assert merged == [
+        ("USAID", "ORG", 0, 5),
+        ("New York", "GPE", 50, 58),
+        ("Kabul", "GPE", 70, 75),
+    ]
+
+
+def test_long_texts_are_recognised_in_chunks_with_global_offsets(nlp):
+    paragraph = "Aid from USAID reached Kabul today. " * 20
+    text = "\n\n".join([paragraph] * 30)
+    expected = [
+        (ent.text, ent.label_, ent.start_char, ent.end_char) for ent in nlp(text).ents
+    ]
+
+    assert text_entities(nlp, text, 2_000) == expected
+
+    batcher = NERBatcher(
+        nlp, n_process=1, batch_size=8, max_wait_ms=5, chunk_chars=2_000
+    )
+    try:
+        assert batcher.entities(text) == expected
+        assert batcher.entities("") == []
+    finally:
+        batcher.close()
+
+
+def test_extract_info_uses_given_entities():
+    info = extract_info(
+        "A meeting with USAID in Kabul.",
+        entities=[("USAID", "ORG", 15, 20), ("Kabul", "GPE", 24, 29)],
+    )
+
+    assert info["locations"] == ["Kabul"]
+    assert info["subjects"] == [{"text": "usaid", "label": "ORG"}]
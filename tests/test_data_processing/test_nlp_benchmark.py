@@ -0,0 +1,65 @@
+import pytest
+import spacy
+
+from data_processing.nlp_benchmark import (
+    benchmark_profile,
+    entity_parity,
+    format_report,
+    load_texts,
+)
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("attribute_ruler")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "USAID"}])
+    path = tmp_path_factory.mktemp("nlp") / "model"
+    nlp.to_disk(path)
+    return str(path)
+
+
+def test_load_texts_from_directory_and_file(tmp_path):
+    (tmp_path / "b.txt").write_text("second", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("first", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("ignored", encoding="utf-8")
+    lines = tmp_path / "lines.dat"
+    lines.write_text("one\n\ntwo\nthree\n", encoding="utf-8")
+
+    assert load_texts(str(tmp_path)) == ["first", "second"]
+    assert load_texts(str(lines), limit=2) == ["one", "two"]
+
+
+def test_benchmark_profile_reports_entities_and_components(model_path):
+    texts = ["USAID visit", "No entities here"]
+
+    full = benchmark_profile(model_path, "full", texts)
+    ner = benchmark_profile(model_path, "ner", texts)
+
+    assert full["components"] == ["attribute_ruler", "entity_ruler"]
+    assert ner["components"] == ["entity_ruler"]
+    assert ner["entities"] == full["entities"] == [[("USAID", "ORG", 0, 5)], []]
+    assert ner["docs_per_second"] > 0
+
+
+def test_entity_parity_and_report():
+    reference = [[("USAID", "ORG")], [], [("Kabul", "GPE")]]
+    candidate = [[("USAID", "ORG")], [("Kabul", "GPE")], [("Kabul", "GPE")]]
+
+    assert entity_parity(reference, reference) == 1.0
+    assert entity_parity(reference, candidate) == pytest.approx(2 / 3)
+
+    report = format_report(
+        [
+            {
+                "profile": "ner",
+                "components": ["ner"],
+                "load_seconds": 0.5,
+                "docs_per_second": 120.0,
+                "model_mb": 40.0,
+                "processing_mb": 2.0,
+                "parity": 1.0,
+            }
+        ]
+    )
+    assert "ner" in report and "120.0" in report and "100.0%" in report
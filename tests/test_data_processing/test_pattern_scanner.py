@@ -0,0 +1,42 @@
+import pytest
+
+from data_processing.pattern_scanner import scan_text
+from data_processing.regex_benchmark import legacy_scan, synthetic_text
+
+SAMPLE = (
+    "(S//NOFORN) Met on Monday at 12:30 PM near 4QFJ 12345 67890, then on 3rd of March, "
+    "2020 at 18SUJ2337106519. Next 5 days, last 3 months, in 10 hrs, 2024-01-05, 5/6, "
+    "Jan. 5 and may 2020. (C//REL,FVEY) (U) (Classification) abc123 days, 2020 5 days."
+)
+
+
+def test_scan_text_finds_each_family():
+    result = scan_text(SAMPLE)
+
+    assert result["mgrs"] == ["4QFJ 12345 67890", "18SUJ2337106519"]
+    assert result["markings"] == [
+        ("S", "NOFORN"),
+        ("C", "REL,FVEY"),
+        ("U", ""),
+        ("Classification", ""),
+    ]
+    assert {"Mon", "rd", "Next", "last", "hrs", "-", "Jan.", "may"} <= set(
+        result["timeframes"]
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "(",
+        "no patterns here",
+        SAMPLE,
+        # A date overlapping a coordinate, and a coordinate starting inside a timeframe
+        "12/05/2020 11SMB 123 45, 5 days 11ABC 123 45 6789 1/2/3",
+        "(U//10days) (S//a,b)(C) 1st of may, 22 ((U) jan.5 jan.x 12:30AM _5 days",
+        synthetic_text(20_000),
+    ],
+)
+def test_scan_text_matches_separate_scans(text):
+    assert scan_text(text) == legacy_scan(text)
@@ -0,0 +1,19 @@
+from data_processing.regex_benchmark import (benchmark_scanners, format_report,
+                                             synthetic_text)
+
+
+def test_synthetic_text_is_sized_and_repeatable():
+    text = synthetic_text(5_000, seed=3)
+
+    assert 5_000 <= len(text) < 5_100
+    assert text == synthetic_text(5_000, seed=3)
+    assert "38SMB 12345 67890" in text
+
+
+def test_benchmark_scanners_reports_parity():
+    result = benchmark_scanners([synthetic_text(10_000), "nothing"], repeat=1)
+
+    assert result["documents"] == 2
+    assert result["parity"] == 1.0
+    assert result["legacy_ms"] > 0 and result["scanner_ms"] > 0
+    assert "speedup" in format_report(result)
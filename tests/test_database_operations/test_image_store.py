@@ -0,0 +1,117 @@
+import base64
+import hashlib
+import json
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from database_operations.image_store import (ImageStore, LocalImageStore,
+                                             image_id, report_image_ids)
+
+
+@pytest.fixture
+def local_store(tmp_path):
+    with patch("database_operations.image_store.AppConfig") as mock_config:
+        mock_config.image_store_backend = "local"
+        mock_config.image_store_dir = str(tmp_path / "images")
+        mock_config.image_thumbnail_size = 256
+        ImageStore._store = None
+        yield ImageStore.get_store()
+    ImageStore._store = None
+
+
+def test_local_store_writes_each_blob_once(tmp_path):
+    store = LocalImageStore(str(tmp_path))
+    data = b"image bytes"
+    blob_id = image_id(data)
+
+    assert blob_id == hashlib.sha256(data).hexdigest()
+    assert store.get(blob_id) is None
+    assert store.put(blob_id, data) is True
+    assert store.put(blob_id, data) is False
+    assert store.get(blob_id) == data
+
+
+def test_store_images_returns_ids_and_dedupes(local_store):
+    logo = b"logo"
+    chart = b"chart"
+
+    first = ImageStore.store_images([BytesIO(logo), BytesIO(chart), BytesIO(logo)])
+    second = ImageStore.store_images([BytesIO(chart)])
+
+    assert first == [image_id(logo), image_id(chart)]
+    assert second == [image_id(chart)]
+    assert ImageStore.load_image(image_id(logo)) == logo
+
+
+def test_store_images_skips_thumbnails_of_stored_images(local_store):
+    ImageStore.store_images([BytesIO(b"logo")])
+
+    with patch("database_operations.image_store.make_thumbnail") as mock_thumbnail:
+        assert ImageStore.store_images([BytesIO(b"logo")]) == [image_id(b"logo")]
+
+    mock_thumbnail.assert_not_called()
+
+
+def test_store_images_raises_when_the_store_fails(local_store):
+    with patch.object(local_store, "put", side_effect=OSError("No space left")):
+        with pytest.raises(OSError):
+            ImageStore.store_images([BytesIO(b"logo")])
+
+
+def test_load_image_rejects_invalid_ids(local_store):
+    assert ImageStore.load_image("../../etc/passwd") is None
+    assert ImageStore.load_image("0" * 64) is None
+
+
+def png_bytes(size):
+    stream = BytesIO()
+    Image.new("RGB", size, color="red").save(stream, format="PNG")
+    return stream.getvalue()
+
+
+def test_store_images_generates_thumbnails(local_store):
+    data = png_bytes((1200, 600))
+
+    (blob_id,) = ImageStore.store_images([BytesIO(data)])
+    thumbnail = ImageStore.load_thumbnail(blob_id)
+
+    with Image.open(BytesIO(thumbnail)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (256, 128)
+    assert ImageStore.load_image(blob_id) == data
+
+
+def test_missing_thumbnail_is_created_on_first_request(local_store):
+    data = png_bytes((400, 400))
+    blob_id = image_id(data)
+    local_store.put(blob_id, data)
+
+    assert local_store.get(blob_id, "thumbnail") is None
+    thumbnail = ImageStore.load_thumbnail(blob_id)
+    assert local_store.get(blob_id, "thumbnail") == thumbnail
+
+
+def test_original_of_downscaled_image_is_kept(local_store):
+    rendition = BytesIO(png_bytes((100, 100)))
+    rendition.original = png_bytes((1000, 1000))
+    plain = BytesIO(png_bytes((50, 50)))
+
+    rendition_id, plain_id = ImageStore.store_images([rendition, plain])
+
+    assert ImageStore.load_original(rendition_id) == rendition.original
+    assert ImageStore.load_original(plain_id) is None
+
+
+def test_report_image_ids_skips_legacy_base64_images():
+    stored_id = image_id(b"stored image")
+    legacy = base64.b64encode(b"\x89PNG legacy image data" * 10).decode()
+
+    # Reports indexed before the image store held base64 image data in the same field
+    assert report_image_ids([legacy, stored_id]) == [stored_id]
+    assert report_image_ids(json.dumps([legacy])) == []
+    assert report_image_ids(json.dumps([stored_id])) == [stored_id]
+    assert report_image_ids(legacy) == []
+    assert report_image_ids(None) == []
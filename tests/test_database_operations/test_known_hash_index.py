@@ -0,0 +1,72 @@
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from database_operations.elasticsearch_operations import ElasticsearchDatabase
+from database_operations.known_hash_index import KnownHashIndex
+
+
+def sha(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def test_load_and_contains():
+    index = KnownHashIndex()
+    stored = [sha(f"report {i}") for i in range(5000)]
+
+    assert not index.warmed
+    assert index.load(stored + stored[:10]) == 5000
+    assert index.warmed
+
+    assert all(hash_value in index for hash_value in stored)
+    assert not any(sha(f"new {i}") in index for i in range(5000))
+
+
+def test_add_keeps_index_current_and_grows_filter():
+    index = KnownHashIndex(expected_entries=0)
+    index.load([])
+    initial_bits = index.num_bits
+
+    added = [sha(f"saved {i}") for i in range(3000)]
+    for hash_value in added:
+        index.add(hash_value)
+
+    assert len(index) == 3000
+    assert index.num_bits > initial_bits
+    assert all(hash_value in index for hash_value in added)
+
+
+def test_non_hex_identifiers():
+    index = KnownHashIndex()
+    index.load(["legacy-id"])
+
+    assert "legacy-id" in index
+    assert "other-id" not in index
+
+
+def test_reload_drops_deleted_hashes_but_keeps_concurrent_saves():
+    index = KnownHashIndex()
+    deleted, kept, saved = sha("deleted"), sha("kept"), sha("saved")
+    index.load([deleted, kept])
+
+    def storage():
+        # A save completes while storage is being read
+        index.add(saved)
+        yield kept
+
+    assert index.load(storage()) == 2
+    assert deleted not in index
+    assert kept in index and saved in index
+
+
+def test_unreachable_elasticsearch_does_not_warm_an_empty_index():
+    index = KnownHashIndex()
+
+    with patch.object(
+        ElasticsearchDatabase, "get_elasticsearch_client", return_value=None
+    ):
+        with pytest.raises(ConnectionError):
+            index.load(ElasticsearchDatabase.iter_hashes())
+
+    assert not index.warmed
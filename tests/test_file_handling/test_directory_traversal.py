@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from file_handling.directory_traversal import (scan_directory,
+                                               traverse_directory)
+
+
+@pytest.fixture
+def report_tree(tmp_path):
+    expected = []
+    for depth in range(3):
+        directory = tmp_path.joinpath(*[f"level_{i}" for i in range(depth)])
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ("report.docx", "sheet.XLSX", "deck.pptx", "scan.pdf"):
+            file_path = directory / name
+            file_path.write_bytes(b"data")
+            expected.append(str(file_path))
+        (directory / "notes.txt").write_text("ignored")
+        (directory / "README").write_text("ignored")
+    return tmp_path, expected
+
+
+def test_scan_directory_yields_matching_files(report_tree):
+    root, expected = report_tree
+
+    records = list(scan_directory(str(root), max_workers=3))
+
+    assert sorted(path for _, path, _ in records) == sorted(expected)
+    for ext, path, file_stat in records:
+        assert ext == path.rsplit(".", 1)[-1].lower()
+        assert file_stat.st_size == os.stat(path).st_size
+
+
+def test_scan_directory_missing_directory(tmp_path):
+    assert list(scan_directory(str(tmp_path / "missing"))) == []
+
+
+def test_scan_directory_stops_early(report_tree):
+    root, _ = report_tree
+
+    scanner = scan_directory(str(root), max_workers=2, max_pending=1)
+    first = next(scanner)
+    scanner.close()
+
+    assert first[0] in ("docx", "xlsx", "pptx", "pdf")
+
+
+def test_traverse_directory_groups_by_extension(report_tree):
+    root, _ = report_tree
+
+    file_dict = traverse_directory(str(root))
+
+    assert {k: len(v) for k, v in file_dict.items()} == {
+        "docx": 3,
+        "xlsx": 3,
+        "pptx": 3,
+        "pdf": 3,
+    }
@@ -1,3 +1,4 @@
+import hashlib
 import os
 
 import fitz  # PyMuPDF
@@ -7,8 +8,9 @@ from docx import Document
 from openpyxl import Workbook
 from pptx import Presentation
 
-from file_handling import (read_excel_file, read_pdf_file, read_pptx_file,
-                           read_word_file)
+from file_handling import (hash_file, read_excel_file, read_file_bytes,
+                           read_pdf_file, read_pptx_file, read_word_file)
+from file_handling.file_io import iter_excel_text
 
 
 @pytest.fixture(scope="module")
@@ -118,3 +120,67 @@ def test_read_files_empty(setup_files, file_key, read_function):
 def test_read_files_corrupted(setup_files, file_key, read_function):
     with pytest.raises(Exception):
         read_function(setup_files[file_key])
+
+
+@pytest.mark.parametrize(
+    "file_key,read_function",
+    [
+        ("valid_word_file", read_word_file),
+        ("valid_excel_file", read_excel_file),
+        ("valid_pptx_file", read_pptx_file),
+        ("valid_pdf_file", read_pdf_file),
+    ],
+)
+def test_read_files_from_bytes(setup_files, file_key, read_function):
+    file_bytes, file_hash = read_file_bytes(setup_files[file_key])
+
+    assert file_hash == hashlib.sha256(file_bytes).hexdigest()
+    assert read_function(file_bytes) == read_function(setup_files[file_key])
+
+
+def test_hash_file_streams_in_chunks(tmp_path):
+    path = tmp_path / "large.bin"
+    contents = os.urandom(2500)
+    path.write_bytes(contents)
+
+    assert hash_file(str(path), chunk_size=1024) == hashlib.sha256(contents).hexdigest()
+    assert hash_file(str(path)) == read_file_bytes(str(path))[1]
+
+
+@pytest.mark.parametrize("engine", ["pymupdf", "pdfplumber"])
+def test_read_pdf_file_engines_skip_repeated_pages(tmp_path, engine):
+    pdf_path = str(tmp_path / "repeated.pdf")
+    pdf_document = fitz.open()
+    for text in ("Repeated page", "Repeated page", "Final page"):
+        page = pdf_document.new_page()
+        page.insert_text((100, 100), text)
+    pdf_document.save(pdf_path)
+
+    text = read_pdf_file(pdf_path, engine=engine)
+
+    assert text.count("Repeated page") == 1
+    assert "Final page" in text
+
+
+def test_read_pdf_file_unknown_engine(setup_files):
+    with pytest.raises(ValueError):
+        read_pdf_file(setup_files["valid_pdf_file"], engine="ocr")
+
+
+def test_read_excel_file_reads_every_sheet(tmp_path):
+    excel_path = str(tmp_path / "workbook.xlsx")
+    wb = Workbook()
+    wb.active.title = "Summary"
+    wb.active["A1"] = "First sheet"
+    details = wb.create_sheet("Details")
+    for row in range(1, 6):
+        details.append([f"cell {row}", row])
+    wb.save(excel_path)
+
+    sheets = list(iter_excel_text(excel_path, max_cells_per_sheet=4))
+
+    assert [title for title, _ in sheets] == ["Summary", "Details"]
+    assert sheets[1][1] == "cell 1 1 cell 2 2"
+    assert read_excel_file(excel_path) == (
+        "First sheet\n\ncell 1 1 cell 2 2 cell 3 3 cell 4 4 cell 5 5"
+    )
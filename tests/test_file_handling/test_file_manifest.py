@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from file_handling import FileManifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = FileManifest(str(tmp_path / "manifest" / "file_manifest.db"))
+    yield manifest
+    manifest.close()
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    file_path = tmp_path / "report.docx"
+    file_path.write_bytes(b"original contents")
+    return str(file_path)
+
+
+def test_unknown_file_is_not_unchanged(manifest, sample_file):
+    assert manifest.lookup(sample_file) is None
+    assert not manifest.is_unchanged(sample_file, os.stat(sample_file))
+
+
+def test_recorded_file_is_unchanged(manifest, sample_file):
+    file_stat = os.stat(sample_file)
+    manifest.record(sample_file, file_stat, "abc123", FileManifest.STATUS_INDEXED)
+
+    assert manifest.is_unchanged(sample_file, os.stat(sample_file))
+    assert manifest.lookup(sample_file)["file_hash"] == "abc123"
+
+
+def test_modified_file_is_changed(manifest, sample_file):
+    manifest.record(
+        sample_file, os.stat(sample_file), "abc123", FileManifest.STATUS_INDEXED
+    )
+
+    with open(sample_file, "wb") as f:
+        f.write(b"new and longer contents")
+
+    assert not manifest.is_unchanged(sample_file, os.stat(sample_file))
+
+
+def test_failed_file_is_retried(manifest, sample_file):
+    manifest.record(
+        sample_file, os.stat(sample_file), "abc123", FileManifest.STATUS_FAILED
+    )
+
+    assert not manifest.is_unchanged(sample_file, os.stat(sample_file))
+
+
+def test_file_missing_from_storage_is_reprocessed(manifest, sample_file):
+    manifest.record(
+        sample_file, os.stat(sample_file), "abc123", FileManifest.STATUS_INDEXED
+    )
+
+    assert manifest.is_unchanged(
+        sample_file, os.stat(sample_file), {"abc123"}.__contains__
+    )
+    assert not manifest.is_unchanged(
+        sample_file, os.stat(sample_file), set().__contains__
+    )
+
+
+def test_manifest_persists_between_runs(tmp_path, sample_file):
+    manifest_path = str(tmp_path / "file_manifest.db")
+    manifest = FileManifest(manifest_path)
+    manifest.record(
+        sample_file, os.stat(sample_file), "abc123", FileManifest.STATUS_DUPLICATE
+    )
+    manifest.close()
+
+    reopened = FileManifest(manifest_path)
+    assert reopened.is_unchanged(sample_file, os.stat(sample_file))
+    reopened.close()
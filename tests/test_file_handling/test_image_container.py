@@ -0,0 +1,67 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from file_handling.image_container import (
+    ImageContainerError,
+    iter_image_container,
+    read_image_container,
+    write_image_container,
+)
+
+
+def png_bytes(size):
+    stream = BytesIO()
+    Image.new("RGB", size, color="red").save(stream, format="PNG")
+    return stream.getvalue()
+
+
+def test_round_trip_with_record_headers():
+    png = png_bytes((40, 20))
+    stream = BytesIO()
+
+    written = write_image_container(stream, [BytesIO(png), b"not an image"])
+    assert written == len(stream.getvalue())
+
+    stream.seek(0)
+    first, second = read_image_container(stream)
+
+    assert (first.format, first.width, first.height, first.data) == (
+        "PNG",
+        40,
+        20,
+        png,
+    )
+    assert (second.format, second.width, second.height, second.data) == (
+        "",
+        0,
+        0,
+        b"not an image",
+    )
+
+
+def test_overhead_is_small_and_fixed():
+    images = [png_bytes((40, 20)), png_bytes((10, 10))]
+    stream = BytesIO()
+
+    write_image_container(stream, images)
+
+    # 9-byte container header plus 56 bytes per image
+    assert len(stream.getvalue()) == 9 + 56 * 2 + sum(len(image) for image in images)
+
+
+def test_rejects_corrupt_and_truncated_containers():
+    stream = BytesIO()
+    write_image_container(stream, [png_bytes((40, 20))])
+    data = bytearray(stream.getvalue())
+
+    with pytest.raises(ImageContainerError):
+        list(iter_image_container(BytesIO(bytes(data[:-5]))))
+
+    data[-1] ^= 0xFF
+    with pytest.raises(ImageContainerError):
+        list(iter_image_container(BytesIO(bytes(data))))
+
+    with pytest.raises(ImageContainerError):
+        list(iter_image_container(BytesIO(b"PK\x03\x04" + bytes(data[4:]))))
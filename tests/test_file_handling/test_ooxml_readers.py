@@ -0,0 +1,80 @@
+from io import BytesIO
+from zipfile import ZipFile
+
+import pytest
+from docx import Document
+from pptx import Presentation
+from pptx.util import Inches
+
+from file_handling import read_pptx_file, read_word_file
+from file_handling.file_io import presentation_text, word_document_text
+from file_handling.ooxml_readers import docx_package_text, pptx_package_text
+
+
+@pytest.fixture
+def word_bytes():
+    doc = Document()
+    doc.add_paragraph("First paragraph.")
+    paragraph = doc.add_paragraph("Second ")
+    paragraph.add_run("paragraph").bold = True
+    doc.add_paragraph("")
+    doc.add_paragraph("Third\tparagraph.")
+    stream = BytesIO()
+    doc.save(stream)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def pptx_bytes():
+    prs = Presentation()
+    for number in range(1, 4):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {number} title"
+    stream = BytesIO()
+    prs.save(stream)
+    return stream.getvalue()
+
+
+def test_docx_text_matches_python_docx(word_bytes):
+    with ZipFile(BytesIO(word_bytes)) as zip_ref:
+        streamed = docx_package_text(zip_ref)
+
+    assert streamed == word_document_text(Document(BytesIO(word_bytes)))
+
+
+def test_docx_text_includes_tables_headers_and_footers():
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "SECRET//NOFORN"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer"
+    doc.add_paragraph("Body text")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Grid 38SMB"
+    table.cell(0, 1).text = "Kabul"
+    stream = BytesIO()
+    doc.save(stream)
+
+    text = read_word_file(stream.getvalue())
+
+    assert text.index("SECRET//NOFORN") < text.index("Body text")
+    assert text.index("Body text") < text.index("Page footer")
+    assert "Grid 38SMB" in text and "Kabul" in text
+
+
+def test_pptx_text_matches_python_pptx(pptx_bytes):
+    with ZipFile(BytesIO(pptx_bytes)) as zip_ref:
+        streamed = pptx_package_text(zip_ref)
+
+    assert streamed == presentation_text(Presentation(BytesIO(pptx_bytes)))
+
+
+def test_pptx_text_includes_tables_and_notes():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Title"
+    table = slide.shapes.add_table(1, 1, Inches(1), Inches(2), Inches(4), Inches(1))
+    table.table.cell(0, 0).text = "Table cell"
+    slide.notes_slide.notes_text_frame.text = "Speaker notes"
+    stream = BytesIO()
+    prs.save(stream)
+
+    assert read_pptx_file(stream.getvalue()) == "Title Table cell Speaker notes"
@@ -0,0 +1,153 @@
+import hashlib
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from database_operations.known_hash_index import KnownHashIndex
+from file_handling import FileManifest
+from update_functionality import run_update_process
+from update_functionality.run_update_process import (acquire_pipeline,
+                                                     process_discovered_batch,
+                                                     release_pipeline)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = FileManifest(str(tmp_path / "file_manifest.db"))
+    yield manifest
+    manifest.close()
+
+
+def make_record(path, content):
+    path.write_bytes(content)
+    return (path.suffix[1:], str(path), os.stat(path))
+
+
+@patch("update_functionality.run_update_process.HashChecker")
+def test_process_discovered_batch_checks_hashes_once(
+    mock_hash_checker, manifest, tmp_path
+):
+    stored = make_record(tmp_path / "stored.pdf", b"stored")
+    new = make_record(tmp_path / "new.pdf", b"new")
+    copy = make_record(tmp_path / "copy.pdf", b"new")
+    unchanged = make_record(tmp_path / "unchanged.pdf", b"unchanged")
+    manifest.record(unchanged[1], unchanged[2], "abc123", FileManifest.STATUS_INDEXED)
+    mock_hash_checker.known_hashes = KnownHashIndex()
+    mock_hash_checker.check_hashes_exist.return_value = {
+        hashlib.sha256(b"stored").hexdigest()
+    }
+    processing_manager = MagicMock()
+    processing_manager.process_file.return_value = FileManifest.STATUS_INDEXED
+    progress = []
+
+    with patch.object(
+        run_update_process,
+        "read_file_bytes",
+        wraps=run_update_process.read_file_bytes,
+    ) as mock_read:
+        statuses = process_discovered_batch(
+            processing_manager,
+            manifest,
+            [stored, new, copy, unchanged],
+            on_progress=progress.append,
+        )
+
+    mock_hash_checker.check_hashes_exist.assert_called_once()
+    # Only the file actually processed is read into memory
+    mock_read.assert_called_once_with(new[1])
+    processing_manager.process_file.assert_called_once_with(
+        new[1], b"new", hashlib.sha256(b"new").hexdigest()
+    )
+    assert statuses == {
+        stored[1]: FileManifest.STATUS_DUPLICATE,
+        new[1]: FileManifest.STATUS_INDEXED,
+        copy[1]: FileManifest.STATUS_DUPLICATE,
+        unchanged[1]: None,
+    }
+    assert sorted(progress) == sorted(statuses)
+    assert manifest.lookup(copy[1])["status"] == FileManifest.STATUS_DUPLICATE
+
+
+@patch("update_functionality.run_update_process.HashChecker")
+def test_settled_file_missing_from_storage_is_reprocessed(
+    mock_hash_checker, manifest, tmp_path
+):
+    report = make_record(tmp_path / "report.pdf", b"report")
+    report_hash = hashlib.sha256(b"report").hexdigest()
+    manifest.record(report[1], report[2], report_hash, FileManifest.STATUS_INDEXED)
+    # The index was recreated, so the warm known-hash index no longer holds the report
+    mock_hash_checker.known_hashes = KnownHashIndex()
+    mock_hash_checker.known_hashes.load([])
+    mock_hash_checker.check_hashes_exist.return_value = set()
+    processing_manager = MagicMock()
+    processing_manager.process_file.return_value = FileManifest.STATUS_INDEXED
+
+    statuses = process_discovered_batch(processing_manager, manifest, [report])
+
+    processing_manager.process_file.assert_called_once_with(
+        report[1], b"report", report_hash
+    )
+    assert statuses == {report[1]: FileManifest.STATUS_INDEXED}
+
+
+@patch.object(run_update_process, "shutdown_ner_batcher")
+@patch.object(run_update_process, "shutdown_image_encoding_pool")
+@patch.object(run_update_process, "shutdown_sandboxes")
+def test_pipeline_is_shut_down_by_its_last_user(
+    mock_sandboxes, mock_image_pool, mock_ner_batcher, tmp_path
+):
+    with patch.object(
+        run_update_process.AppConfig,
+        "manifest_path",
+        str(tmp_path / "file_manifest.db"),
+    ):
+        watcher_manifest = acquire_pipeline()
+        run_manifest = acquire_pipeline()
+        assert run_manifest is watcher_manifest
+
+        record = make_record(tmp_path / "report.pdf", b"report")
+        run_manifest.record(record[1], record[2], "abc123", FileManifest.STATUS_INDEXED)
+        release_pipeline()
+
+        # The watcher still holds the pools, and sees the run's committed writes
+        mock_ner_batcher.assert_not_called()
+        assert watcher_manifest.is_unchanged(record[1], record[2])
+
+        release_pipeline()
+        mock_sandboxes.assert_called_once()
+        mock_image_pool.assert_called_once()
+        mock_ner_batcher.assert_called_once()
+        assert acquire_pipeline() is not watcher_manifest
+        release_pipeline()
+
+
+@patch.object(run_update_process, "release_pipeline")
+@patch.object(run_update_process, "acquire_pipeline")
+@patch.object(run_update_process, "DataProcessingManager")
+@patch.object(run_update_process, "on_demand_initialization")
+@patch.object(run_update_process, "calculate_dynamic_batch_size", return_value=1)
+@patch.object(run_update_process, "scan_directory")
+@patch.object(run_update_process, "load_update_settings")
+def test_run_process_releases_pipeline_when_processing_fails(
+    mock_settings,
+    mock_scan,
+    mock_batch_size,
+    mock_init,
+    mock_manager,
+    mock_acquire,
+    mock_release,
+    tmp_path,
+):
+    mock_settings.return_value = (str(tmp_path), {"keywords": []})
+    mock_scan.return_value = [make_record(tmp_path / "report.pdf", b"report")]
+
+    with patch.object(
+        run_update_process,
+        "process_discovered_batch",
+        side_effect=RuntimeError("closed batcher"),
+    ):
+        run_update_process.run_process()
+
+    mock_acquire.assert_called_once()
+    mock_release.assert_called_once()
@@ -0,0 +1,104 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from file_handling import FileManifest
+from update_functionality import watch_mode
+from update_functionality.watch_mode import WatchModeIngestor
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    manifest = FileManifest(str(tmp_path / "file_manifest.db"))
+    ingestor = WatchModeIngestor(
+        str(tmp_path),
+        MagicMock(),
+        manifest,
+        debounce_seconds=2.0,
+        use_native_events=False,
+    )
+    yield ingestor
+    manifest.close()
+
+
+def test_notify_ignores_unsupported_files(ingestor, tmp_path):
+    ingestor.notify(str(tmp_path / "notes.txt"))
+    ingestor.notify(str(tmp_path / "README"))
+
+    assert ingestor.pending == {}
+
+
+def test_take_ready_debounces_events(ingestor, tmp_path):
+    report = str(tmp_path / "report.docx")
+    with patch("update_functionality.watch_mode.time.monotonic", return_value=100.0):
+        ingestor.notify(report)
+    with patch("update_functionality.watch_mode.time.monotonic", return_value=101.0):
+        ingestor.notify(report)
+
+    # The second event restarted the debounce window
+    assert ingestor.take_ready(now=102.5) == []
+    assert ingestor.take_ready(now=103.0) == [report]
+    assert ingestor.pending == {}
+
+
+def test_rescan_queues_only_changed_files(ingestor, tmp_path):
+    unchanged = tmp_path / "unchanged.pdf"
+    changed = tmp_path / "changed.pdf"
+    unchanged.write_bytes(b"old")
+    changed.write_bytes(b"new")
+    ingestor.manifest.record(
+        str(unchanged), os.stat(unchanged), "abc123", FileManifest.STATUS_INDEXED
+    )
+
+    ingestor.rescan()
+
+    assert list(ingestor.pending) == [str(changed)]
+    assert ingestor.stats["rescans"] == 1
+
+
+def test_falls_back_to_rescans_when_events_cannot_start(tmp_path):
+    manifest = FileManifest(str(tmp_path / "file_manifest.db"))
+    observer = MagicMock()
+    observer.return_value.start.side_effect = OSError("inotify watch limit reached")
+    with patch.object(watch_mode, "watchdog_available", True), patch.object(
+        watch_mode, "Observer", observer
+    ):
+        ingestor = WatchModeIngestor(
+            str(tmp_path), MagicMock(), manifest, use_native_events=True
+        )
+        ingestor.start()
+    try:
+        assert ingestor.running
+        assert not ingestor.use_native_events
+        assert ingestor.observer is None
+    finally:
+        ingestor.stop()
+        manifest.close()
+
+
+@patch.object(watch_mode, "release_pipeline")
+@patch.object(watch_mode, "acquire_pipeline")
+@patch.object(watch_mode, "DataProcessingManager")
+@patch.object(watch_mode, "ConfigManager")
+@patch.object(watch_mode, "on_demand_initialization")
+@patch.object(watch_mode, "load_update_settings")
+def test_start_watch_mode_releases_pipeline_on_failure(
+    mock_settings,
+    mock_init,
+    mock_config_manager,
+    mock_manager,
+    mock_acquire,
+    mock_release,
+    tmp_path,
+):
+    mock_settings.return_value = (str(tmp_path), {"keywords": []})
+    mock_config_manager.get_config.return_value = {}
+
+    with patch.object(
+        watch_mode.WatchModeIngestor, "start", side_effect=RuntimeError("failed")
+    ):
+        assert watch_mode.start_watch_mode() is None
+
+    mock_acquire.assert_called_once()
+    mock_release.assert_called_once()
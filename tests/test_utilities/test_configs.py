@@ -3,8 +3,9 @@ import logging
 from unittest import mock
 
 import pytest
+import spacy
 
-from utilities.configurations.configs import AppConfig
+from utilities.configurations.configs import AppConfig, load_nlp_model
 
 
 @pytest.fixture
@@ -93,3 +94,40 @@ def test_validate_configurations_missing_key(caplog):
         "Logging configuration is missing in the configuration data." in message
         for message in caplog.messages
     )
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("tok2vec")
+    nlp.add_pipe("attribute_ruler")
+    ruler = nlp.add_pipe("entity_ruler")
+    nlp.initialize()
+    ruler.add_patterns([{"label": "GPE", "pattern": "Kabul"}])
+    path = tmp_path_factory.mktemp("nlp") / "model"
+    nlp.to_disk(path)
+    return str(path)
+
+
+def test_load_nlp_model_full_profile(model_path):
+    nlp = load_nlp_model(model_path, "full")
+
+    assert nlp.pipe_names == ["tok2vec", "attribute_ruler", "entity_ruler"]
+
+
+def test_load_nlp_model_ner_profile_excludes_unused_components(model_path):
+    nlp = load_nlp_model(model_path, "ner")
+
+    # Nothing is left listening to the shared tok2vec, so it is dropped too
+    assert nlp.pipe_names == ["entity_ruler"]
+    assert [(ent.text, ent.label_) for ent in nlp("Flights to Kabul").ents] == [
+        ("Kabul", "GPE")
+    ]
+
+
+def test_load_nlp_model_extra_exclusions_and_unknown_profile(model_path):
+    nlp = load_nlp_model(model_path, "full", exclude=["attribute_ruler"])
+    assert nlp.pipe_names == ["entity_ruler"]
+
+    with pytest.raises(ValueError):
+        load_nlp_model(model_path, "fastest")
@@ -1,4 +1,3 @@
-import base64
 import json
 import logging
 from unittest import mock
@@ -23,7 +22,7 @@ info = {
     "MGRS": ["MGRS1", "MGRS2"],
     "full_text": "This is the full text of the document.",
 }
-images = b"test_image_data"
+images = ["a" * 64, "b" * 64]
 file_hash = "abc123"
 
 
@@ -70,7 +69,7 @@ def test_prepare_data(caplog):
             assert result["topics"] == "Filtered_Topic1|Filtered_Topic2"
             assert result["keywords"] == "Keyword1,Keyword2"
             assert result["MGRS"] == json.dumps(["MGRS1", "MGRS2"])
-            assert result["images"] == base64.b64encode(images).decode("utf-8")
+            assert result["images"] == json.dumps(images)
             assert result["full_text"] == "This is the full text of the document."
 
             # Verify log messages
@@ -0,0 +1,59 @@
+import pytest
+
+from utilities.image_responses import image_response, parse_byte_range
+
+DATA = bytes(range(100))
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=95-500", (95, 99)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 100) == expected
+
+
+def test_parse_byte_range_rejects_unsatisfiable_ranges():
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=100-", 100)
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=10-5", 100)
+
+
+def test_image_response_full_and_cached():
+    response = image_response({}, DATA, "abc", "image/webp")
+
+    assert response.status_code == 200
+    assert response.body == DATA
+    assert response.headers["etag"] == '"abc"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+    cached = image_response({"if-none-match": '"abc"'}, DATA, "abc", "image/webp")
+    assert cached.status_code == 304
+    assert cached.body == b""
+
+
+def test_image_response_ranges():
+    partial = image_response({"range": "bytes=10-19"}, DATA, "abc", "image/webp")
+    assert partial.status_code == 206
+    assert partial.body == DATA[10:20]
+    assert partial.headers["content-range"] == "bytes 10-19/100"
+
+    unsatisfiable = image_response({"range": "bytes=200-"}, DATA, "abc", "image/webp")
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */100"
+
+    # A stale If-Range gets the whole image
+    stale = image_response(
+        {"range": "bytes=10-19", "if-range": '"old"'}, DATA, "abc", "image/webp"
+    )
+    assert stale.status_code == 200
+    assert stale.body == DATA
@@ -46,3 +46,18 @@ def test_load_latest_keywords(mock_filesystem):
             # Assert that the latest keywords are loaded correctly
             assert result == ["keyword3", "keyword4"]
             assert Keywords.keywords_list == ["keyword3", "keyword4"]
+
+
+def test_load_latest_keywords_compiles_matcher(mock_filesystem):
+    keyword_dir, file_1, file_2 = mock_filesystem
+
+    with mock.patch("os.listdir", return_value=[file_2.name]):
+        Keywords.load_latest_keywords()
+
+    matcher = Keywords.get_matcher()
+    assert matcher.keywords == ["keyword3", "keyword4"]
+    assert matcher.counts("Keyword3, keyword3 and keyword5") == {"keyword3": 2}
+    # The compiled matcher is reused until the keywords change
+    assert Keywords.get_matcher() is matcher
+    Keywords.keywords_list = ["keyword5"]
+    assert Keywords.get_matcher().counts("keyword5") == {"keyword5": 1}
@@ -0,0 +1,41 @@
+from utilities.keyword_matching import KeywordMatcher, keyword_tokens
+
+
+def test_keyword_tokens():
+    assert keyword_tokens("Non-governmental  Organization") == (
+        "non",
+        "governmental",
+        "organization",
+    )
+    assert keyword_tokens("--") == ()
+
+
+def test_find_matches_whole_words_only():
+    matcher = KeywordMatcher(["IO", "Assess", "NGO"])
+    text = "A violation was assessed. Assess the NGO, then the ngo again."
+
+    matches = matcher.find(text)
+
+    assert "IO" not in matches
+    assert matches["Assess"] == [(26, 32)]
+    assert matches["NGO"] == [(37, 40), (51, 54)]
+
+
+def test_find_reports_overlapping_and_multi_word_keywords():
+    matcher = KeywordMatcher(
+        ["Civil Society", "Civil Society organization", "society organizations"]
+    )
+    text = "Civil society organizations met.\nCIVIL SOCIETY, ORGANIZATION"
+
+    assert matcher.find(text) == {
+        "Civil Society": [(0, 13), (33, 46)],
+        "society organizations": [(6, 27)],
+        "Civil Society organization": [(33, 60)],
+    }
+
+
+def test_counts_repeated_matches_through_failure_links():
+    matcher = KeywordMatcher(["a b a", "b a c", ""])
+
+    assert matcher.counts("a b a b a c") == {"a b a": 2, "b a c": 1}
+    assert matcher.counts("") == {}
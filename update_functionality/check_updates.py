@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import sys
@@ -21,6 +22,7 @@ setup_logging(log_filename=logfile, log_directory="../../logs")
 logger = logging.getLogger(__name__)
 
 from update_functionality import run_update_process  # isort: skip
+from update_functionality import watch_mode  # isort: skip
 
 app = FastAPI()
 
@@ -33,6 +35,8 @@ app.add_middleware(
 )
 
 initialized = False
+watcher = None
+watcher_lock = threading.Lock()
 
 
 @app.get("/api/status")
@@ -74,6 +78,71 @@ async def check_for_updates():
     return JSONResponse(status_code=200, content={"message": "Processing started"})
 
 
+def start_watcher():
+    """
+    Start watch mode unless it is already running.
+
+    Blocks while the update pipeline is initialized, so the endpoint runs it off the event
+    loop.
+
+    Returns:
+    tuple: The watcher (None if it could not be started) and whether it was started now.
+    """
+    global watcher
+    with watcher_lock:
+        if watcher is not None and watcher.running:
+            return watcher, False
+        watcher = watch_mode.start_watch_mode()
+        return watcher, True
+
+
+def stop_watcher():
+    """
+    Stop watch mode if it is running, waiting for in-flight files to finish.
+
+    Returns:
+    dict: The status of the watcher once stopped.
+    """
+    with watcher_lock:
+        if watcher is None or not watcher.running:
+            return {"running": False}
+        watcher.stop()
+    logger.info("WATCH MODE STOPPED")
+    return watcher.status()
+
+
+@app.post("/api/watch/start")
+async def start_watch():
+    """
+    RESTful endpoint to start continuously ingesting new and changed files.
+    """
+    current, started = await asyncio.to_thread(start_watcher)
+    if current is None:
+        raise HTTPException(status_code=500, detail="Unable to start watch mode")
+    if started:
+        logger.info("WATCH MODE STARTED")
+    return JSONResponse(status_code=200, content=current.status())
+
+
+@app.post("/api/watch/stop")
+async def stop_watch():
+    """
+    RESTful endpoint to stop watch mode.
+    """
+    status = await asyncio.to_thread(stop_watcher)
+    return JSONResponse(status_code=200, content=status)
+
+
+@app.get("/api/watch/status")
+async def watch_status():
+    """
+    RESTful endpoint to get the current state of watch mode.
+    """
+    if watcher is None:
+        return JSONResponse(status_code=200, content={"running": False})
+    return JSONResponse(status_code=200, content=watcher.status())
+
+
 @app.exception_handler(Exception)
 async def handle_exception(request, exc):
     """
@@ -1,18 +1,23 @@
-import datetime
 import json
 import logging
 import os
 import queue
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from data_extraction.extraction_sandbox import shutdown_sandboxes
+from data_extraction.image_encoding_pool import shutdown_image_encoding_pool
 from data_processing import DataProcessingManager
+from data_processing.ner_batcher import shutdown_ner_batcher
 from database_operations import DatabaseManager
-from database_operations.elasticsearch_operations import ElasticsearchDatabase
-from file_handling.extract_files import extract_files_from_directory
+from database_operations.hash_checker import HashChecker
+from file_handling.directory_traversal import scan_directory
+from file_handling.file_io import hash_file, read_file_bytes
+from file_handling.file_manifest import FileManifest
 from initialization.init_app import AppInitialization
 from utilities import DatabaseConfig
 from utilities.configurations.configs import AppConfig
@@ -31,6 +36,52 @@ progress_lock = (
 )  # Ensure that updates to progress_state are thread-safe.
 
 
+# The update run and watch mode share the processing pools and the file manifest; the last
+# of them to finish shuts the pools down and closes the manifest
+_pipeline_users = 0
+_pipeline_manifest = None
+_pipeline_lock = threading.Lock()
+
+
+def acquire_pipeline():
+    """
+    Register a user of the shared processing pools and file manifest.
+
+    Every call must be matched by a call to release_pipeline().
+
+    Returns:
+    FileManifest: The manifest shared by every user of the pipeline.
+    """
+    global _pipeline_users, _pipeline_manifest
+    with _pipeline_lock:
+        if _pipeline_manifest is None:
+            _pipeline_manifest = FileManifest(AppConfig.manifest_path)
+        _pipeline_users += 1
+        return _pipeline_manifest
+
+
+def release_pipeline():
+    """
+    Unregister a user of the pipeline.
+
+    Pending manifest writes are committed so they are not lost or held back from the other
+    users. Once no user remains, the manifest is closed and the sandbox, image encoding and
+    NER pools are shut down.
+    """
+    global _pipeline_users, _pipeline_manifest
+    with _pipeline_lock:
+        _pipeline_users -= 1
+        if _pipeline_users:
+            _pipeline_manifest.commit()
+            return
+        manifest, _pipeline_manifest = _pipeline_manifest, None
+        # Shut down while holding the lock, so a new user waits for fresh pools
+        manifest.close()
+        shutdown_sandboxes()
+        shutdown_image_encoding_pool()
+        shutdown_ner_batcher()
+
+
 # Function to update the progress_state safely with a lock
 def update_progress(current, total, message):
     global progress_state
@@ -85,34 +136,19 @@ def on_demand_initialization(user_config):
     except Exception as e:
         logger.error(f"Failed to load keywords during on-demand initialization: {e}")
 
+    # Step 6: Rewarm the known-hash index so skip decisions are made in memory, without
+    # counting reports deleted from storage since it was last loaded
+    if not HashChecker.warm_known_hashes(force=True):
+        logger.warning("Known-hash index unavailable; hash checks will query storage.")
 
-# Helper function to get the most recent file creation date
-def get_most_recent_file_creation_date(directory):
-    most_recent_date = None
-
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_creation_time = os.path.getctime(file_path)  # Get file creation time
-            file_creation_date = datetime.datetime.fromtimestamp(
-                file_creation_time, tz=datetime.timezone.utc
-            )  # Convert to UTC
-
-            if not most_recent_date or file_creation_date > most_recent_date:
-                most_recent_date = file_creation_date
-
-    return most_recent_date
 
-
-@error_handler
-def run_process():
-    """
-    Function to handle checking for updates and processing new files in batches.
+def load_update_settings():
     """
-    logger.info("********** STARTING UPDATE PROCESS ************")
-
-    start_time = time.time()
+    Fetch the processing directory and user configuration from the main API.
 
+    Returns:
+    tuple: (process_dir, user_config), either of which may be None if unavailable.
+    """
     try:
         response = requests.get("http://localhost:5005/api/settings")
         response.raise_for_status()
@@ -122,108 +158,227 @@ def run_process():
         logger.info(f"Failed to connect to run_app API: {str(e)}")
         settings = {}
 
-    process_dir = settings.get("directory", None)
-    user_config = settings.get("user_config", None)
+    return settings.get("directory", None), settings.get("user_config", None)
 
-    if not process_dir or not user_config:
-        update_progress(0, 0, "Missing configuration settings")
-        return
 
-    logger.info(f"Processing directory passed to update func: {process_dir}")
-    logger.info(f"Config passed to update func: {user_config}")
+def hash_still_stored(file_hash):
+    """
+    Check a hash recorded in the manifest against the known-hash index.
 
-    on_demand_initialization(user_config)
+    The manifest does not know which storage its entries were saved to, so this catches
+    reports lost when the index was deleted or the backend changed. Without a warm index,
+    entries are trusted from their stat alone.
+    """
+    known_hashes = HashChecker.known_hashes
+    return not known_hashes.warmed or file_hash in known_hashes
 
-    # Check if the most recent processed date is before today
-    last_processed_date = ElasticsearchDatabase.get_last_processed_date()
-    logger.info(f"LAST PROCESSED DATE: {last_processed_date}")
 
-    most_recent_file_creation_date = get_most_recent_file_creation_date(process_dir)
-    logger.info(f"MOST RECENT FILE CREATION DATE: {most_recent_file_creation_date}")
+def process_new_file(processing_manager, file_path, file_hash, existing):
+    """
+    Read a file that was not found in storage and process it.
 
-    if not most_recent_file_creation_date:
-        update_progress(0, 0, "No files found in the directory")
-        return
+    The file is read once and the same buffer is hashed and handed to the extractors. If its
+    contents changed since it was hashed, the new hash is checked for duplicates first.
 
-    if last_processed_date:
-        last_processed_date = datetime.datetime.fromisoformat(last_processed_date)
+    Returns:
+    tuple: The processing status (see FileManifest) and the hash of the contents read.
+    """
+    file_bytes, read_hash = read_file_bytes(file_path)
+    if read_hash != file_hash:
+        logger.info("File changed since it was hashed. Checking its new contents.")
+        file_hash = read_hash
+        if file_hash in existing or HashChecker.check_hashes_exist([file_hash]):
+            logger.info("File already exists. Skipping.")
+            return FileManifest.STATUS_DUPLICATE, file_hash
+    return processing_manager.process_file(file_path, file_bytes, file_hash), file_hash
 
-        # Compare the two dates
-        if last_processed_date >= most_recent_file_creation_date:
-            update_progress(
-                0,
-                0,
-                "No new updates. Last processed date is more recent than or equal to the newest file.",
-            )
-            return
 
-    if process_dir:
-        # Process files from the selected directory
-        documents = extract_files_from_directory(process_dir)
-        processing_manager = DataProcessingManager()
+def process_discovered_batch(processing_manager, manifest, batch, on_progress=None):
+    """
+    Run a batch of discovered files through the manifest check, a single batched duplicate
+    check and processing.
 
-        total_files = sum(len(files) for files in documents.values())
-        logger.info(f"TOTAL FILES: {total_files}")
+    Changed files are hashed by streaming them, and only the hashes go to the duplicate
+    check. Each new file is then read into memory just before it is processed, so at most
+    one file of the batch is held at a time.
 
-        # Dynamically calculate batch size based on available resources
-        dynamic_batch_size = calculate_dynamic_batch_size()
-        logger.info(f"DYNAMIC BATCH SIZE SET TO: {dynamic_batch_size}")
+    Parameters:
+    processing_manager (DataProcessingManager): The manager used to process new files.
+    manifest (FileManifest): The manifest recording what has already been seen.
+    batch (list): (extension, file path, os.stat_result) records from the directory scan.
+    on_progress (callable): Optional callback invoked with each file path once it is handled.
 
-        # Create a queue to manage the batches
-        file_queue = queue.Queue()
-        for ext, files in documents.items():
-            for file_path in files:
-                file_queue.put((ext, file_path))
+    Returns:
+    dict: A mapping of file path to the status recorded in the manifest, or None if unchanged.
+    """
+    statuses = {}
+    changed = deque()
+
+    for ext, file_path, file_stat in batch:
+        logger.info(f"Starting with file: {file_path}")
+        try:
+            if manifest.is_unchanged(file_path, file_stat, hash_still_stored):
+                logger.info("File unchanged since last run. Skipping.")
+                statuses[file_path] = None
+            else:
+                changed.append((file_path, file_stat, hash_file(file_path)))
+                continue
+        except Exception as e:
+            logger.error(f"Unable to read {file_path}: {e}")
+        if on_progress:
+            on_progress(file_path)
+
+    # A single round trip decides which of the changed files are already stored
+    existing = set()
+    if changed:
+        existing = set(HashChecker.check_hashes_exist(item[2] for item in changed))
+
+    while changed:
+        file_path, file_stat, file_hash = changed.popleft()
+        try:
+            if file_hash in existing:
+                logger.info("File already exists. Skipping.")
+                status = FileManifest.STATUS_DUPLICATE
+            else:
+                status, file_hash = process_new_file(
+                    processing_manager, file_path, file_hash, existing
+                )
+                if status == FileManifest.STATUS_INDEXED:
+                    # Later copies of the same file within this batch are duplicates
+                    existing.add(file_hash)
+            manifest.record(file_path, file_stat, file_hash, status)
+            statuses[file_path] = status
+        except Exception as e:
+            logger.error(f"Unable to process data: {e}")
+        if on_progress:
+            on_progress(file_path)
+
+    return statuses
+
+
+def process_discovered_file(processing_manager, manifest, ext, file_path, file_stat):
+    """
+    Run a single discovered file through the manifest check, duplicate check and processing.
 
-        # Initialize progress tracking
-        update_progress(0, total_files, "Starting the processing")
+    Returns:
+    str: The status recorded in the manifest, or None if the file was unchanged.
+    """
+    statuses = process_discovered_batch(
+        processing_manager, manifest, [(ext, file_path, file_stat)]
+    )
+    return statuses.get(file_path)
 
-        processed_count = 0
 
-        def process_batch():
-            nonlocal processed_count
-            while not file_queue.empty():
-                batch = []
-                for _ in range(dynamic_batch_size):
-                    if not file_queue.empty():
-                        batch.append(file_queue.get())
+@error_handler
+def run_process():
+    """
+    Function to handle checking for updates and processing new files in batches.
+    """
+    logger.info("********** STARTING UPDATE PROCESS ************")
+
+    start_time = time.time()
 
-                if not batch:
-                    break
+    process_dir, user_config = load_update_settings()
 
-                for ext, file_path in batch:
-                    logger.info(f"Starting with file: {file_path}")
+    if not process_dir or not user_config:
+        update_progress(0, 0, "Missing configuration settings")
+        return
+
+    logger.info(f"Processing directory passed to update func: {process_dir}")
+    logger.info(f"Config passed to update func: {user_config}")
+
+    on_demand_initialization(user_config)
+
+    if process_dir:
+        processing_manager = DataProcessingManager()
+
+        # The manifest lets unchanged files be skipped from a stat alone, without hashing
+        manifest = acquire_pipeline()
+
+        # Release the pipeline even if the run fails, so the manifest's pending writes are
+        # committed and the pools are not left running without an owner
+        try:
+            # Dynamically calculate batch size based on available resources
+            dynamic_batch_size = calculate_dynamic_batch_size()
+            logger.info(f"DYNAMIC BATCH SIZE SET TO: {dynamic_batch_size}")
+
+            # Bounded queue fed by the directory walk while processing is already underway
+            file_queue = queue.Queue(maxsize=dynamic_batch_size * 100)
+
+            # Initialize progress tracking
+            update_progress(0, 0, "Starting the processing")
+
+            counts = {"discovered": 0, "processed": 0}
+            counts_lock = threading.Lock()
+
+            def discover_files():
+                try:
+                    for record in scan_directory(process_dir):
+                        file_queue.put(record)
+                        with counts_lock:
+                            counts["discovered"] += 1
+                except Exception as e:
+                    logger.error(f"Directory discovery failed: {e}")
+                finally:
+                    logger.info(f"TOTAL FILES: {counts['discovered']}")
+                    # One sentinel per worker so each of them exits once the queue drains
+                    for _ in range(dynamic_batch_size):
+                        file_queue.put(None)
+
+            def next_batch():
+                """
+                Block for the next discovered file, then take whatever else is already queued.
+                Returns the batch and whether the end of discovery was reached.
+                """
+                batch = []
+                record = file_queue.get()
+                while record is not None:
+                    batch.append(record)
+                    if len(batch) >= dynamic_batch_size:
+                        return batch, False
                     try:
-                        file_hash = processing_manager.calculate_file_hash(file_path)
-                        document = {
-                            "file_hash": file_hash,
-                            "file_path": file_path,
-                        }
-                        if not ElasticsearchDatabase().check_exists(
-                            document["file_hash"]
-                        ):
-                            processing_manager.process_data(
-                                {ext: [file_path]}, processed_count + 1, total_files
-                            )
-                        else:
-                            logger.info("File already exists. Skipping.")
-
-                        processed_count += 1
-                        update_progress(
-                            processed_count,
-                            total_files,
-                            f"Processing file {processed_count} of {total_files}",
-                        )
-                    except Exception as e:
-                        logger.error(f"Unable to process data: {e}")
-
-        # Using ThreadPoolExecutor to process files concurrently in batches
-        with ThreadPoolExecutor(max_workers=dynamic_batch_size) as executor:
-            futures = [
-                executor.submit(process_batch) for _ in range(dynamic_batch_size)
-            ]
-            for future in futures:
-                future.result()
+                        record = file_queue.get_nowait()
+                    except queue.Empty:
+                        return batch, False
+                return batch, True
+
+            def file_done(file_path):
+                with counts_lock:
+                    counts["processed"] += 1
+                    processed, discovered = counts["processed"], counts["discovered"]
+                update_progress(
+                    processed,
+                    discovered,
+                    f"Processing file {processed} of {discovered}",
+                )
+
+            def process_batch():
+                finished = False
+                while not finished:
+                    batch, finished = next_batch()
+                    process_discovered_batch(
+                        processing_manager, manifest, batch, on_progress=file_done
+                    )
+
+            discovery_thread = threading.Thread(target=discover_files, daemon=True)
+            discovery_thread.start()
+
+            # Using ThreadPoolExecutor to process files concurrently in batches
+            with ThreadPoolExecutor(max_workers=dynamic_batch_size) as executor:
+                futures = [
+                    executor.submit(process_batch) for _ in range(dynamic_batch_size)
+                ]
+                for future in futures:
+                    future.result()
+
+            discovery_thread.join()
+        finally:
+            release_pipeline()
+
+        total_files = counts["discovered"]
+        if not total_files:
+            update_progress(0, 0, "No files found in the directory")
+            return
 
         # Optionally export results
         if len(DatabaseConfig.all_info_df) > 0:
@@ -0,0 +1,276 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_processing import DataProcessingManager
+from file_handling.directory_traversal import (SUPPORTED_EXTENSIONS,
+                                               scan_directory)
+from initialization.config_manager import ConfigManager
+from update_functionality.run_update_process import (acquire_pipeline,
+                                                     hash_still_stored,
+                                                     load_update_settings,
+                                                     on_demand_initialization,
+                                                     process_discovered_file,
+                                                     release_pipeline)
+from utilities.logging.logging_utilities import error_handler
+from utilities.resource_management import calculate_dynamic_batch_size
+
+logger = logging.getLogger(__name__)
+
+# Native filesystem events (inotify on Linux) are optional; periodic rescans always run
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    watchdog_available = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    watchdog_available = False
+
+
+class _WatchEventHandler(FileSystemEventHandler):
+    """
+    Forward create, modify and move events for files to the ingestor.
+    """
+
+    def __init__(self, ingestor):
+        super().__init__()
+        self.ingestor = ingestor
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.ingestor.notify(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.ingestor.notify(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.ingestor.notify(event.dest_path)
+
+
+class WatchModeIngestor:
+    """
+    Continuously ingest files created, modified or moved under a directory.
+
+    Filesystem events are debounced so a file is only processed once it has been quiet for
+    `debounce_seconds`. A periodic stat-only rescan against the file manifest catches changes
+    that produce no local events, such as files written to network mounts by other hosts.
+    """
+
+    def __init__(
+        self,
+        directory,
+        processing_manager,
+        manifest,
+        debounce_seconds=2.0,
+        rescan_interval_seconds=900,
+        use_native_events=True,
+        max_workers=4,
+        on_stop=None,
+    ):
+        self.directory = directory
+        self.processing_manager = processing_manager
+        self.manifest = manifest
+        self.debounce_seconds = debounce_seconds
+        self.rescan_interval_seconds = rescan_interval_seconds
+        self.use_native_events = use_native_events and watchdog_available
+        self.max_workers = max_workers
+        # Called once stopped, to release the shared pipeline
+        self.on_stop = on_stop
+
+        self.pending = {}  # Path -> monotonic time of the most recent event
+        self.pending_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.observer = None
+        self.threads = []
+        self.executor = None
+        self.running = False
+        self.stats = {"events": 0, "processed": 0, "failed": 0, "rescans": 0}
+
+    def notify(self, file_path):
+        """
+        Record an event for a file, restarting its debounce window.
+        """
+        name = os.path.basename(file_path)
+        if (
+            "." not in name
+            or name.rsplit(".", 1)[-1].lower() not in SUPPORTED_EXTENSIONS
+        ):
+            return
+        with self.pending_lock:
+            self.pending[file_path] = time.monotonic()
+            self.stats["events"] += 1
+
+    def start(self):
+        """
+        Start the event observer, the debounce loop and the periodic rescan loop.
+        """
+        self.stop_event.clear()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.running = True
+
+        if self.use_native_events:
+            try:
+                self.observer = Observer()
+                self.observer.schedule(
+                    _WatchEventHandler(self), self.directory, recursive=True
+                )
+                self.observer.start()
+                logger.info(f"Watching {self.directory} for filesystem events.")
+            except Exception as e:
+                # For example at the inotify watch limit on a large share
+                logger.warning(
+                    f"Unable to watch {self.directory} for filesystem events ({e}); "
+                    "relying on rescans."
+                )
+                self.observer = None
+                self.use_native_events = False
+        else:
+            logger.info(
+                f"Native filesystem events unavailable; relying on rescans of {self.directory}."
+            )
+
+        self.threads = [
+            threading.Thread(target=self._debounce_loop, daemon=True),
+            threading.Thread(target=self._rescan_loop, daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stop watching, wait for in-flight files to finish processing and commit the manifest.
+        """
+        self.stop_event.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        for thread in self.threads:
+            thread.join()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.manifest.commit()
+        if self.on_stop is not None:
+            self.on_stop()
+        self.running = False
+        logger.info(f"Stopped watching {self.directory}.")
+
+    def status(self):
+        """
+        Return a summary of the watcher state for the API.
+        """
+        with self.pending_lock:
+            pending = len(self.pending)
+            stats = dict(self.stats)
+        return {
+            "running": self.running,
+            "directory": self.directory,
+            "native_events": self.use_native_events,
+            "pending": pending,
+            **stats,
+        }
+
+    def take_ready(self, now=None):
+        """
+        Remove and return the paths whose debounce window has elapsed.
+        """
+        now = time.monotonic() if now is None else now
+        with self.pending_lock:
+            ready = [
+                path
+                for path, last_event in self.pending.items()
+                if now - last_event >= self.debounce_seconds
+            ]
+            for path in ready:
+                del self.pending[path]
+        return ready
+
+    def _debounce_loop(self):
+        while not self.stop_event.wait(min(self.debounce_seconds, 1.0)):
+            for file_path in self.take_ready():
+                self.executor.submit(self._ingest, file_path)
+
+    def _rescan_loop(self):
+        # The first pass picks up anything that changed while nothing was watching
+        self.rescan()
+        while not self.stop_event.wait(self.rescan_interval_seconds):
+            self.rescan()
+
+    @error_handler
+    def rescan(self):
+        """
+        Queue every file whose stat no longer matches the manifest.
+        """
+        logger.info(f"Rescanning {self.directory} for missed changes.")
+        for _, file_path, file_stat in scan_directory(self.directory):
+            if self.stop_event.is_set():
+                break
+            if not self.manifest.is_unchanged(file_path, file_stat, hash_still_stored):
+                self.notify(file_path)
+        with self.pending_lock:
+            self.stats["rescans"] += 1
+
+    def _ingest(self, file_path):
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            logger.info(f"{file_path} disappeared before it could be processed.")
+            return
+
+        ext = file_path.rsplit(".", 1)[-1].lower()
+        try:
+            status = process_discovered_file(
+                self.processing_manager, self.manifest, ext, file_path, file_stat
+            )
+            if status is not None:
+                logger.info(f"Watch mode processed {file_path}: {status}")
+                with self.pending_lock:
+                    self.stats["processed"] += 1
+        except Exception as e:
+            logger.error(f"Watch mode failed to process {file_path}: {e}")
+            with self.pending_lock:
+                self.stats["failed"] += 1
+
+
+def start_watch_mode():
+    """
+    Initialize the update pipeline and start watching the configured directory.
+
+    Returns:
+    WatchModeIngestor: The running ingestor, or None if the configuration is incomplete or
+                       watching could not be started.
+    """
+    process_dir, user_config = load_update_settings()
+    if not process_dir or not user_config:
+        logger.error("Unable to start watch mode: missing configuration settings.")
+        return None
+
+    on_demand_initialization(user_config)
+    watch_config = ConfigManager.get_config("watch")
+
+    # The manifest and processing pools are shared with any update run started meanwhile
+    manifest = acquire_pipeline()
+    try:
+        ingestor = WatchModeIngestor(
+            process_dir,
+            DataProcessingManager(),
+            manifest,
+            debounce_seconds=watch_config.get("debounce_seconds", 2.0),
+            rescan_interval_seconds=watch_config.get("rescan_interval_seconds", 900),
+            use_native_events=watch_config.get("use_native_events", True),
+            max_workers=calculate_dynamic_batch_size(),
+            on_stop=release_pipeline,
+        )
+        ingestor.start()
+    except Exception as e:
+        logger.error(f"Unable to start watch mode: {e}")
+        release_pipeline()
+        return None
+    return ingestor
@@ -9,6 +9,7 @@ function FullReportComponent() {
     const [record, setRecord] = useState(null);
     const [error, setError] = useState(null);
     const [reportName, setReportName] = useState('N/A'); // Default to 'N/A'
+    const [images, setImages] = useState([]);
 
     // Fetch the report details from the backend
     useEffect(() => {
@@ -32,6 +33,14 @@ function FullReportComponent() {
             .catch((err) => setError(`An error occurred: ${err.message}`));
     }, [hash]);
 
+    // Fetch the image list separately so the report renders without waiting for it
+    useEffect(() => {
+        fetch(`http://localhost:5000/api/report/${hash}/images`)
+            .then((response) => (response.ok ? response.json() : { images: [] }))
+            .then((data) => setImages(data.images || []))
+            .catch(() => setImages([]));
+    }, [hash]);
+
     // Helper function to format lists or fallback to "N/A"
     const formatList = (items) => {
         if (Array.isArray(items)) {
@@ -120,17 +129,19 @@ function FullReportComponent() {
             </div>
 
             {/* Images Section */}
-            {record.images && Array.isArray(record.images) && record.images.length > 0 && (
+            {images.length > 0 && (
                 <div className="form-section">
                     <h3>Images</h3>
                     <div className="images-grid">
-                        {record.images.map((imgData, i) => (
-                            <img
-                                key={i}
-                                src={`data:image/jpeg;base64,${imgData}`}
-                                alt={`Report image ${i}`}
-                                className="report-image"
-                            />
+                        {images.map((image, i) => (
+                            <a key={image.id} href={image.url} target="_blank" rel="noopener noreferrer">
+                                <img
+                                    src={image.thumbnail_url}
+                                    alt={`Report image ${i}`}
+                                    className="report-image"
+                                    loading="lazy"
+                                />
+                            </a>
                         ))}
                     </div>
                 </div>
@@ -3,20 +3,97 @@ import logging
 import os
 from pathlib import Path
 
-from spacy import load
-
 from ..logging.logging_utilities import error_handler
 
 logger = logging.getLogger(__name__)
 
+# Pipeline components whose annotations extract_info never reads; it only uses doc.ents
+NER_UNUSED_COMPONENTS = (
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "textcat",
+    "textcat_multilabel",
+)
+
+# Components left out of the model for each NLP profile
+NLP_PROFILES = {"full": (), "ner": NER_UNUSED_COMPONENTS}
+
+
+def load_nlp_model(model_name, profile="full", exclude=()):
+    """
+    Load a spaCy model with the components of an NLP profile excluded.
+
+    Excluded components are never constructed, so they cost neither load time nor memory. A
+    shared tok2vec layer that no remaining component listens to is removed as well.
+
+    Parameters:
+    model_name (str): The name or path of the spaCy model.
+    profile (str): "full" for the whole pipeline or "ner" for only what entities need.
+    exclude (list): Further components to exclude.
+
+    Returns:
+    Language: The loaded pipeline.
+    """
+    if profile not in NLP_PROFILES:
+        raise ValueError(f"Unknown NLP profile: {profile}")
+    # Imported here so the extraction workers, which read AppConfig, never import spaCy
+    from spacy import load
+
+    excluded = [*NLP_PROFILES[profile], *exclude]
+    nlp = load(model_name, exclude=excluded)
+    if excluded and "tok2vec" in nlp.pipe_names:
+        if not nlp.get_pipe("tok2vec").listening_components:
+            nlp.remove_pipe("tok2vec")
+    return nlp
+
 
 class AppConfig:
     user_config = None
     system_config = None
     nlp = None
+    nlp_model = None
+    nlp_profile = "full"
+    nlp_exclude = []
+    nlp_processes = 1
+    nlp_batch_size = 32
+    nlp_batch_wait_ms = 50
+    nlp_chunk_chars = 100_000
     keywords = None
     TESTING = False
     fallback_csv_path = None
+    manifest_path = None
+    pdf_text_engine = "pymupdf"
+    parallel_pdf_page_threshold = 500
+    parallel_pdf_workers = None
+    max_excel_cells_per_sheet = 1_000_000
+    sandbox_enabled = True
+    sandbox_timeout_seconds = 300
+    sandbox_memory_limit_mb = 4096
+    image_min_bytes = 0
+    image_min_pixels = 1024
+    image_max_pixels = 16_000_000
+    image_max_dimension = 4096
+    image_keep_originals = False
+    image_lossy_quality = 80
+    image_encodings = {
+        "JPEG": "passthrough",
+        "MPO": "passthrough",
+        "PNG": "lossless",
+        "GIF": "lossless",
+        "BMP": "lossless",
+        "TIFF": "lossless",
+    }
+    image_encoding_workers = None
+    image_encoding_max_in_flight_mb = 256
+    extraction_cache_dir = None
+    extraction_cache_max_mb = 2048
+    image_store_backend = "local"
+    image_store_dir = None
+    image_thumbnail_size = 256
     logger.info(f"Application working directory: {os.getcwd()}")
 
     @classmethod
@@ -30,8 +107,14 @@ class AppConfig:
                              Default is "./configs/sys_config.json".
 
         Loads:
-            - NLP model specified in the configuration.
+            - NLP model specified in the configuration, with the components of its profile
+              excluded, and how entity recognition is batched.
             - Fallback CSV path from system configuration.
+            - File manifest path used for incremental update runs.
+            - Extraction settings (PDF engine, page-parallel PDFs, Excel caps, sandbox limits,
+              image triage, image encoding pool).
+            - Extracted-text cache location and size limit.
+            - Image store backend and location.
             - Initializes system configuration settings.
         """
         if file_path is None:
@@ -42,13 +125,86 @@ class AppConfig:
 
         with open(file_path) as sys_config_file:
             cls.system_config = json.load(sys_config_file)
-            cls.nlp = load(cls.system_config["nlp"]["model"])
-            logger.info(f"NLP model loaded: {cls.system_config['nlp']['model']}")
+            nlp_config = cls.system_config["nlp"]
+            cls.nlp_model = nlp_config["model"]
+            cls.nlp_profile = nlp_config.get("profile", "full")
+            cls.nlp_exclude = nlp_config.get("exclude", [])
+            cls.nlp = load_nlp_model(cls.nlp_model, cls.nlp_profile, cls.nlp_exclude)
+            logger.info(
+                f"NLP model loaded: {cls.nlp_model} ({cls.nlp_profile} profile, "
+                f"components: {cls.nlp.pipe_names})"
+            )
+            cls.nlp_processes = nlp_config.get("n_process", 1)
+            cls.nlp_batch_size = nlp_config.get("batch_size", 32)
+            cls.nlp_batch_wait_ms = nlp_config.get("batch_wait_ms", 50)
+            cls.nlp_chunk_chars = nlp_config.get("chunk_chars", 100_000)
             cls.TESTING = cls.system_config["testing_mode"]["testing_flag"]
             logger.info(f"TESTING FLAG: {cls.TESTING}")
             cls.fallback_csv_path = str(
                 Path(os.path.expanduser(cls.system_config["output"]["fallback_csv"]))
             )
+            manifest_config = cls.system_config.get("manifest", {})
+            cls.manifest_path = str(
+                Path(
+                    os.path.expanduser(
+                        manifest_config.get("manifest_path", "~/CORE/file_manifest.db")
+                    )
+                )
+            )
+            extraction_config = cls.system_config.get("extraction", {})
+            cls.pdf_text_engine = extraction_config.get("pdf_text_engine", "pymupdf")
+            logger.info(f"PDF text engine: {cls.pdf_text_engine}")
+            cls.parallel_pdf_page_threshold = extraction_config.get(
+                "parallel_pdf_page_threshold", 500
+            )
+            cls.parallel_pdf_workers = extraction_config.get("parallel_pdf_workers")
+            cls.max_excel_cells_per_sheet = extraction_config.get(
+                "max_excel_cells_per_sheet", 1_000_000
+            )
+            cls.sandbox_enabled = extraction_config.get("sandbox_enabled", True)
+            cls.sandbox_timeout_seconds = extraction_config.get(
+                "sandbox_timeout_seconds", 300
+            )
+            cls.sandbox_memory_limit_mb = extraction_config.get(
+                "sandbox_memory_limit_mb", 4096
+            )
+            cls.image_min_bytes = extraction_config.get("image_min_bytes", 0)
+            cls.image_min_pixels = extraction_config.get("image_min_pixels", 1024)
+            cls.image_max_pixels = extraction_config.get("image_max_pixels", 16_000_000)
+            cls.image_max_dimension = extraction_config.get("image_max_dimension", 4096)
+            cls.image_keep_originals = extraction_config.get(
+                "image_keep_originals", False
+            )
+            cls.image_lossy_quality = extraction_config.get("image_lossy_quality", 80)
+            cls.image_encodings = extraction_config.get(
+                "image_encodings", cls.image_encodings
+            )
+            cls.image_encoding_workers = extraction_config.get("image_encoding_workers")
+            cls.image_encoding_max_in_flight_mb = extraction_config.get(
+                "image_encoding_max_in_flight_mb", 256
+            )
+            cache_config = cls.system_config.get("extraction_cache", {})
+            if cache_config.get("enabled", False):
+                cls.extraction_cache_dir = str(
+                    Path(
+                        os.path.expanduser(
+                            cache_config.get("cache_dir", "~/CORE/extraction_cache")
+                        )
+                    )
+                )
+            else:
+                cls.extraction_cache_dir = None
+            cls.extraction_cache_max_mb = cache_config.get("max_size_mb", 2048)
+            image_store_config = cls.system_config.get("image_store", {})
+            cls.image_store_backend = image_store_config.get("backend", "local")
+            cls.image_thumbnail_size = image_store_config.get("thumbnail_size", 256)
+            cls.image_store_dir = str(
+                Path(
+                    os.path.expanduser(
+                        image_store_config.get("store_dir", "~/CORE/image_store")
+                    )
+                )
+            )
 
     @classmethod
     def load_user_config(cls, config_dict):
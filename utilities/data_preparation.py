@@ -1,4 +1,3 @@
-import base64
 import json
 import logging
 from datetime import datetime, timezone
@@ -36,11 +35,8 @@ def prepare_data(file_path, info, images, file_hash):
 
     mgrs_str = json.dumps(info["MGRS"]) if "MGRS" in info else "[]"
 
-    # Encode images as base64 to ensure they are JSON-serializable
-    if images:
-        images_data = base64.b64encode(images).decode("utf-8")
-    else:
-        images_data = None
+    # Images live in the image store; the report holds their IDs as a JSON list
+    images_data = json.dumps(images) if images else None
 
     # Initialize dictionary to hold extracted information
     data = {
@@ -54,7 +50,7 @@ def prepare_data(file_path, info, images, file_hash):
         "topics": topics_str,
         "keywords": keywords_str,
         "MGRS": mgrs_str,
-        "images": images_data,  # Now base64-encoded string
+        "images": images_data,  # JSON list of image store IDs
         "full_text": info["full_text"],
         "processed_time": datetime.now(timezone.utc),
     }
@@ -0,0 +1,115 @@
+import re
+
+from fastapi.responses import Response
+
+# Content-addressed images never change, so clients may cache them indefinitely
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+BYTE_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def parse_byte_range(range_header, size):
+    """
+    Parse a single-range HTTP Range header against a resource of the given size.
+
+    Parameters:
+    range_header (str): The value of the Range header, such as "bytes=0-1023" or "bytes=-500".
+    size (int): The size of the resource in bytes.
+
+    Returns:
+    tuple: The (start, end) byte offsets, inclusive, or None to serve the whole resource.
+
+    Raises:
+    ValueError: If the range cannot be satisfied.
+    """
+    match = BYTE_RANGE_PATTERN.fullmatch(range_header.strip())
+    if not match:
+        # Multiple or malformed ranges are answered with the whole resource
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # A suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def _cache_headers(etag):
+    return {
+        "ETag": f'"{etag}"',
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+
+def not_modified_response(headers, etag):
+    """
+    Return a 304 response if the client already holds the image, so it need not be loaded.
+
+    Parameters:
+    headers (Mapping): The request headers.
+    etag (str): The entity tag of the image, without quotes.
+
+    Returns:
+    Response: A 304 response, or None if the image should be sent.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or f'"{etag}"' in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return None
+
+
+def image_response(headers, data, etag, media_type):
+    """
+    Build the response for an immutable image, honouring conditional and range requests.
+
+    Parameters:
+    headers (Mapping): The request headers.
+    data (bytes): The image data.
+    etag (str): The entity tag of the image, without quotes.
+    media_type (str): The MIME type of the image.
+
+    Returns:
+    Response: 304 if the client's copy is current, 206 for a satisfiable range, 416 for an
+              unsatisfiable one, and 200 with the whole image otherwise.
+    """
+    not_modified = not_modified_response(headers, etag)
+    if not_modified is not None:
+        return not_modified
+
+    quoted_etag = f'"{etag}"'
+    response_headers = _cache_headers(etag)
+
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == quoted_etag):
+        size = len(data)
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            response_headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=response_headers)
+        if byte_range is not None:
+            start, end = byte_range
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return Response(
+                content=data[start : end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers=response_headers,
+            )
+
+    return Response(content=data, media_type=media_type, headers=response_headers)
@@ -1,12 +1,31 @@
 import json
 import os
+import threading
 
 from utilities import DatabaseConfig
+from utilities.keyword_matching import KeywordMatcher
 from utilities.logging.logging_utilities import error_handler
 
 
 class Keywords:
     keywords_list = []
+    _matcher = None
+    _matcher_keywords = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_matcher(cls):
+        """
+        Return the keyword matcher for the current keywords list.
+
+        The matcher is compiled when the keywords are loaded and shared by every document;
+        it is only rebuilt if keywords_list has since been replaced.
+        """
+        with cls._lock:
+            if cls._matcher is None or cls._matcher_keywords is not cls.keywords_list:
+                cls._matcher = KeywordMatcher(cls.keywords_list)
+                cls._matcher_keywords = cls.keywords_list
+            return cls._matcher
 
     @classmethod
     @error_handler
@@ -49,4 +68,6 @@ class Keywords:
         # Load and return the keywords from the most recent file
         with open(latest_file) as f:
             cls.keywords_list = json.load(f)
-            return cls.keywords_list
+        # Compile the keywords once for all the documents they are matched against
+        cls.get_matcher()
+        return cls.keywords_list
@@ -0,0 +1,99 @@
+import re
+from collections import deque
+
+WORD = re.compile(r"\w+")
+
+
+def keyword_tokens(keyword):
+    """
+    Split a keyword into the lowercase words it is matched by.
+    """
+    return tuple(word.lower() for word in WORD.findall(keyword))
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of a list in a text in one pass, whatever the size of the list.
+
+    Keywords are matched case-insensitively on whole words, so "IO" does not match inside
+    "violation", and a multi-word keyword matches its words separated by any whitespace or
+    punctuation. The keywords are compiled into an Aho-Corasick automaton over words: each
+    word of the text is looked up once, and overlapping keywords ("Civil Society" within
+    "Civil Society organization") are all found.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        # State 0 is the root; each state maps the next word to the state it leads to
+        self.goto = [{}]
+        self.fail = [0]
+        # The keywords (with their length in words) that end at each state
+        self.output = [[]]
+        self.max_words = 1
+        for keyword in self.keywords:
+            tokens = keyword_tokens(keyword)
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self.goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][token] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((keyword, len(tokens)))
+            self.max_words = max(self.max_words, len(tokens))
+        self._link_failures()
+
+    def _link_failures(self):
+        # Breadth first, so the failure state of each state's parent is already linked
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = (
+                    self.output[next_state] + self.output[self.fail[next_state]]
+                )
+
+    def find(self, text):
+        """
+        Find the keywords in a text.
+
+        Parameters:
+        text (str): The text to search.
+
+        Returns:
+        dict: The (start, end) character offsets of each match of each keyword found, in
+              order of appearance. The number of matches of a keyword is the length of its
+              list.
+        """
+        matches = {}
+        # The start of each of the last words, as far back as the longest keyword reaches
+        starts = deque(maxlen=self.max_words)
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for word in WORD.finditer(text):
+            token = word.group().lower()
+            starts.append(word.start())
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for keyword, length in output[state]:
+                matches.setdefault(keyword, []).append((starts[-length], word.end()))
+        return matches
+
+    def counts(self, text):
+        """
+        Return the number of matches of each keyword found in a text.
+        """
+        return {keyword: len(spans) for keyword, spans in self.find(text).items()}